@@ -0,0 +1,61 @@
+"""Per-request auth overhead: jwt.decode on every request vs the shared
+verify_token with its decoded-payload cache.
+
+Run from the Skillbridge directory:
+
+    python -m benchmarks.bench_auth
+"""
+import argparse
+import datetime
+import json
+import time
+import jwt
+from src.utils.auth import SECRET_KEY, token_cache, verify_token
+
+def make_token(user_id=1, role='admin'):
+    return jwt.encode({
+        'username': f'user{user_id}',
+        'user_id': user_id,
+        'role': role,
+        'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+    }, SECRET_KEY, algorithm='HS256')
+
+def bench(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=50000)
+    parser.add_argument('--tokens', type=int, default=100, help='Distinct bearer tokens in rotation')
+    args = parser.parse_args()
+
+    headers = [f'Bearer {make_token(i)}' for i in range(args.tokens)]
+    tokens = [header.split(' ')[1] for header in headers]
+    index = [0]
+
+    def uncached():
+        index[0] = (index[0] + 1) % args.tokens
+        jwt.decode(tokens[index[0]], SECRET_KEY, algorithms=['HS256'])
+
+    def cached():
+        index[0] = (index[0] + 1) % args.tokens
+        verify_token(headers[index[0]])
+
+    token_cache.clear()
+    results = {
+        'iterations': args.iterations,
+        'distinct_tokens': args.tokens,
+        'jwt_decode_us': bench(uncached, args.iterations),
+        'verify_token_cached_us': bench(cached, args.iterations),
+        'cache_hits': token_cache.hits,
+        'cache_misses': token_cache.misses
+    }
+    results['saved_per_request_us'] = results['jwt_decode_us'] - results['verify_token_cached_us']
+    results['speedup'] = results['jwt_decode_us'] / results['verify_token_cached_us']
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""Endpoint benchmark suite: drives every blueprint endpoint through the Flask
+test client against a synthetic dataset and records latency percentiles,
+SQL query counts and peak Python memory per endpoint, plus checks that the
+query count of per-project endpoints does not grow with team size.
+
+Results are written as JSON; pass a previous result with --compare to flag
+regressions (exit status 1).
+
+Run from the Skillbridge directory:
+
+    python -m benchmarks.bench_endpoints --user-skills 100000 --output bench.json
+    python -m benchmarks.bench_endpoints --db /tmp/skillbridge_bench.db --compare bench.json
+"""
+import os
+os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+
+import argparse
+import datetime
+import json
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import jwt
+from sqlalchemy import event, func, select
+from src.models.user import db, User
+from src.models.skill import Skill, UserSkill, Project, ProjectMember, ProjectSkill
+from src.migrations import upgrade
+from src.services.staffing import skill_index
+from src.utils.auth import SECRET_KEY
+from src.utils.cache import response_cache
+from benchmarks.datagen import DEFAULT_PASSWORD, create_bench_app, generate
+
+# Slow endpoints get fewer iterations
+SLOW_ITERATIONS = 3
+TEAM_SIZES = (5, 20, 80)
+
+def make_token(user_id=1, role='admin'):
+    return jwt.encode({
+        'username': f'user{user_id}',
+        'user_id': user_id,
+        'role': role,
+        'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+    }, SECRET_KEY, algorithm='HS256')
+
+def fixtures():
+    # Ids the endpoints are called with: the busiest project, its company,
+    # a user with many skills and the most popular skill
+    project_id = db.session.execute(
+        select(ProjectMember.project_id).group_by(ProjectMember.project_id)
+        .order_by(func.count().desc(), ProjectMember.project_id).limit(1)
+    ).scalar()
+    user_id = db.session.execute(
+        select(UserSkill.user_id).group_by(UserSkill.user_id)
+        .order_by(func.count().desc(), UserSkill.user_id).limit(1)
+    ).scalar()
+    member_id = db.session.execute(
+        select(ProjectMember.user_id).where(ProjectMember.project_id == project_id).limit(1)
+    ).scalar()
+    return {
+        'project_id': project_id,
+        'company_id': db.session.get(Project, project_id).company_id,
+        'user_id': user_id,
+        'member_id': member_id,
+        'skill_id': 1,
+        'max_skill_id': db.session.execute(select(func.max(Skill.id))).scalar(),
+        'max_user_id': db.session.execute(select(func.max(User.id))).scalar()
+    }
+
+def endpoints(f):
+    # name -> (method, url, body(i) or None, slow)
+    p, c, u, s = f['project_id'], f['company_id'], f['user_id'], f['skill_id']
+    return {
+        # Reads
+        'auth.profile': ('GET', '/api/auth/profile', None, False),
+        'skill.get_skills': ('GET', '/api/skill/skills', None, False),
+        'skill.get_skills.max_page': ('GET', '/api/skill/skills?limit=500&sort=name', None, False),
+        'skill.get_skill': ('GET', f'/api/skill/skills/{s}', None, False),
+        'skill.get_user_skills': ('GET', f'/api/skill/users/{u}/skills?include=skill', None, False),
+        'skill.get_projects': ('GET', '/api/skill/projects?limit=500', None, False),
+        'skill.get_project_skills': ('GET', f'/api/skill/projects/{p}/skills?include=skill', None, False),
+        'skill.analyze_skill_gap': ('GET', f'/api/skill/projects/{p}/skill-gap', None, False),
+        'skill.staffing_recommendations': ('GET', f'/api/skill/projects/{p}/staffing-recommendations', None, False),
+        'skill.company_skill_gap': ('GET', f'/api/skill/companies/{c}/skill-gap', None, True),
+        'skill.cache_stats': ('GET', '/api/skill/cache/stats', None, False),
+        'project.get_user_projects': ('GET', f'/api/skill/users/{f["member_id"]}/projects?include=skills,company', None, False),
+        'project.get_project_members': ('GET', f'/api/skill/projects/{p}/members?include=skills', None, False),
+        'company.get_companies': ('GET', '/api/company/companies', None, False),
+        'company.get_company': ('GET', f'/api/company/companies/{c}', None, False),
+        'user.get_users': ('GET', '/api/users?limit=500', None, False),
+        'user.get_user': ('GET', f'/api/users/{u}', None, False),
+        'export.user_skills': ('GET', '/api/exports/user-skills?format=ndjson', None, True),
+        'export.project_rosters': ('GET', '/api/exports/project-rosters?format=csv', None, True),
+        # Analytics and planning
+        'skill.simulate': ('POST', '/api/skill/projects/skill-gap/simulate', lambda i: {
+            'project_ids': [p],
+            'changes': [{'type': 'add_member', 'project_id': p, 'user_id': u}]
+        }, False),
+        'project.optimize_assignments': ('POST', '/api/skill/projects/assignments/optimize', lambda i: {
+            'project_ids': [p], 'time_budget': 0.2
+        }, True),
+        # Writes
+        'auth.login': ('POST', '/api/auth/login', lambda i: {'username': 'user2', 'password': DEFAULT_PASSWORD}, False),
+        'auth.register': ('POST', '/api/auth/register', lambda i: {
+            'username': f'bench{i}_{time.monotonic_ns()}', 'email': f'bench{i}_{time.monotonic_ns()}@example.com', 'password': 'x' * 12
+        }, True),
+        'skill.create_skill': ('POST', '/api/skill/skills', lambda i: {'name': f'Bench skill {time.monotonic_ns()}', 'category': 'Bench'}, False),
+        'skill.update_skill': ('PUT', f'/api/skill/skills/{s}', lambda i: {'description': f'Updated {i}'}, False),
+        'skill.add_user_skill': ('POST', f'/api/skill/users/{u}/skills', lambda i: {
+            'skill_id': f['max_skill_id'] - i, 'proficiency_level': 3
+        }, False),
+        'skill.create_project': ('POST', '/api/skill/projects', lambda i: {'name': f'Bench project {i}', 'company_id': c}, False),
+        'project.add_project_member': ('POST', f'/api/skill/projects/{p}/members', lambda i: {
+            'user_id': f['max_user_id'] - i, 'allocation_percentage': 10
+        }, False),
+        'imports.user_skills': ('POST', '/api/imports/user-skills', lambda i: [
+            {'user_id': f['max_user_id'] - i - 100, 'skill_id': skill_id, 'proficiency_level': 2}
+            for skill_id in range(1, 51)
+        ], False)
+    }
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'after_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+def call(client, method, url, headers, body):
+    response = client.open(url, method=method, headers=headers, json=body)
+    # Drain streamed bodies so their queries and encoding are measured
+    response.get_data()
+    return response
+
+def bench_endpoint(client, counter, method, url, body, iterations, warm):
+    headers = {'Authorization': f'Bearer {make_token()}'}
+    latencies = []
+    queries = []
+    statuses = {}
+    for i in range(iterations):
+        if not warm:
+            response_cache.clear()
+        payload = body(i) if body else None
+        before = counter.count
+        started = time.perf_counter()
+        response = call(client, method, url, headers, payload)
+        latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count - before)
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    # One more call under tracemalloc for peak Python memory
+    if not warm:
+        response_cache.clear()
+    tracemalloc.start()
+    call(client, method, url, headers, body(iterations) if body else None)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 0.5), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'mean_ms': round(statistics.mean(latencies), 3),
+        'queries': max(queries),
+        'peak_kib': round(peak / 1024, 1),
+        'statuses': statuses
+    }
+
+def query_scaling(client, counter):
+    # Query counts of per-project endpoints on teams of growing size;
+    # they must not depend on the number of members
+    headers = {'Authorization': f'Bearer {make_token()}'}
+    company_id = db.session.execute(
+        select(User.company_id).group_by(User.company_id).order_by(func.count().desc()).limit(1)
+    ).scalar()
+    user_ids = [row[0] for row in db.session.execute(
+        select(User.id).where(User.company_id == company_id).order_by(User.id).limit(max(TEAM_SIZES))
+    )]
+    skill_ids = [row[0] for row in db.session.execute(select(Skill.id).order_by(Skill.id).limit(5))]
+
+    urls = {
+        'skill.analyze_skill_gap': '/api/skill/projects/{}/skill-gap',
+        'skill.staffing_recommendations': '/api/skill/projects/{}/staffing-recommendations',
+        'project.get_project_members': '/api/skill/projects/{}/members?include=skills'
+    }
+    results = {name: {'team_sizes': [], 'queries': []} for name in urls}
+    for size in TEAM_SIZES:
+        if size > len(user_ids):
+            break
+        project = Project(name=f'Scaling {size}', company_id=company_id, status='active')
+        db.session.add(project)
+        db.session.flush()
+        db.session.add_all(ProjectSkill(project_id=project.id, skill_id=skill_id, importance_level=3) for skill_id in skill_ids)
+        db.session.add_all(ProjectMember(project_id=project.id, user_id=user_id, allocation_percentage=10) for user_id in user_ids[:size])
+        db.session.commit()
+
+        for name, url in urls.items():
+            response_cache.clear()
+            skill_index.invalidate()
+            before = counter.count
+            call(client, 'GET', url.format(project.id), headers, None)
+            results[name]['team_sizes'].append(size)
+            results[name]['queries'].append(counter.count - before)
+
+    for result in results.values():
+        result['constant'] = len(set(result['queries'])) <= 1
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(previous, current, threshold):
+    regressions = []
+    for name, result in current['endpoints'].items():
+        before = previous.get('endpoints', {}).get(name)
+        if before is None:
+            continue
+        if result['queries'] > before['queries']:
+            regressions.append(f'{name}: {before["queries"]} -> {result["queries"]} queries')
+        if result['p50_ms'] > before['p50_ms'] * (1 + threshold):
+            regressions.append(f'{name}: p50 {before["p50_ms"]}ms -> {result["p50_ms"]}ms')
+    for name, result in current['query_scaling'].items():
+        if not result['constant']:
+            regressions.append(f'{name}: queries grow with team size {result["queries"]}')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help='Dataset from benchmarks.datagen (copied, never modified)')
+    parser.add_argument('--user-skills', type=int, default=20000, help='Generate a dataset of this size when --db is not given')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warm', action='store_true', help='Keep the response cache between calls')
+    parser.add_argument('--only', help='Comma-separated endpoint names')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='Previous results to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed p50 growth for --compare')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'bench.db')
+    if args.db:
+        shutil.copy(args.db, path)
+    app = create_bench_app(f'sqlite:///{path}')
+
+    with app.app_context():
+        if args.db:
+            counts = None
+        else:
+            upgrade()
+            counts = generate(args.user_skills, args.seed)
+        counter = QueryCounter(db.engine)
+        client = app.test_client()
+        f = fixtures()
+
+        selected = endpoints(f)
+        if args.only:
+            selected = {name: selected[name] for name in args.only.split(',')}
+
+        results = {}
+        for name, (method, url, body, slow) in selected.items():
+            iterations = min(args.iterations, SLOW_ITERATIONS) if slow else args.iterations
+            results[name] = bench_endpoint(client, counter, method, url, body, iterations, args.warm)
+
+        report = {
+            'commit': git_commit(),
+            'dataset': counts or {'db': args.db},
+            'seed': args.seed,
+            'warm_cache': args.warm,
+            'fixtures': f,
+            'endpoints': results,
+            'query_scaling': query_scaling(client, counter)
+        }
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text)
+    print(text)
+
+    failed = [f'{name}: queries grow with team size {result["queries"]}'
+              for name, result in report['query_scaling'].items() if not result['constant']]
+    if args.compare:
+        with open(args.compare) as previous:
+            failed = compare(json.load(previous), report, args.threshold)
+    for line in failed:
+        print(f'REGRESSION {line}')
+    raise SystemExit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Latency a logging call adds to a request thread: the old synchronous
+StreamHandler vs the queued JSON pipeline, with several threads logging at
+once into a sink that blocks for a while on every write (a slow pipe or
+log collector).
+
+Run from the Skillbridge directory:
+
+    python -m benchmarks.bench_logging --threads 8 --records 2000 --write-latency-us 200
+"""
+import argparse
+import json
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueListener
+from src.utils.structured_logging import RequestQueueHandler, CappedStreamHandler, JSONFormatter
+
+class SlowStream:
+    def __init__(self, latency):
+        self.latency = latency
+        self.bytes = 0
+
+    def write(self, data):
+        time.sleep(self.latency)
+        self.bytes += len(data)
+
+    def flush(self):
+        pass
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+def run(logger, threads, records):
+    latencies = [[] for _ in range(threads)]
+
+    def client(index):
+        timings = latencies[index]
+        for i in range(records):
+            started = time.perf_counter()
+            logger.info('Login attempt for user: %s', f'user{i}', extra={'authorization': 'Bearer abc.def.ghi'})
+            timings.append((time.perf_counter() - started) * 1e6)
+
+    workers = [threading.Thread(target=client, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    flat = [value for timings in latencies for value in timings]
+    return {
+        'call_p50_us': percentile(flat, 0.5),
+        'call_p99_us': percentile(flat, 0.99),
+        'call_max_us': max(flat),
+        'records_per_second': len(flat) / elapsed
+    }
+
+def make_logger(name, handler):
+    logger = logging.getLogger(f'bench.{name}')
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--records', type=int, default=2000, help='Records per thread')
+    parser.add_argument('--write-latency-us', type=float, default=200)
+    parser.add_argument('--max-bytes-per-second', type=int, default=1024 * 1024)
+    args = parser.parse_args()
+    latency = args.write_latency_us / 1e6
+
+    # What logging.basicConfig set up: format and write on the calling thread
+    sync_stream = SlowStream(latency)
+    sync_handler = logging.StreamHandler(sync_stream)
+    sync_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    sync = run(make_logger('sync', sync_handler), args.threads, args.records)
+
+    queued_stream = SlowStream(latency)
+    output = CappedStreamHandler(queued_stream, max_bytes_per_second=args.max_bytes_per_second)
+    output.setFormatter(JSONFormatter())
+    log_queue = queue.Queue(10000)
+    handler = RequestQueueHandler(log_queue)
+    listener = QueueListener(log_queue, output)
+    listener.start()
+    queued = run(make_logger('queued', handler), args.threads, args.records)
+    listener.stop()
+    queued['dropped_queue_full'] = handler.dropped
+    queued['dropped_over_cap'] = output.dropped
+    queued['bytes_written'] = queued_stream.bytes
+
+    print(json.dumps({
+        'threads': args.threads,
+        'records': args.threads * args.records,
+        'write_latency_us': args.write_latency_us,
+        'sync': sync,
+        'queued': queued
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Login throughput under concurrent load: password verification inline on
+the request thread vs in the bounded password pool, and the latency a cheap
+endpoint sees while the logins are running.
+
+Run from the Skillbridge directory:
+
+    python -m benchmarks.bench_login --clients 16 --seconds 5
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from werkzeug.security import check_password_hash, generate_password_hash
+from src.utils import passwords
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+def run(verify, clients, seconds, password_hash):
+    stop = time.monotonic() + seconds
+    logins = [0] * clients
+    rejected = [0] * clients
+    cheap_latencies = []
+
+    def login_client(index):
+        while time.monotonic() < stop:
+            try:
+                verify(password_hash, 'secret')
+                logins[index] += 1
+            except passwords.PasswordPoolSaturated:
+                rejected[index] += 1
+
+    def cheap_client():
+        # Stands in for any other endpoint served by the same worker
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            sum(range(1000))
+            cheap_latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=login_client, args=(i,)) for i in range(clients)]
+    threads.append(threading.Thread(target=cheap_client))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'logins_per_second': sum(logins) / seconds,
+        'rejected_per_second': sum(rejected) / seconds,
+        'cheap_p50_ms': percentile(cheap_latencies, 0.5),
+        'cheap_p99_ms': percentile(cheap_latencies, 0.99),
+        'cheap_mean_ms': statistics.mean(cheap_latencies) if cheap_latencies else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--bulk', type=int, default=2000, help='Passwords for the bulk hashing run')
+    args = parser.parse_args()
+
+    password_hash = generate_password_hash('secret')
+    # Warm the pool up so process start-up is not measured
+    passwords.verify_password(password_hash, 'secret')
+
+    results = {
+        'clients': args.clients,
+        'pool_workers': passwords.HASH_WORKERS,
+        'queue_depth': passwords.HASH_QUEUE_DEPTH,
+        'inline': run(check_password_hash, args.clients, args.seconds, password_hash),
+        'pool': run(passwords.verify_password, args.clients, args.seconds, password_hash)
+    }
+
+    started = time.perf_counter()
+    for i in range(args.bulk // 20):
+        generate_password_hash(f'password{i}')
+    inline_rate = (args.bulk // 20) / (time.perf_counter() - started)
+    started = time.perf_counter()
+    passwords.hash_passwords_bulk(f'password{i}' for i in range(args.bulk))
+    results['bulk_hashes_per_second'] = {
+        'inline': inline_rate,
+        'pool': args.bulk / (time.perf_counter() - started)
+    }
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""List serialization cost: ORM instances + to_dict + the stock jsonify vs
+column-tuple serializers + the orjson provider, on lists of 10k rows.
+
+Run from the Skillbridge directory:
+
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 5
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from src.models.user import db, User, Company
+from src.models.skill import Skill, Project
+from src.utils.json_provider import FastJSONProvider
+from src.utils.serializers import skill_serializer, project_serializer, user_serializer
+
+CASES = {
+    'skills': (Skill, skill_serializer),
+    'projects': (Project, project_serializer),
+    'users': (User, user_serializer)
+}
+
+def seed(rows):
+    company = Company(name='Bench')
+    db.session.add(company)
+    db.session.flush()
+    db.session.add_all(Skill(name=f'skill{i}', category=f'category{i % 20}', description='x' * 40) for i in range(rows))
+    db.session.add_all(Project(name=f'project{i}', company_id=company.id, description='x' * 40) for i in range(rows))
+    db.session.add_all(
+        User(username=f'user{i}', email=f'user{i}@example.com', password_hash='x', first_name='First', last_name='Last', company_id=company.id)
+        for i in range(rows)
+    )
+    db.session.commit()
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(app)
+    stock = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    results = {'rows': args.rows}
+    with app.test_request_context():
+        db.create_all()
+        seed(args.rows)
+
+        for name, (model, serializer) in CASES.items():
+            fields = tuple(serializer.columns)
+            orm_rows = model.query.order_by(model.id).all()
+            dicts = [row.to_dict() for row in orm_rows]
+            tuples = serializer.query(fields).order_by(model.id).all()
+            column_dicts = serializer.serialize(tuples, fields)
+
+            results[name] = {
+                # Encoding only: the same payload through each provider
+                'encode_stock_ms': best_of(args.repeat, lambda: stock.response(dicts)),
+                'encode_fast_ms': best_of(args.repeat, lambda: fast.response(column_dicts)),
+                # Query + build + encode, as the list endpoints do it
+                'before_ms': best_of(args.repeat, lambda: stock.response(
+                    [row.to_dict() for row in model.query.order_by(model.id).all()]
+                )),
+                'after_ms': best_of(args.repeat, lambda: fast.response(
+                    serializer.serialize(serializer.query(fields).order_by(model.id).all(), fields)
+                )),
+                'after_two_fields_ms': best_of(args.repeat, lambda: fast.response(
+                    serializer.serialize(serializer.query(fields[:2]).order_by(model.id).all(), fields[:2])
+                ))
+            }
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Cold start: time from launching the server to its first successful
+response, and the latency of the first logins after boot, for the gunicorn
+profile (gunicorn.conf.py) and the Flask development server, plus the cost of
+importing and building the app on its own.
+
+Run from the Skillbridge directory:
+
+    python -m benchmarks.bench_startup --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from benchmarks.datagen import DEFAULT_PASSWORD
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOOT_TIMEOUT = 60
+
+SERVERS = {
+    'gunicorn': lambda port: [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}', 'src.main:app'],
+    'flask': lambda port: [sys.executable, '-m', 'src.main']
+}
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def call(port, path, body=None):
+    data = None if body is None else json.dumps(body).encode('utf-8')
+    request = urllib.request.Request(f'http://127.0.0.1:{port}{path}', data=data, headers={'Content-Type': 'application/json'})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, (time.perf_counter() - started) * 1000
+
+def wait_for_first_response(port, process, started):
+    # Milliseconds from launch to the first 200 from /api/health
+    deadline = time.monotonic() + BOOT_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('server exited during start-up')
+        try:
+            status, _ = call(port, '/api/health')
+            if status == 200:
+                return (time.perf_counter() - started) * 1000
+        except OSError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError('server did not answer')
+
+def measure_boot(server, env, logins, settle):
+    port = free_port()
+    env = dict(env, PORT=str(port))
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        SERVERS[server](port), env=env, cwd=ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+    try:
+        result = {'first_response_ms': round(wait_for_first_response(port, process, started), 1)}
+        if logins:
+            time.sleep(settle)
+            times = []
+            for _ in range(logins):
+                status, elapsed = call(port, '/api/auth/login', {'username': 'user2', 'password': DEFAULT_PASSWORD})
+                if status != 200:
+                    raise RuntimeError(f'login returned {status}')
+                times.append(round(elapsed, 1))
+            result['login_ms'] = times
+        return result
+    finally:
+        # The whole session: gunicorn workers and password pool processes
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+
+def measure_import(env):
+    script = (
+        'import time; started = time.perf_counter(); '
+        'from src.main import app; '
+        'print((time.perf_counter() - started) * 1000)'
+    )
+    output = subprocess.run([sys.executable, '-c', script], env=env, cwd=ROOT, capture_output=True, text=True, check=True)
+    return round(float(output.stdout.strip().splitlines()[-1]), 1)
+
+def summarize(runs):
+    summary = {'first_response_ms': round(statistics.median(run['first_response_ms'] for run in runs), 1)}
+    if 'login_ms' in runs[0]:
+        summary['first_login_ms'] = round(statistics.median(run['login_ms'][0] for run in runs), 1)
+        summary['warm_login_ms'] = round(statistics.median(run['login_ms'][-1] for run in runs), 1)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--servers', default='gunicorn,flask', help=f'Comma-separated, from: {", ".join(SERVERS)}')
+    parser.add_argument('--profile', default='production', help='SKILLBRIDGE_ENV for the server')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--logins', type=int, default=3, help='Logins timed after boot (database API only)')
+    parser.add_argument('--settle', type=float, default=0, help='Seconds between the first response and the first login')
+    parser.add_argument('--mock', action='store_true', help='Serve the mock API instead of a seeded database')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    env = dict(os.environ, SKILLBRIDGE_ENV=args.profile, SECRET_KEY='bench', RATE_LIMIT_ENABLED='0', SKILLBRIDGE_MOCK_API='1' if args.mock else '0')
+    logins = 0 if args.mock else args.logins
+    if not args.mock:
+        database = os.path.join(workdir, 'startup.db')
+        subprocess.run([sys.executable, '-m', 'benchmarks.datagen', '--db', database, '--user-skills', '1000'], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        env['DATABASE_URL'] = f'sqlite:///{database}'
+
+    try:
+        results = {'profile': args.profile, 'mock_api': args.mock, 'runs': args.runs, 'settle_seconds': args.settle}
+        imports = [measure_import(env) for _ in range(args.runs)]
+        results['import_and_create_ms'] = round(statistics.median(imports), 1)
+        for server in args.servers.split(','):
+            runs = [measure_boot(server, env, logins, args.settle) for _ in range(args.runs)]
+            results[server] = {**summarize(runs), 'samples': runs}
+            print(json.dumps({'server': server, **summarize(runs)}), file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
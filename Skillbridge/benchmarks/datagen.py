@@ -0,0 +1,223 @@
+"""Seeded synthetic dataset: companies, users, skills, user skills, projects,
+project members and project skills, sized by the number of user-skill rows
+(1k to 1M) with realistic skew: Zipfian skill popularity, log-normal team
+sizes and a handful of common allocations.
+
+Run from the Skillbridge directory:
+
+    python -m benchmarks.datagen --db /tmp/skillbridge_bench.db --user-skills 100000 --seed 1
+"""
+import argparse
+import json
+import math
+import os
+import time
+from datetime import date, datetime, timedelta
+import numpy as np
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from src.app import create_app
+from src.config import TestingConfig
+from src.models.user import db, User, Company
+from src.models.skill import Skill, UserSkill, Project, ProjectMember, ProjectSkill
+from src.migrations import upgrade
+from src.services.skill_gap import rebuild_skill_gap
+from src.services.staffing import skill_index
+from src.services.user_store import user_store
+from src.utils.cache import bump_table_versions, response_cache
+
+# Every generated user can log in with this password; user 1 is an admin
+DEFAULT_PASSWORD = 'benchmark'
+CHUNK_SIZE = 10000
+
+SKILL_CATEGORIES = ['Programming', 'Frontend', 'Backend', 'Database', 'Cloud', 'Data', 'Design', 'Management']
+PROJECT_STATUSES = (['planning', 'active', 'completed', 'on-hold'], [0.2, 0.5, 0.2, 0.1])
+ALLOCATIONS = ([10, 20, 25, 50, 75, 100], [0.05, 0.15, 0.1, 0.3, 0.1, 0.3])
+PROFICIENCY = ([1, 2, 3, 4, 5], [0.1, 0.2, 0.35, 0.25, 0.1])
+IMPORTANCE = ([1, 2, 3, 4, 5], [0.05, 0.15, 0.4, 0.25, 0.15])
+MEMBER_ROLES = ['Developer', 'Designer', 'Manager', 'Analyst', 'QA']
+
+def create_bench_app(database_uri):
+    # The database-backed API on its documented prefixes
+    return create_app(TestingConfig, SQLALCHEMY_DATABASE_URI=database_uri)
+
+def scale_for(user_skills):
+    # Table sizes for a target number of user-skill rows (~8 skills per user)
+    users = max(10, user_skills // 8)
+    return {
+        'users': users,
+        'skills': min(2000, max(50, int(40 * user_skills ** 0.25))),
+        'companies': max(1, users // 250),
+        'projects': max(3, users // 8)
+    }
+
+def zipf_weights(n, exponent=1.1):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+def _insert(model, rows):
+    for i in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(insert(model), rows[i:i + CHUNK_SIZE])
+
+def generate(user_skills, seed=1):
+    # Populates an empty, migrated database; returns the row counts
+    rng = np.random.default_rng(seed)
+    sizes = scale_for(user_skills)
+    today = date.today()
+    now = datetime.utcnow()
+    password_hash = generate_password_hash(DEFAULT_PASSWORD)
+
+    companies = [
+        {'id': i, 'name': f'Company {i}', 'industry': SKILL_CATEGORIES[i % len(SKILL_CATEGORIES)], 'size': 'medium', 'created_at': now}
+        for i in range(1, sizes['companies'] + 1)
+    ]
+
+    # Popularity follows skill id: skill 1 is the most common
+    n_skills = sizes['skills']
+    popularity = zipf_weights(n_skills)
+    skills = [
+        {'id': i, 'name': f'Skill {i}', 'category': SKILL_CATEGORIES[i % len(SKILL_CATEGORIES)], 'description': f'Synthetic skill {i}', 'created_at': now}
+        for i in range(1, n_skills + 1)
+    ]
+
+    n_users = sizes['users']
+    user_company = rng.integers(1, sizes['companies'] + 1, n_users)
+    users = [
+        {
+            'id': i,
+            'username': f'user{i}',
+            'email': f'user{i}@example.com',
+            'password_hash': password_hash,
+            'first_name': 'First',
+            'last_name': f'Last{i}',
+            'role': 'admin' if i == 1 else ('manager' if i % 20 == 0 else 'user'),
+            'company_id': int(user_company[i - 1]),
+            'created_at': now,
+            'is_active': True
+        }
+        for i in range(1, n_users + 1)
+    ]
+
+    # Skills per user: 1 + Poisson(7), so ~8 on average
+    per_user = np.minimum(1 + rng.poisson(7, n_users), n_skills)
+    scale = user_skills / per_user.sum()
+    per_user = np.clip(np.round(per_user * scale), 1, n_skills).astype(int)
+    user_skill_rows = []
+    for user_id, count in enumerate(per_user, start=1):
+        chosen = rng.choice(n_skills, size=count, replace=False, p=popularity)
+        proficiency = rng.choice(PROFICIENCY[0], size=count, p=PROFICIENCY[1])
+        years = np.round(rng.gamma(2.0, 1.5, count), 1)
+        certified = rng.random(count) < 0.15
+        last_used = rng.integers(0, 3 * 365, count)
+        for j in range(count):
+            user_skill_rows.append({
+                'user_id': user_id,
+                'skill_id': int(chosen[j]) + 1,
+                'proficiency_level': int(proficiency[j]),
+                'years_experience': float(years[j]),
+                'is_certified': bool(certified[j]),
+                'certification_name': f'Certified Skill {int(chosen[j]) + 1}' if certified[j] else None,
+                'last_used': today - timedelta(days=int(last_used[j])),
+                'created_at': now,
+                'updated_at': now
+            })
+
+    users_by_company = {}
+    for user in users:
+        users_by_company.setdefault(user['company_id'], []).append(user['id'])
+
+    projects = []
+    members = []
+    project_skills = []
+    statuses = rng.choice(PROJECT_STATUSES[0], size=sizes['projects'], p=PROJECT_STATUSES[1])
+    for project_id in range(1, sizes['projects'] + 1):
+        company_id = int(rng.integers(1, sizes['companies'] + 1))
+        start = today - timedelta(days=int(rng.integers(0, 720)))
+        projects.append({
+            'id': project_id,
+            'name': f'Project {project_id}',
+            'description': f'Synthetic project {project_id}',
+            'start_date': start,
+            'end_date': start + timedelta(days=int(rng.integers(30, 540))),
+            'status': str(statuses[project_id - 1]),
+            'company_id': company_id,
+            'created_at': now,
+            'updated_at': now
+        })
+
+        # Team size: log-normal around 6, capped by the company's headcount
+        candidates = users_by_company.get(company_id) or [1]
+        team_size = int(min(len(candidates), max(1, round(rng.lognormal(math.log(6), 0.6)))))
+        team = rng.choice(candidates, size=team_size, replace=False)
+        allocations = rng.choice(ALLOCATIONS[0], size=team_size, p=ALLOCATIONS[1])
+        for k, user_id in enumerate(team):
+            members.append({
+                'project_id': project_id,
+                'user_id': int(user_id),
+                'role': MEMBER_ROLES[int(user_id) % len(MEMBER_ROLES)],
+                'allocation_percentage': int(allocations[k]),
+                'joined_date': start,
+                'created_at': now
+            })
+
+        needed = rng.choice(n_skills, size=int(min(n_skills, rng.integers(3, 13))), replace=False, p=popularity)
+        importance = rng.choice(IMPORTANCE[0], size=len(needed), p=IMPORTANCE[1])
+        for k, skill in enumerate(needed):
+            project_skills.append({
+                'project_id': project_id,
+                'skill_id': int(skill) + 1,
+                'importance_level': int(importance[k]),
+                'created_at': now
+            })
+
+    for model, rows in (
+        (Company, companies),
+        (Skill, skills),
+        (User, users),
+        (UserSkill, user_skill_rows),
+        (Project, projects),
+        (ProjectMember, members),
+        (ProjectSkill, project_skills)
+    ):
+        _insert(model, rows)
+
+    # Core inserts bypass the flush listeners
+    bump_table_versions(db.session.connection(), [
+        model.__tablename__ for model in (Company, Skill, User, UserSkill, Project, ProjectMember, ProjectSkill)
+    ])
+    db.session.commit()
+    rebuild_skill_gap()
+    response_cache.clear()
+    skill_index.invalidate()
+    user_store.invalidate()
+
+    return {
+        'companies': len(companies),
+        'users': len(users),
+        'skills': len(skills),
+        'user_skills': len(user_skill_rows),
+        'projects': len(projects),
+        'project_members': len(members),
+        'project_skills': len(project_skills)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', required=True, help='SQLite file to create')
+    parser.add_argument('--user-skills', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        parser.error(f'{args.db} already exists')
+
+    app = create_bench_app(f'sqlite:///{os.path.abspath(args.db)}')
+    with app.app_context():
+        upgrade()
+        started = time.perf_counter()
+        counts = generate(args.user_skills, args.seed)
+        counts['seconds'] = round(time.perf_counter() - started, 2)
+    print(json.dumps(counts, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""Load test against the real server: boots the API under gunicorn on a
+seeded SQLite database for each worker configuration, replays user journeys
+(login, dashboard reads, occasional edits) from an asyncio HTTP/1.1 client at
+increasing concurrency, and reports throughput, latency percentiles, error
+rates and the saturation point per configuration.
+
+Run from the Skillbridge directory:
+
+    python -m benchmarks.loadtest --user-skills 50000 --configs 1x1,2x1,4x1,2x4 \\
+        --concurrency 1,4,16,64 --step-seconds 10 --output loadtest.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from src.migrations import upgrade
+from benchmarks.datagen import DEFAULT_PASSWORD, create_bench_app, generate
+
+# A level saturates the server when it adds less than this much throughput
+SATURATION_GAIN = 0.1
+REQUEST_TIMEOUT = 30
+
+class HTTPError(Exception):
+    pass
+
+class Connection:
+    # Minimal keep-alive HTTP/1.1 client: Content-Length and chunked bodies
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, token=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        payload = b'' if body is None else json.dumps(body).encode('utf-8')
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}', f'Content-Length: {len(payload)}']
+        if body is not None:
+            lines.append('Content-Type: application/json')
+        if token:
+            lines.append(f'Authorization: Bearer {token}')
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            await self.close()
+            raise HTTPError('connection closed')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding') == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            data = b''.join(chunks)
+        else:
+            data = await self.reader.readexactly(int(headers.get('content-length', 0)))
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, data
+
+class Recorder:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+
+    def record(self, started, status):
+        self.latencies.append((time.perf_counter() - started) * 1000)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+async def timed(connection, recorder, method, path, body=None, token=None, expected=(200, 201)):
+    started = time.perf_counter()
+    try:
+        status, data = await asyncio.wait_for(connection.request(method, path, body, token), REQUEST_TIMEOUT)
+    except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, HTTPError, ValueError):
+        await connection.close()
+        recorder.errors += 1
+        recorder.record(started, 'error')
+        return None
+    recorder.record(started, status)
+    if status not in expected:
+        recorder.errors += 1
+        return None
+    return json.loads(data) if data else {}
+
+async def journey(host, port, user_id, recorder, stop, think, edit_share, max_skill_id, rng):
+    # One virtual user: log in once, then load the dashboard and sometimes edit
+    connection = Connection(host, port)
+    try:
+        login = await timed(connection, recorder, 'POST', '/api/auth/login', {'username': f'user{user_id}', 'password': DEFAULT_PASSWORD})
+        if not login:
+            return
+        token = login['token']
+        while time.monotonic() < stop:
+            await timed(connection, recorder, 'GET', '/api/skill/skills', token=token)
+            projects = await timed(connection, recorder, 'GET', f'/api/skill/users/{user_id}/projects', token=token)
+            await timed(connection, recorder, 'GET', f'/api/skill/users/{user_id}/skills?include=skill', token=token)
+            for project in (projects or {}).get('projects', [])[:1]:
+                await timed(connection, recorder, 'GET', f'/api/skill/projects/{project["id"]}/skill-gap', token=token)
+                await timed(connection, recorder, 'GET', f'/api/skill/projects/{project["id"]}/members', token=token)
+            if rng.random() < edit_share:
+                # Already having the skill (409) is an expected outcome
+                await timed(connection, recorder, 'POST', f'/api/skill/users/{user_id}/skills', {
+                    'skill_id': rng.randint(1, max_skill_id),
+                    'proficiency_level': rng.randint(1, 5)
+                }, token=token, expected=(201, 409))
+            if think:
+                await asyncio.sleep(think)
+    finally:
+        await connection.close()
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(int(len(values) * fraction), len(values) - 1)], 2)
+
+async def run_level(host, port, concurrency, seconds, users, think, edit_share, max_skill_id, seed):
+    recorder = Recorder()
+    rng = random.Random(seed)
+    stop = time.monotonic() + seconds
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        journey(host, port, rng.randint(2, users), recorder, stop, think, edit_share, max_skill_id, random.Random(seed + i))
+        for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    total = len(recorder.latencies)
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'throughput_rps': round(total / elapsed, 1),
+        'p50_ms': percentile(recorder.latencies, 0.5),
+        'p95_ms': percentile(recorder.latencies, 0.95),
+        'p99_ms': percentile(recorder.latencies, 0.99),
+        'error_rate': round(recorder.errors / total, 4) if total else None,
+        'statuses': {str(status): count for status, count in recorder.statuses.items()}
+    }
+
+def saturation_point(levels):
+    # First concurrency whose successor adds less than SATURATION_GAIN throughput
+    for current, following in zip(levels, levels[1:]):
+        if following['throughput_rps'] < current['throughput_rps'] * (1 + SATURATION_GAIN):
+            return current['concurrency']
+    return None
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('gunicorn exited during start-up')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('gunicorn did not start listening')
+
+def boot(database, workers, threads, port, rate_limits):
+    env = dict(os.environ)
+    if not rate_limits:
+        env['RATE_LIMIT_ENABLED'] = '0'
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '--workers', str(workers),
+        '--threads', str(threads),
+        '--bind', f'127.0.0.1:{port}',
+        '--log-level', 'warning',
+        f'benchmarks.datagen:create_bench_app("sqlite:///{database}")'
+    ]
+    process = subprocess.Popen(command, env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    wait_for_port(port, process)
+    return process
+
+def seed_database(path, user_skills, seed):
+    app = create_bench_app(f'sqlite:///{path}')
+    with app.app_context():
+        upgrade()
+        return generate(user_skills, seed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help='Dataset from benchmarks.datagen (copied for each configuration)')
+    parser.add_argument('--user-skills', type=int, default=20000, help='Generate a dataset of this size when --db is not given')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--configs', default='1x1,2x1,4x1', help='Comma-separated WORKERSxTHREADS')
+    parser.add_argument('--concurrency', default='1,4,16,64', help='Comma-separated virtual-user counts')
+    parser.add_argument('--step-seconds', type=float, default=10)
+    parser.add_argument('--think', type=float, default=0, help='Seconds between dashboard loads')
+    parser.add_argument('--edit-share', type=float, default=0.2, help='Share of dashboard loads followed by an edit')
+    parser.add_argument('--rate-limits', action='store_true', help='Keep rate limiting on')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    source = args.db
+    dataset = {'db': args.db}
+    if source is None:
+        source = os.path.join(workdir, 'seed.db')
+        dataset = seed_database(source, args.user_skills, args.seed)
+
+    with sqlite3.connect(source) as connection:
+        users = connection.execute('SELECT MAX(id) FROM users').fetchone()[0]
+        max_skill_id = connection.execute('SELECT MAX(id) FROM skills').fetchone()[0]
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    results = []
+    try:
+        for config in args.configs.split(','):
+            workers, threads = (int(part) for part in config.split('x'))
+            # Every configuration starts from the same data
+            database = os.path.join(workdir, f'run-{config}.db')
+            shutil.copy(source, database)
+            port = free_port()
+            process = boot(database, workers, threads, port, args.rate_limits)
+            try:
+                runs = []
+                for concurrency in levels:
+                    runs.append(asyncio.run(run_level(
+                        '127.0.0.1', port, concurrency, args.step_seconds, users,
+                        args.think, args.edit_share, max_skill_id, args.seed
+                    )))
+                    print(json.dumps({'config': config, **runs[-1]}), file=sys.stderr)
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+            results.append({
+                'workers': workers,
+                'threads': threads,
+                'levels': runs,
+                'peak_throughput_rps': max(run['throughput_rps'] for run in runs),
+                'saturation_concurrency': saturation_point(runs)
+            })
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps({'dataset': dataset, 'step_seconds': args.step_seconds, 'configs': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
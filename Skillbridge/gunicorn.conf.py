@@ -0,0 +1,51 @@
+import os
+
+# Production serving profile
+#
+#     gunicorn -c gunicorn.conf.py src.main:app
+#
+# The app is imported and built once in the master (preload_app) and the
+# workers are forked from it, so each worker starts serving without paying
+# for the imports again. Worker and thread counts follow the CPUs available
+# to this process; WEB_CONCURRENCY and GUNICORN_THREADS override them.
+# `kill -HUP <master>` reloads gracefully: new workers are started before the
+# old ones finish their in-flight requests. With preload_app, code changes
+# need a restart (or USR2 + WINCH) rather than a HUP.
+
+def _cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+cpus = _cpu_count()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5002')}"
+# Requests mostly wait on SQLite and the password pool, so a few threads per
+# worker go further than extra processes.
+# Each worker also starts its own child processes: PASSWORD_HASH_WORKERS
+# password hashers (default min(4, CPUs), started at fork in production) and
+# OPTIMIZER_WORKERS assignment optimizers (default 2, started on first use).
+# With the defaults that is up to 6 children per worker: 8 workers bring 48
+# more processes (32 hashers, 16 optimizers). Lower those settings along with
+# WEB_CONCURRENCY on small instances.
+workers = int(os.environ.get('WEB_CONCURRENCY', min(2 * cpus + 1, int(os.environ.get('GUNICORN_MAX_WORKERS', '8')))))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+# Recycle workers now and then; the jitter keeps them from restarting together
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = max_requests // 10
+
+# Application logs are structured JSON on stderr; skip gunicorn's access log
+accesslog = None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+def post_fork(server, worker):
+    from src.app import init_worker
+    init_worker(server.app.wsgi())
@@ -0,0 +1,101 @@
+import os
+import logging
+from importlib import import_module
+from flask import Flask
+from src.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Application factory
+#
+# create_app() builds the app for a profile from src/config.py. Route modules
+# are imported only when their blueprint is configured, so the mock API never
+# loads SQLAlchemy or the services behind the real one. Under gunicorn the
+# app is built once in the master (preload_app) and init_worker() runs in
+# every worker after fork.
+
+def load_blueprint(path):
+    module, _, name = path.partition(':')
+    return getattr(import_module(module), name)
+
+def create_app(config=None, **overrides):
+    # config: a class from src.config, a profile name or None (SKILLBRIDGE_ENV)
+    if config is None or isinstance(config, str):
+        config = get_config(config)
+    config.validate()
+
+    # Relative SQLite URIs resolve against src/instance, as before the factory
+    app = Flask(__name__, instance_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance'))
+    app.config.from_object(config)
+    app.config.update(overrides)
+
+    # Structured JSON logs, written by a background thread (LOG_LEVEL, default INFO)
+    if app.config['STRUCTURED_LOGGING']:
+        from src.utils.structured_logging import configure_logging
+        configure_logging()
+
+    # Client addresses from X-Forwarded-For, for trusted proxy hops only
+    if app.config['TRUSTED_PROXY_HOPS']:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_HOPS'])
+
+    # Per-worker in-flight count for admission control
+    from src.utils.rate_limit import init_admission
+    init_admission(app)
+
+    # CORS, with preflights answered before routing
+    from src.utils.cors import init_cors
+    init_cors(app)
+
+    # The mock API never touches the database, so it skips loading SQLAlchemy
+    # and the models altogether (the bulk of the import time)
+    database = not app.config['MOCK_API']
+    if database:
+        # Database and schema migrations
+        # (`SKILLBRIDGE_MOCK_API=0 flask --app src.main schema upgrade`)
+        from src.models.user import db
+        from src.migrations import schema_cli
+        db.init_app(app)
+        app.cli.add_command(schema_cli)
+
+    # orjson-backed jsonify (stdlib json when orjson is not installed)
+    from src.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
+    # Per-request timings, query counts and /api/metrics
+    if app.config['METRICS']:
+        from src.utils.metrics import init_metrics
+        init_metrics(app, database=database)
+
+    blueprints = app.config['MOCK_BLUEPRINTS'] if app.config['MOCK_API'] else app.config['BLUEPRINTS']
+    for path, url_prefix in blueprints:
+        app.register_blueprint(load_blueprint(path), url_prefix=url_prefix)
+
+    if database:
+        if app.config['MIGRATE_ON_START']:
+            from src.migrations import upgrade
+            with app.app_context():
+                for number, description in upgrade():
+                    logger.info(f"Applied schema migration {number}: {description}")
+
+        # Resolve mapper relationships now rather than on the first query, so
+        # forked workers inherit configured mappers
+        from sqlalchemy.orm import configure_mappers
+        configure_mappers()
+
+    logger.info(f"App created ({config.__name__}, {'database' if database else 'mock'} API, {len(blueprints)} blueprints)")
+    return app
+
+def init_worker(app):
+    # Called in each gunicorn worker right after fork (see gunicorn.conf.py)
+    if app.config['MOCK_API']:
+        return
+
+    from src.models.user import db
+    with app.app_context():
+        # Connections opened in the master must not be shared with the child
+        db.engine.dispose(close=False)
+
+    if app.config['WARM_PASSWORD_POOL']:
+        from src.utils.passwords import warm_pool
+        warm_pool()
@@ -0,0 +1,96 @@
+import os
+from src.utils.auth import SECRET_KEY as DEFAULT_SECRET_KEY
+
+# Application profiles
+#
+# create_app() takes one of these classes (or its name); SKILLBRIDGE_ENV (or
+# FLASK_ENV) picks the profile when none is given. Blueprints are imported by
+# dotted path when the app is created, so only the configured ones are loaded.
+
+def _flag(name, default):
+    return os.environ.get(name, '1' if default else '0') == '1'
+
+# Request threads per gunicorn worker (gunicorn.conf.py reads the same variable)
+WORKER_THREADS = int(os.environ.get('GUNICORN_THREADS', '4'))
+
+# 'module:attribute', url prefix
+API_BLUEPRINTS = [
+    ('src.routes.status:status_bp', None),
+    ('src.routes.auth:auth_bp', '/api/auth'),
+    ('src.routes.skill:skill_bp', '/api/skill'),
+    ('src.routes.project:project_bp', '/api/skill'),
+    ('src.routes.company:company_bp', '/api/company'),
+    ('src.routes.user:user_bp', '/api'),
+    ('src.routes.export:export_bp', '/api'),
+    ('src.routes.imports:imports_bp', '/api')
+]
+
+# Demo data for the frontend; the mock routes shadow the real ones
+MOCK_BLUEPRINTS = [
+    ('src.routes.status:status_bp', None),
+    ('src.routes.mock:mock_bp', None)
+]
+
+class Config:
+    DEBUG = False
+    TESTING = False
+    SECRET_KEY = DEFAULT_SECRET_KEY
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///skillbridge.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Serve the mock routes instead of the database-backed API
+    MOCK_API = _flag('SKILLBRIDGE_MOCK_API', True)
+    BLUEPRINTS = API_BLUEPRINTS
+    MOCK_BLUEPRINTS = MOCK_BLUEPRINTS
+    # Apply pending schema migrations when the app is created
+    MIGRATE_ON_START = _flag('SKILLBRIDGE_MIGRATE_ON_START', False)
+    STRUCTURED_LOGGING = True
+    METRICS = True
+    # Serve /api/metrics to any client when METRICS_TOKEN is not set; off in
+    # production, where it is then served to localhost only
+    METRICS_PUBLIC = True
+    # Start the password hashing processes in each worker right after fork
+    # instead of on the first login
+    WARM_PASSWORD_POOL = False
+    # Proxies in front of the app whose X-Forwarded-For is trusted (ProxyFix);
+    # 0 keys rate limits on the socket peer address
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', '0'))
+    # Shed heavy requests once every thread of the worker would be busy,
+    # keeping one free for cheap endpoints
+    SHED_HEAVY_AT_IN_FLIGHT = int(os.environ.get('SHED_HEAVY_AT_IN_FLIGHT', str(max(WORKER_THREADS - 1, 1))))
+
+    @classmethod
+    def validate(cls):
+        pass
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+    MIGRATE_ON_START = _flag('SKILLBRIDGE_MIGRATE_ON_START', True)
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite://')
+    MOCK_API = False
+    MIGRATE_ON_START = True
+    STRUCTURED_LOGGING = False
+    METRICS = False
+
+class ProductionConfig(Config):
+    WARM_PASSWORD_POOL = True
+    METRICS_PUBLIC = False
+
+    @classmethod
+    def validate(cls):
+        if not (os.environ.get('SECRET_KEY') or os.environ.get('JWT_SECRET_KEY')):
+            raise RuntimeError('SECRET_KEY must be set in production')
+
+CONFIGS = {
+    'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig
+}
+
+def get_config(name=None):
+    name = name or os.environ.get('SKILLBRIDGE_ENV') or os.environ.get('FLASK_ENV') or 'development'
+    if name not in CONFIGS:
+        raise ValueError(f'Unknown config: {name} (available: {", ".join(CONFIGS)})')
+    return CONFIGS[name]
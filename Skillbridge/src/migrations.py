@@ -0,0 +1,198 @@
+import click
+from datetime import datetime
+from flask.cli import AppGroup
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, and_, delete, func, insert, or_, select, text
+from src.models.user import db, User, Company
+from src.models.skill import Skill, UserSkill, Project, ProjectMember, ProjectSkill
+from src.models import version  # noqa: F401 (registers table_versions)
+from src.services.skill_gap import (
+    affected_pairs_query, gap_rows_query, materialized_gap_query, materialized_rows_query, refresh_gap_rows
+)
+from src.utils.cache import bump_table_versions
+
+# Versioned schema migrations
+#
+# Each migration runs in its own transaction together with the row that records
+# it in schema_version, so a failed migration leaves the schema at the previous
+# version. Run them with `flask schema upgrade`.
+
+schema_metadata = MetaData()
+
+schema_version = Table(
+    'schema_version', schema_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+MIGRATIONS = []
+
+def migration(version, description):
+    def decorator(f):
+        MIGRATIONS.append((version, description, f))
+        MIGRATIONS.sort(key=lambda entry: entry[0])
+        return f
+    return decorator
+
+def create_indexes(connection, table, names):
+    for index in db.metadata.tables[table].indexes:
+        if index.name in names:
+            index.create(connection, checkfirst=True)
+
+@migration(1, 'Create missing tables')
+def create_tables(connection):
+    db.metadata.create_all(connection, checkfirst=True)
+
+@migration(2, 'Index foreign keys used by list and gap queries')
+def index_foreign_keys(connection):
+    create_indexes(connection, 'user_skills', {'ix_user_skills_skill_id'})
+    create_indexes(connection, 'project_members', {'ix_project_members_user_id'})
+    create_indexes(connection, 'project_skills', {'ix_project_skills_skill_id'})
+    create_indexes(connection, 'projects', {'ix_projects_company_id'})
+    create_indexes(connection, 'users', {'ix_users_company_id'})
+
+# (model, columns that must be unique together, unique index name)
+UNIQUE_ASSOCIATIONS = [
+    (UserSkill, ('user_id', 'skill_id'), 'uq_user_skills_user_id_skill_id'),
+    (ProjectMember, ('project_id', 'user_id'), 'uq_project_members_project_id_user_id'),
+    (ProjectSkill, ('project_id', 'skill_id'), 'uq_project_skills_project_id_skill_id')
+]
+
+@migration(3, 'Unique user skills, project members and project skills')
+def unique_associations(connection):
+    changed = []
+    for model, columns, index_name in UNIQUE_ASSOCIATIONS:
+        # Keep the oldest row of every duplicated pair
+        keep = select(func.min(model.id)).group_by(*[getattr(model, column) for column in columns])
+        result = connection.execute(delete(model).where(model.id.not_in(keep)))
+        if result.rowcount:
+            click.echo(f'Removed {result.rowcount} duplicate rows from {model.__tablename__}')
+            changed.append(model.__tablename__)
+        create_indexes(connection, model.__tablename__, {index_name})
+
+    if changed:
+        bump_table_versions(connection, changed)
+        refresh_gap_rows(connection, project_ids=[
+            row[0] for row in connection.execute(select(ProjectSkill.project_id).distinct())
+        ])
+
+@migration(4, 'Index name sort keys for keyset pagination')
+def index_sort_keys(connection):
+    create_indexes(connection, 'skills', {'ix_skills_name'})
+    create_indexes(connection, 'projects', {'ix_projects_name'})
+    create_indexes(connection, 'companies', {'ix_companies_name'})
+
+def applied_versions(connection):
+    schema_metadata.create_all(connection, checkfirst=True)
+    return {row[0] for row in connection.execute(select(schema_version.c.version))}
+
+def upgrade(target=None):
+    # Apply every pending migration up to target (default: latest)
+    applied = []
+    for number, description, apply in MIGRATIONS:
+        if target is not None and number > target:
+            break
+        with db.engine.begin() as connection:
+            if number in applied_versions(connection):
+                continue
+            apply(connection)
+            connection.execute(insert(schema_version).values(
+                version=number,
+                description=description,
+                applied_at=datetime.utcnow()
+            ))
+        applied.append((number, description))
+    return applied
+
+def current_version():
+    with db.engine.begin() as connection:
+        return max(applied_versions(connection), default=0)
+
+# Index plan checks
+#
+# Every filtered list query and every skill gap query must be answered with
+# index searches; a plain SCAN of a table means a missing or unusable index.
+# Paged queries may walk an index in sort order, but must not sort.
+
+def page_query(model, column, after=('m', 100), limit=101):
+    value, last_id = after
+    return (
+        select(model)
+        .where(or_(column > value, and_(column == value, model.id > last_id)))
+        .order_by(column, model.id)
+        .limit(limit)
+    )
+
+def planned_queries():
+    # (name, statement, paged)
+    return [
+        ('skills page by id', page_query(Skill, Skill.id, after=(100, 100)), True),
+        ('skills page by name', page_query(Skill, Skill.name), True),
+        ('projects page by name', page_query(Project, Project.name), True),
+        ('companies page by name', page_query(Company, Company.name), True),
+        ('users page by username', page_query(User, User.username), True),
+        ('user skills', select(UserSkill).where(UserSkill.user_id == 1), False),
+        ('user skill lookup', select(UserSkill).where(UserSkill.user_id == 1, UserSkill.skill_id == 1), False),
+        ('project skills', select(ProjectSkill).where(ProjectSkill.project_id == 1), False),
+        ('project members', select(ProjectMember).where(ProjectMember.project_id == 1), False),
+        ('user projects', select(ProjectMember).where(ProjectMember.user_id == 1), False),
+        ('company projects', select(Project).where(Project.company_id == 1), False),
+        ('company employees', select(User).where(User.company_id == 1), False),
+        ('skill gap (aggregate)', gap_rows_query(1), False),
+        ('skill gap (materialized)', materialized_gap_query(1), False),
+        ('skill gap refresh', materialized_rows_query(project_ids=[1, 2]), False),
+        ('skill gap refresh (pairs)', materialized_rows_query(pairs=[(1, 1), (2, 3)]), False),
+        ('skill gap affected pairs', affected_pairs_query([(1, 1), (2, 3)]), False)
+    ]
+
+def plan_problems(plan, paged):
+    tables = set(db.metadata.tables)
+    problems = []
+    for line in plan:
+        words = line.split()
+        if len(words) > 1 and words[0] == 'SCAN' and words[1] in tables:
+            if not paged or 'INDEX' not in words:
+                problems.append(f'full scan of {words[1]}')
+        if paged and line.startswith('USE TEMP B-TREE FOR') and 'ORDER BY' in line:
+            problems.append('sorts instead of walking an index')
+    return problems
+
+def explain_query_plans():
+    # Returns [(name, plan lines, problems)]
+    results = []
+    with db.engine.connect() as connection:
+        for name, statement, paged in planned_queries():
+            compiled = statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True})
+            plan = [row[3] for row in connection.execute(text(f'EXPLAIN QUERY PLAN {compiled}'))]
+            results.append((name, plan, plan_problems(plan, paged)))
+    return results
+
+schema_cli = AppGroup('schema', help='Database schema migrations.')
+
+@schema_cli.command('upgrade')
+@click.option('--to', 'target', type=int, default=None, help='Stop at this schema version.')
+def upgrade_command(target):
+    applied = upgrade(target)
+    for number, description in applied:
+        click.echo(f'Applied {number}: {description}')
+    click.echo(f'Schema version {current_version()}')
+
+@schema_cli.command('current')
+def current_command():
+    click.echo(f'Schema version {current_version()} (latest {MIGRATIONS[-1][0]})')
+
+@schema_cli.command('explain')
+@click.option('--verbose', is_flag=True, help='Print every query plan.')
+def explain_command(verbose):
+    failures = 0
+    for name, plan, problems in explain_query_plans():
+        if problems:
+            failures += 1
+            click.echo(f'FAIL {name}: {", ".join(problems)}')
+        else:
+            click.echo(f'ok   {name}')
+        if verbose or problems:
+            for line in plan:
+                click.echo(f'       {line}')
+    if failures:
+        raise click.ClickException(f'{failures} queries do not use an index')
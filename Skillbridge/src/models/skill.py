@@ -7,7 +7,7 @@ class Skill(db.Model):
     __tablename__ = 'skills'
     
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(100), nullable=False, index=True)
     category = db.Column(db.String(50))
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -24,10 +24,14 @@ class Skill(db.Model):
 # UserSkill model (association between User and Skill)
 class UserSkill(db.Model):
     __tablename__ = 'user_skills'
+    # One row per (user, skill); the unique index also serves lookups by user_id
+    __table_args__ = (
+        db.Index('uq_user_skills_user_id_skill_id', 'user_id', 'skill_id', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=False)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=False, index=True)
     proficiency_level = db.Column(db.Integer)  # 1-5
     years_experience = db.Column(db.Float)
     is_certified = db.Column(db.Boolean, default=False)
@@ -62,12 +66,12 @@ class Project(db.Model):
     __tablename__ = 'projects'
     
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(100), nullable=False, index=True)
     description = db.Column(db.Text)
     start_date = db.Column(db.Date)
     end_date = db.Column(db.Date)
     status = db.Column(db.String(20), default='planning')  # planning, active, completed, on-hold
-    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'))
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -85,16 +89,20 @@ class Project(db.Model):
             'company_id': self.company_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'member_count': len(self.members) if hasattr(self, 'members') else 0
+            'member_count': self.member_count or 0
         }
 
 # ProjectMember model (association between Project and User)
 class ProjectMember(db.Model):
     __tablename__ = 'project_members'
+    # One membership per (project, user); the unique index also serves lookups by project_id
+    __table_args__ = (
+        db.Index('uq_project_members_project_id_user_id', 'project_id', 'user_id', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     role = db.Column(db.String(50))  # Developer, Designer, Manager, etc.
     allocation_percentage = db.Column(db.Integer, default=100)
     joined_date = db.Column(db.Date, default=datetime.utcnow)
@@ -115,13 +123,25 @@ class ProjectMember(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+# Counted in SQL as part of the project query, without loading members
+Project.member_count = db.column_property(
+    db.select(db.func.count(ProjectMember.id))
+    .where(ProjectMember.project_id == Project.id)
+    .correlate_except(ProjectMember)
+    .scalar_subquery()
+)
+
 # ProjectSkill model (association between Project and Skill)
 class ProjectSkill(db.Model):
     __tablename__ = 'project_skills'
+    # One requirement per (project, skill); the unique index also serves lookups by project_id
+    __table_args__ = (
+        db.Index('uq_project_skills_project_id_skill_id', 'project_id', 'skill_id', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
-    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=False)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=False, index=True)
     importance_level = db.Column(db.Integer)  # 1-5
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -138,3 +158,23 @@ class ProjectSkill(db.Model):
             'importance_level': self.importance_level,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+# ProjectSkillGap model (derived coverage per required project skill)
+# Maintained incrementally by src.services.skill_gap; never written by routes.
+class ProjectSkillGap(db.Model):
+    __tablename__ = 'project_skill_gap'
+    
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), primary_key=True)
+    coverage = db.Column(db.Integer, nullable=False, default=0)
+    proficiency_sum = db.Column(db.Integer, nullable=False, default=0)
+    member_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        return {
+            'project_id': self.project_id,
+            'skill_id': self.skill_id,
+            'coverage': self.coverage,
+            'proficiency_sum': self.proficiency_sum,
+            'member_count': self.member_count
+        }
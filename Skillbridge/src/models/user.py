@@ -1,5 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from src.utils.passwords import hash_password, verify_password
 from datetime import datetime
 
 # Initialize SQLAlchemy
@@ -16,7 +16,7 @@ class User(db.Model):
     first_name = db.Column(db.String(50))
     last_name = db.Column(db.String(50))
     role = db.Column(db.String(20), default='user')  # user, manager, admin
-    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'))
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_login = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
@@ -25,10 +25,11 @@ class User(db.Model):
     company = db.relationship('Company', back_populates='employees')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        # Hashed in the password pool, off the request thread
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
     
     def to_dict(self):
         return {
@@ -49,7 +50,7 @@ class Company(db.Model):
     __tablename__ = 'companies'
     
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(100), nullable=False, index=True)
     industry = db.Column(db.String(50))
     size = db.Column(db.String(20))  # small, medium, large
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -57,6 +58,14 @@ class Company(db.Model):
     # Define relationship with User
     employees = db.relationship('User', back_populates='company')
     
+    # Counted in SQL as part of the company query, without loading employees
+    employee_count = db.column_property(
+        db.select(db.func.count(User.id))
+        .where(User.company_id == id)
+        .correlate_except(User)
+        .scalar_subquery()
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -64,5 +73,5 @@ class Company(db.Model):
             'industry': self.industry,
             'size': self.size,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'employee_count': len(self.employees) if self.employees else 0
+            'employee_count': self.employee_count or 0
         }
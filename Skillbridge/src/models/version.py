@@ -0,0 +1,20 @@
+from src.models.user import db
+from datetime import datetime
+
+# TableVersion model (change counters used to validate cached responses)
+# One row per table, plus one row per project for its skill gap
+# ('project_gap:<id>'). Rows are bumped inside the transaction that changes
+# the data, so every worker sees the new version as soon as it is committed.
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+    
+    name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'version': self.version,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
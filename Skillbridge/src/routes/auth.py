@@ -1,74 +1,83 @@
 from flask import Blueprint, request, jsonify
+from src.services.user_store import user_store, UsernameTaken, EmailTaken
+from src.utils.auth import SECRET_KEY, verify_token
+from src.utils.passwords import verify_password, PasswordPoolUnavailable
+from src.utils.rate_limit import rate_limited
+import click
 import jwt
 import datetime
-import os
+import logging
 from functools import wraps
 
 auth_bp = Blueprint('auth', __name__)
 
-# Secret key for JWT
-SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'dev_secret_key')
+logger = logging.getLogger(__name__)
 
-# Mock user database for demo
-USERS = {
-    'admin': {
-        'password': 'admin123',
-        'id': 1,
-        'role': 'admin'
-    }
-}
+def check_credentials(username, password):
+    # Returns the stored user record when the password matches
+    user = user_store.get(username)
+    if not user or not user['is_active']:
+        return None
+    if not verify_password(user['password_hash'], password):
+        return None
+    return user
+
+def busy_response():
+    response = jsonify({'success': False, 'message': 'Server is busy, please retry'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
 
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-        
-        if not token:
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith('Bearer '):
             return jsonify({'message': 'Token is missing!'}), 401
         
-        try:
-            data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-            current_user = USERS.get(data['username'])
-            if not current_user:
-                return jsonify({'message': 'User not found!'}), 401
-        except Exception as e:
-            return jsonify({'message': f'Token is invalid! Error: {str(e)}'}), 401
+        # Shared (cached) verification
+        data, error, status_code = verify_token(auth_header)
+        if error:
+            return jsonify({'message': f"Token is invalid! Error: {error['error']}"}), status_code
+        
+        current_user = user_store.get(data.get('username'))
+        if not current_user:
+            return jsonify({'message': 'User not found!'}), 401
             
         return f(current_user, *args, **kwargs)
     
     return decorated
 
 @auth_bp.route('/test', methods=['POST'])
+@rate_limited('login')
 def test_auth():
     try:
         # Log request for debugging
-        print(f"Auth test request received: {request.method} {request.path}")
+        logger.debug(f"Auth test request received: {request.method} {request.path}")
         
         # Get request data
         data = request.get_json()
         if not data:
-            print("No JSON data in request")
+            logger.info("No JSON data in request")
             return jsonify({'success': False, 'message': 'No data provided'}), 400
             
         username = data.get('username')
         password = data.get('password')
         
-        print(f"Login attempt for user: {username}")
+        logger.debug(f"Login attempt for user: {username}")
         
         # Simple validation
         if not username or not password:
-            print("Missing username or password")
+            logger.info("Missing username or password")
             return jsonify({'success': False, 'message': 'Missing username or password'}), 400
             
-        user = USERS.get(username)
+        try:
+            user = check_credentials(username, password)
+        except PasswordPoolUnavailable as e:
+            logger.warning(f"Password pool unavailable, rejecting login: {str(e)}")
+            return busy_response()
         
-        if not user or user['password'] != password:
-            print(f"Invalid credentials for user: {username}")
+        if not user:
+            logger.warning(f"Invalid credentials for user: {username}")
             return jsonify({'success': False, 'message': 'Invalid credentials'}), 401
             
         # Generate token
@@ -79,7 +88,7 @@ def test_auth():
             'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=24)
         }, SECRET_KEY, algorithm="HS256")
         
-        print(f"Authentication successful for user: {username}")
+        logger.info(f"Authentication successful for user: {username}")
         
         # Return success response with explicit message and user ID
         return jsonify({
@@ -95,7 +104,7 @@ def test_auth():
         
     except Exception as e:
         # Log the error
-        print(f"Authentication error: {str(e)}")
+        logger.exception(f"Authentication error: {str(e)}")
         
         # Return error response
         return jsonify({
@@ -104,31 +113,36 @@ def test_auth():
         }), 500
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limited('login')
 def login():
     try:
         # Log request for debugging
-        print(f"Login request received: {request.method} {request.path}")
+        logger.debug(f"Login request received: {request.method} {request.path}")
         
         # Get request data
         data = request.get_json()
         if not data:
-            print("No JSON data in request")
+            logger.info("No JSON data in request")
             return jsonify({'success': False, 'message': 'No data provided'}), 400
             
         username = data.get('username')
         password = data.get('password')
         
-        print(f"Login attempt for user: {username}")
+        logger.debug(f"Login attempt for user: {username}")
         
         # Simple validation
         if not username or not password:
-            print("Missing username or password")
+            logger.info("Missing username or password")
             return jsonify({'success': False, 'message': 'Missing username or password'}), 400
             
-        user = USERS.get(username)
+        try:
+            user = check_credentials(username, password)
+        except PasswordPoolUnavailable as e:
+            logger.warning(f"Password pool unavailable, rejecting login: {str(e)}")
+            return busy_response()
         
-        if not user or user['password'] != password:
-            print(f"Invalid credentials for user: {username}")
+        if not user:
+            logger.warning(f"Invalid credentials for user: {username}")
             return jsonify({'success': False, 'message': 'Invalid credentials'}), 401
             
         # Generate token
@@ -139,7 +153,7 @@ def login():
             'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=24)
         }, SECRET_KEY, algorithm="HS256")
         
-        print(f"Authentication successful for user: {username}")
+        logger.info(f"Authentication successful for user: {username}")
         
         # Return success response
         return jsonify({
@@ -154,7 +168,7 @@ def login():
         
     except Exception as e:
         # Log the error
-        print(f"Authentication error: {str(e)}")
+        logger.exception(f"Authentication error: {str(e)}")
         
         # Return error response
         return jsonify({
@@ -163,15 +177,16 @@ def login():
         }), 500
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limited('register')
 def register():
     try:
         # Log request for debugging
-        print(f"Register request received: {request.method} {request.path}")
+        logger.debug(f"Register request received: {request.method} {request.path}")
         
         # Get request data
         data = request.get_json()
         if not data:
-            print("No JSON data in request")
+            logger.info("No JSON data in request")
             return jsonify({'success': False, 'message': 'No data provided'}), 400
             
         username = data.get('username')
@@ -179,23 +194,31 @@ def register():
         
         # Simple validation
         if not username or not password:
-            print("Missing username or password")
+            logger.info("Missing username or password")
             return jsonify({'success': False, 'message': 'Missing username or password'}), 400
             
-        # Check if user already exists
-        if username in USERS:
-            print(f"User already exists: {username}")
+        # Create new user in the shared store (unique username index)
+        try:
+            user = user_store.create(
+                username,
+                password,
+                email=data.get('email'),
+                role='user',  # Default role for new users
+                first_name=data.get('first_name'),
+                last_name=data.get('last_name')
+            )
+        except UsernameTaken:
+            logger.info(f"User already exists: {username}")
             return jsonify({'success': False, 'message': 'Username already taken'}), 409
-            
-        # Create new user (in a real app, this would be saved to a database)
-        user_id = len(USERS) + 1
-        USERS[username] = {
-            'password': password,
-            'id': user_id,
-            'role': 'user'  # Default role for new users
-        }
+        except EmailTaken:
+            logger.info(f"Email already registered: {username}")
+            return jsonify({'success': False, 'message': 'Email already registered'}), 409
+        except PasswordPoolUnavailable as e:
+            logger.warning(f"Password pool unavailable, rejecting registration: {str(e)}")
+            return busy_response()
+        user_id = user.id
         
-        print(f"User registered successfully: {username}")
+        logger.info(f"User registered successfully: {username}")
         
         # Return success response
         return jsonify({
@@ -210,7 +233,7 @@ def register():
         
     except Exception as e:
         # Log the error
-        print(f"Registration error: {str(e)}")
+        logger.exception(f"Registration error: {str(e)}")
         
         # Return error response
         return jsonify({
@@ -235,3 +258,18 @@ def get_profile(current_user):
             'success': False,
             'message': f'Server error: {str(e)}'
         }), 500
+
+# User management command (flask auth create-user)
+@auth_bp.cli.command('create-user')
+@click.argument('username')
+@click.password_option()
+@click.option('--email', default=None)
+@click.option('--role', default='user', type=click.Choice(['user', 'manager', 'admin']))
+def create_user_command(username, password, email, role):
+    try:
+        user = user_store.create(username, password, email=email, role=role)
+    except UsernameTaken:
+        raise click.ClickException(f'User already exists: {username}')
+    except EmailTaken:
+        raise click.ClickException(f'Email already registered: {email}')
+    click.echo(f'Created {role} {username} with id {user.id}')
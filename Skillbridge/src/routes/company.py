@@ -1,32 +1,16 @@
 from flask import Blueprint, request, jsonify
 from src.models.user import db, Company
-import jwt
-import os
+from src.utils.cache import response_cache
+from src.utils.auth import verify_token, has_permission
+from src.utils.conditional import conditional_get
+from src.utils.pagination import page_request, paginate, InvalidPage
+from src.utils.serializers import company_serializer, InvalidFields
 
 company_bp = Blueprint('company', __name__)
 
-# Secret key for JWT
-SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key')
-
-# Helper function to verify JWT token
-def verify_token(auth_header):
-    if not auth_header or not auth_header.startswith('Bearer '):
-        return None, {'error': 'Authorization token is missing'}, 401
-    
-    token = auth_header.split(' ')[1]
-    
-    try:
-        # Decode and verify token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        return payload, None, None
-    
-    except jwt.ExpiredSignatureError:
-        return None, {'error': 'Token has expired'}, 401
-    except jwt.InvalidTokenError:
-        return None, {'error': 'Invalid token'}, 401
-
 # Company management endpoints
 @company_bp.route('/companies', methods=['GET'])
+@conditional_get('list', ('companies', 'users'))
 def get_companies():
     # Get token from Authorization header
     auth_header = request.headers.get('Authorization')
@@ -35,12 +19,24 @@ def get_companies():
     if error:
         return jsonify(error), status_code
     
-    # Get all companies
-    companies = Company.query.all()
-    
-    return jsonify({
-        'companies': [company.to_dict() for company in companies]
-    }), 200
+    try:
+        page = page_request({'id': Company.id, 'name': Company.name})
+        fields = company_serializer.parse_fields()
+    except (InvalidPage, InvalidFields) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    query = company_serializer.query(fields, keys=('id', page.column.key))
+    
+    def compute():
+        companies, next_cursor = paginate(query, Company.id, page)
+        return {'companies': company_serializer.serialize(companies, fields), 'next_cursor': next_cursor}
+    
+    # Get a page of companies unless the cached response is still current
+    return response_cache.fetch(
+        ('companies', page.cache_key(), fields),
+        ('companies', 'users'),
+        compute
+    )
 
 @company_bp.route('/companies', methods=['POST'])
 def create_company():
@@ -51,8 +47,8 @@ def create_company():
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin
-    if payload['role'] != 'admin':
+    # Check if user can manage companies
+    if not has_permission(payload, 'companies:write'):
         return jsonify({'error': 'Unauthorized access'}), 403
     
     data = request.get_json()
@@ -78,6 +74,7 @@ def create_company():
     }), 201
 
 @company_bp.route('/companies/<int:company_id>', methods=['GET'])
+@conditional_get('list', ('companies', 'users'))
 def get_company(company_id):
     # Get token from Authorization header
     auth_header = request.headers.get('Authorization')
@@ -104,8 +101,8 @@ def update_company(company_id):
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin
-    if payload['role'] != 'admin':
+    # Check if user can manage companies
+    if not has_permission(payload, 'companies:write'):
         return jsonify({'error': 'Unauthorized access'}), 403
     
     # Get company from database
@@ -139,8 +136,8 @@ def delete_company(company_id):
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin
-    if payload['role'] != 'admin':
+    # Check if user can manage companies
+    if not has_permission(payload, 'companies:write'):
         return jsonify({'error': 'Unauthorized access'}), 403
     
     # Get company from database
@@ -148,8 +145,8 @@ def delete_company(company_id):
     if not company:
         return jsonify({'error': 'Company not found'}), 404
     
-    # Check if company has employees
-    if company.employees and len(company.employees) > 0:
+    # Check if company has employees (counted in SQL)
+    if company.employee_count:
         return jsonify({'error': 'Cannot delete company with employees'}), 400
     
     # Delete company
@@ -0,0 +1,131 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from sqlalchemy import select
+from src.models.user import db, User
+from src.models.skill import Skill, UserSkill, Project, ProjectMember
+from src.utils.auth import verify_token, has_permission
+import csv
+import io
+import json
+
+export_bp = Blueprint('export', __name__)
+
+# Streaming exports
+#
+# Rows are read with a server-side cursor in batches of EXPORT_BATCH_SIZE
+# (yield_per) as plain tuples, encoded batch by batch and written straight to
+# the response, so memory stays flat however many rows are exported.
+
+EXPORT_BATCH_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+    'csv': 'text/csv'
+}
+
+def _value(value):
+    # Dates as ISO strings, like the models' to_dict
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+def _batches(statement):
+    result = db.session.execute(statement, execution_options={'yield_per': EXPORT_BATCH_SIZE})
+    for partition in result.partitions():
+        yield [[_value(value) for value in row] for row in partition]
+
+def _encode_ndjson(columns, batches):
+    for batch in batches:
+        yield ''.join(json.dumps(dict(zip(columns, row))) + '\n' for row in batch)
+
+def _encode_json(columns, batches):
+    yield '['
+    first = True
+    for batch in batches:
+        chunk = ','.join(json.dumps(dict(zip(columns, row))) for row in batch)
+        if chunk:
+            yield chunk if first else ',' + chunk
+            first = False
+    yield ']'
+
+def _encode_csv(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+ENCODERS = {
+    'ndjson': _encode_ndjson,
+    'json': _encode_json,
+    'csv': _encode_csv
+}
+
+def stream_export(name, statement):
+    # Get token from Authorization header
+    auth_header = request.headers.get('Authorization')
+    payload, error, status_code = verify_token(auth_header)
+
+    if error:
+        return jsonify(error), status_code
+
+    # Check if user can export data
+    if not has_permission(payload, 'exports:read'):
+        return jsonify({'error': 'Unauthorized access'}), 403
+
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f'Unsupported format: {export_format} (available: {", ".join(EXPORT_FORMATS)})'}), 400
+
+    columns = [column.name for column in statement.selected_columns]
+    body = ENCODERS[export_format](columns, _batches(statement))
+
+    response = Response(stream_with_context(body), mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename={name}.{export_format}'
+    return response
+
+@export_bp.route('/exports/user-skills', methods=['GET'])
+def export_user_skills():
+    # Full user-skill matrix, one row per user skill
+    return stream_export('user-skills', (
+        select(
+            UserSkill.user_id,
+            User.username,
+            UserSkill.skill_id,
+            Skill.name.label('skill_name'),
+            Skill.category,
+            UserSkill.proficiency_level,
+            UserSkill.years_experience,
+            UserSkill.is_certified,
+            UserSkill.certification_name,
+            UserSkill.certification_date,
+            UserSkill.last_used
+        )
+        .join(User, User.id == UserSkill.user_id)
+        .join(Skill, Skill.id == UserSkill.skill_id)
+        .order_by(UserSkill.id)
+    ))
+
+@export_bp.route('/exports/project-rosters', methods=['GET'])
+def export_project_rosters():
+    # Every project membership with project and member details
+    return stream_export('project-rosters', (
+        select(
+            ProjectMember.project_id,
+            Project.name.label('project_name'),
+            Project.status.label('project_status'),
+            ProjectMember.user_id,
+            User.username,
+            User.first_name,
+            User.last_name,
+            ProjectMember.role,
+            ProjectMember.allocation_percentage,
+            ProjectMember.joined_date
+        )
+        .join(Project, Project.id == ProjectMember.project_id)
+        .join(User, User.id == ProjectMember.user_id)
+        .order_by(ProjectMember.id)
+    ))
@@ -0,0 +1,58 @@
+from flask import Blueprint, request, jsonify
+from src.services.bulk_import import IMPORTS, run_import
+from src.utils.auth import verify_token, has_permission
+import csv
+import io
+
+imports_bp = Blueprint('imports', __name__)
+
+# Permission required per import kind
+IMPORT_PERMISSIONS = {
+    'user-skills': 'users:any',
+    'project-members': 'projects:write',
+    'project-skills': 'projects:write'
+}
+
+def request_rows():
+    # A JSON array, a text/csv body or a multipart CSV upload ('file');
+    # CSV is parsed lazily so large uploads are never held in memory as rows
+    if 'file' in request.files:
+        return csv.DictReader(io.TextIOWrapper(request.files['file'].stream, encoding='utf-8-sig'))
+    if request.mimetype == 'text/csv':
+        return csv.DictReader(io.TextIOWrapper(request.stream, encoding='utf-8-sig'))
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        return None
+    return data
+
+@imports_bp.route('/imports/<kind>', methods=['POST'])
+def bulk_import(kind):
+    # Get token from Authorization header
+    auth_header = request.headers.get('Authorization')
+    payload, error, status_code = verify_token(auth_header)
+
+    if error:
+        return jsonify(error), status_code
+
+    if kind not in IMPORTS:
+        return jsonify({'error': f'Unknown import: {kind} (available: {", ".join(IMPORTS)})'}), 404
+
+    # Check if user can write this kind of data
+    if not has_permission(payload, IMPORT_PERMISSIONS[kind]):
+        return jsonify({'error': 'Unauthorized access'}), 403
+
+    rows = request_rows()
+    if rows is None:
+        return jsonify({'error': 'Expected a JSON array or a CSV upload'}), 400
+
+    report = run_import(kind, rows)
+
+    # Per-row errors are reported alongside the rows that were imported. An
+    # upload that became unreadable part way keeps the chunks already
+    # committed, so it is a partial success when anything was imported.
+    if report.aborted is not None:
+        status = 207 if report.imported else 400
+    else:
+        status = 201 if report.imported or not report.failed else 400
+    return jsonify(report.to_dict()), status
@@ -1,31 +1,35 @@
 from flask import Blueprint, request, jsonify
 from src.models.user import db, User
-from src.models.skill import Project, ProjectMember
-import jwt
-import os
+from src.models.skill import Project, ProjectMember, ProjectSkill, UserSkill
+from src.services import skill_gap  # registers project_skill_gap maintenance
+from src.services.assignment import load_assignment_problem, optimize_assignments, MAX_TIME_BUDGET, MAX_NEW_MEMBERS
+from src.utils.cache import response_cache
+from src.utils.auth import verify_token, has_permission
+from src.utils.rate_limit import rate_limited
+from src.utils.includes import parse_includes, loader_options, InvalidInclude
+from src.utils.pagination import page_request, paginate, InvalidPage
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
 project_bp = Blueprint('project', __name__)
 
-# Secret key for JWT
-SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key')
+def is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
 
-# Helper function to verify JWT token
-def verify_token(auth_header):
-    if not auth_header or not auth_header.startswith('Bearer '):
-        return None, {'error': 'Authorization token is missing'}, 401
-    
-    token = auth_header.split(' ')[1]
-    
-    try:
-        # Decode and verify token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        return payload, None, None
-    
-    except jwt.ExpiredSignatureError:
-        return None, {'error': 'Token has expired'}, 401
-    except jwt.InvalidTokenError:
-        return None, {'error': 'Invalid token'}, 401
+def is_int_list(value):
+    return isinstance(value, list) and all(is_int(item) for item in value)
+
+# Relations the list endpoints can expand with ?include=
+USER_PROJECT_INCLUDES = {
+    'skills': joinedload(ProjectMember.project).selectinload(Project.skills).joinedload(ProjectSkill.skill),
+    'company': joinedload(ProjectMember.project).joinedload(Project.company)
+}
+PROJECT_MEMBER_INCLUDES = {
+    'skills': joinedload(ProjectMember.user).selectinload(User.skills).joinedload(UserSkill.skill)
+}
 
 # User projects endpoints
 @project_bp.route('/users/<int:user_id>/projects', methods=['GET'])
@@ -37,22 +41,34 @@ def get_user_projects(user_id):
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin or the user themselves
-    if payload['role'] != 'admin' and payload['user_id'] != user_id:
+    # Check if user can access other users' data or is the user themselves
+    if not has_permission(payload, 'users:any') and payload['user_id'] != user_id:
         return jsonify({'error': 'Unauthorized access'}), 403
     
-    # Get user's project memberships
-    memberships = ProjectMember.query.filter_by(user_id=user_id).all()
+    try:
+        includes = parse_includes(USER_PROJECT_INCLUDES)
+    except InvalidInclude as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Get user's project memberships together with their projects
+    memberships = ProjectMember.query.filter_by(user_id=user_id).options(
+        joinedload(ProjectMember.project),
+        *loader_options(USER_PROJECT_INCLUDES, includes)
+    ).all()
     
     # Get projects from memberships
     projects = []
     for membership in memberships:
-        project = Project.query.get(membership.project_id)
+        project = membership.project
         if project:
             project_dict = project.to_dict()
             project_dict['role'] = membership.role
             project_dict['allocation'] = membership.allocation_percentage
             project_dict['joined_date'] = membership.joined_date.isoformat() if membership.joined_date else None
+            if 'skills' in includes:
+                project_dict['skills'] = [project_skill.to_dict() for project_skill in project.skills]
+            if 'company' in includes:
+                project_dict['company'] = project.company.to_dict() if project.company else None
             projects.append(project_dict)
     
     return jsonify({
@@ -73,29 +89,53 @@ def get_project_members(project_id):
     if not project:
         return jsonify({'error': 'Project not found'}), 404
     
-    # Get project memberships
-    memberships = ProjectMember.query.filter_by(project_id=project_id).all()
+    try:
+        includes = parse_includes(PROJECT_MEMBER_INCLUDES)
+        page = page_request({'id': ProjectMember.id})
+    except (InvalidInclude, InvalidPage) as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Get members with details
-    members = []
-    for membership in memberships:
-        user = User.query.get(membership.user_id)
-        if user:
-            member = {
-                'id': membership.id,
-                'user_id': user.id,
-                'username': user.username,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'role': membership.role,
-                'allocation_percentage': membership.allocation_percentage,
-                'joined_date': membership.joined_date.isoformat() if membership.joined_date else None
-            }
-            members.append(member)
+    def compute():
+        # Get a page of project memberships together with their users
+        memberships, next_cursor = paginate(
+            ProjectMember.query.filter_by(project_id=project_id).options(
+                joinedload(ProjectMember.user),
+                *loader_options(PROJECT_MEMBER_INCLUDES, includes)
+            ),
+            ProjectMember.id,
+            page
+        )
+        
+        # Get members with details
+        members = []
+        for membership in memberships:
+            user = membership.user
+            if user:
+                member = {
+                    'id': membership.id,
+                    'user_id': user.id,
+                    'username': user.username,
+                    'first_name': user.first_name,
+                    'last_name': user.last_name,
+                    'role': membership.role,
+                    'allocation_percentage': membership.allocation_percentage,
+                    'joined_date': membership.joined_date.isoformat() if membership.joined_date else None
+                }
+                if 'skills' in includes:
+                    member['skills'] = [user_skill.to_dict() for user_skill in user.skills]
+                members.append(member)
+        
+        return {'members': members, 'next_cursor': next_cursor}
     
-    return jsonify({
-        'members': members
-    }), 200
+    # Serve from the response cache while memberships and users are unchanged
+    tables = ('project_members', 'users')
+    if 'skills' in includes:
+        tables += ('user_skills', 'skills')
+    return response_cache.fetch(
+        ('members', project_id, tuple(sorted(includes)), page.cache_key()),
+        tables,
+        compute
+    )
 
 @project_bp.route('/projects/<int:project_id>/members', methods=['POST'])
 def add_project_member(project_id):
@@ -106,8 +146,8 @@ def add_project_member(project_id):
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin or manager
-    if payload['role'] not in ['admin', 'manager']:
+    # Check if user can manage projects
+    if not has_permission(payload, 'projects:write'):
         return jsonify({'error': 'Unauthorized access'}), 403
     
     data = request.get_json()
@@ -126,15 +166,6 @@ def add_project_member(project_id):
     if not user:
         return jsonify({'error': 'User not found'}), 404
     
-    # Check if user is already a member
-    existing_membership = ProjectMember.query.filter_by(
-        project_id=project_id,
-        user_id=data['user_id']
-    ).first()
-    
-    if existing_membership:
-        return jsonify({'error': 'User is already a member of this project'}), 409
-    
     # Create new project membership
     new_membership = ProjectMember(
         project_id=project_id,
@@ -144,9 +175,13 @@ def add_project_member(project_id):
         joined_date=datetime.strptime(data['joined_date'], '%Y-%m-%d').date() if data.get('joined_date') else datetime.now().date()
     )
     
-    # Save to database
+    # Save to database; the unique (project_id, user_id) index rejects duplicates
     db.session.add(new_membership)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'User is already a member of this project'}), 409
     
     return jsonify({
         'message': 'Project member added successfully',
@@ -162,8 +197,8 @@ def remove_project_member(project_id, membership_id):
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin or manager
-    if payload['role'] not in ['admin', 'manager']:
+    # Check if user can manage projects
+    if not has_permission(payload, 'projects:write'):
         return jsonify({'error': 'Unauthorized access'}), 403
     
     # Check if project exists
@@ -183,3 +218,65 @@ def remove_project_member(project_id, membership_id):
     return jsonify({
         'message': 'Project member removed successfully'
     }), 200
+
+@project_bp.route('/projects/assignments/optimize', methods=['POST'])
+@rate_limited('planning', heavy=True)
+def optimize_project_assignments():
+    # Get token from Authorization header
+    auth_header = request.headers.get('Authorization')
+    payload, error, status_code = verify_token(auth_header)
+    
+    if error:
+        return jsonify(error), status_code
+    
+    # Check if user can plan staffing
+    if not has_permission(payload, 'projects:plan'):
+        return jsonify({'error': 'Unauthorized access'}), 403
+    
+    data = request.get_json() or {}
+    
+    # Validate required fields
+    project_ids = data.get('project_ids')
+    if not project_ids or not is_int_list(project_ids):
+        return jsonify({'error': 'project_ids must be a non-empty list of integers'}), 400
+    
+    # Everything handed to the solver process is checked here
+    candidate_user_ids = data.get('candidate_user_ids')
+    if candidate_user_ids is not None and not is_int_list(candidate_user_ids):
+        return jsonify({'error': 'candidate_user_ids must be a list of integers'}), 400
+    
+    allocation_percentage = data.get('allocation_percentage', 50)
+    if not is_int(allocation_percentage) or not 1 <= allocation_percentage <= 100:
+        return jsonify({'error': 'allocation_percentage must be between 1 and 100'}), 400
+    
+    max_new_members = data.get('max_new_members', 3)
+    if not is_int(max_new_members) or not 0 <= max_new_members <= MAX_NEW_MEMBERS:
+        return jsonify({'error': f'max_new_members must be an integer between 0 and {MAX_NEW_MEMBERS}'}), 400
+    
+    time_budget = data.get('time_budget', 2.0)
+    if not isinstance(time_budget, (int, float)) or isinstance(time_budget, bool) or not 0 < time_budget <= MAX_TIME_BUDGET:
+        return jsonify({'error': f'time_budget must be a number of seconds up to {MAX_TIME_BUDGET:g}'}), 400
+    
+    seed = data.get('seed', 0)
+    if not is_int(seed):
+        return jsonify({'error': 'seed must be an integer'}), 400
+    
+    # Check if projects exist
+    found = {project.id for project in Project.query.filter(Project.id.in_(project_ids)).all()}
+    missing = [project_id for project_id in project_ids if project_id not in found]
+    if missing:
+        return jsonify({'error': f'Projects not found: {missing}'}), 404
+    
+    problem = load_assignment_problem(
+        list(dict.fromkeys(project_ids)),
+        candidate_user_ids=candidate_user_ids,
+        allocation_percentage=allocation_percentage,
+        max_new_members=max_new_members
+    )
+    
+    try:
+        result = optimize_assignments(problem, float(time_budget), seed)
+    except (FutureTimeoutError, BrokenProcessPool):
+        return jsonify({'error': 'Optimizer did not respond in time'}), 503
+    
+    return jsonify(result), 200
@@ -1,33 +1,35 @@
 from flask import Blueprint, request, jsonify
 from src.models.skill import db, Skill, UserSkill, Project, ProjectMember, ProjectSkill
-import jwt
-import os
+from src.models.user import Company
+from src.services.skill_gap import read_skill_gap, compute_company_skill_gap, rebuild_skill_gap, check_skill_gap
+from src.services.staffing import recommend_staffing
+from src.services.simulation import simulate_skill_gap
+from src.utils.cache import response_cache, project_gap_version, SKILL_GAP_STALE_WHILE_REVALIDATE
+from src.utils.auth import verify_token, has_permission
+from src.utils.rate_limit import rate_limited
+from src.utils.conditional import conditional_get
+from src.utils.includes import parse_includes, loader_options, InvalidInclude
+from src.utils.pagination import page_request, paginate, InvalidPage
+from src.utils.serializers import skill_serializer, project_serializer, InvalidFields
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+import click
 from datetime import datetime
 
 skill_bp = Blueprint('skill', __name__)
 
-# Secret key for JWT
-SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key')
-
-# Helper function to verify JWT token
-def verify_token(auth_header):
-    if not auth_header or not auth_header.startswith('Bearer '):
-        return None, {'error': 'Authorization token is missing'}, 401
-    
-    token = auth_header.split(' ')[1]
-    
-    try:
-        # Decode and verify token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        return payload, None, None
-    
-    except jwt.ExpiredSignatureError:
-        return None, {'error': 'Token has expired'}, 401
-    except jwt.InvalidTokenError:
-        return None, {'error': 'Invalid token'}, 401
+# Relations the list endpoints can expand with ?include=
+USER_SKILL_INCLUDES = {
+    'skill': joinedload(UserSkill.skill)
+}
+PROJECT_SKILL_INCLUDES = {
+    'skill': joinedload(ProjectSkill.skill),
+    'project': joinedload(ProjectSkill.project)
+}
 
 # Skill management endpoints
 @skill_bp.route('/skills', methods=['GET'])
+@conditional_get('catalog', ('skills',))
 def get_skills():
     # Get token from Authorization header
     auth_header = request.headers.get('Authorization')
@@ -36,21 +38,30 @@ def get_skills():
     if error:
         return jsonify(error), status_code
     
-    # Get query parameters for filtering
+    # Get query parameters for filtering and paging
     category = request.args.get('category')
+    try:
+        page = page_request({'id': Skill.id, 'name': Skill.name})
+        fields = skill_serializer.parse_fields()
+    except (InvalidPage, InvalidFields) as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Build query
-    query = Skill.query
+    # Build query over the selected columns only
+    query = skill_serializer.query(fields, keys=('id', page.column.key))
     
     if category:
-        query = query.filter_by(category=category)
+        query = query.filter(Skill.category == category)
     
-    # Execute query
-    skills = query.all()
+    def compute():
+        skills, next_cursor = paginate(query, Skill.id, page)
+        return {'skills': skill_serializer.serialize(skills, fields), 'next_cursor': next_cursor}
     
-    return jsonify({
-        'skills': [skill.to_dict() for skill in skills]
-    }), 200
+    # Execute query unless the cached response is still current
+    return response_cache.fetch(
+        ('skills', category, page.cache_key(), fields),
+        ('skills',),
+        compute
+    )
 
 @skill_bp.route('/skills', methods=['POST'])
 def create_skill():
@@ -61,8 +72,8 @@ def create_skill():
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin
-    if payload['role'] != 'admin':
+    # Check if user can manage skills
+    if not has_permission(payload, 'skills:write'):
         return jsonify({'error': 'Unauthorized access'}), 403
     
     data = request.get_json()
@@ -92,6 +103,7 @@ def create_skill():
     }), 201
 
 @skill_bp.route('/skills/<int:skill_id>', methods=['GET'])
+@conditional_get('catalog', ('skills',))
 def get_skill(skill_id):
     # Get token from Authorization header
     auth_header = request.headers.get('Authorization')
@@ -118,8 +130,8 @@ def update_skill(skill_id):
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin
-    if payload['role'] != 'admin':
+    # Check if user can manage skills
+    if not has_permission(payload, 'skills:write'):
         return jsonify({'error': 'Unauthorized access'}), 403
     
     # Get skill from database
@@ -153,8 +165,8 @@ def delete_skill(skill_id):
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin
-    if payload['role'] != 'admin':
+    # Check if user can manage skills
+    if not has_permission(payload, 'skills:write'):
         return jsonify({'error': 'Unauthorized access'}), 403
     
     # Get skill from database
@@ -180,15 +192,35 @@ def get_user_skills(user_id):
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin or the user themselves
-    if payload['role'] != 'admin' and payload['user_id'] != user_id:
+    # Check if user can access other users' data or is the user themselves
+    if not has_permission(payload, 'users:any') and payload['user_id'] != user_id:
         return jsonify({'error': 'Unauthorized access'}), 403
     
-    # Get user skills
-    user_skills = UserSkill.query.filter_by(user_id=user_id).all()
+    try:
+        includes = parse_includes(USER_SKILL_INCLUDES)
+        page = page_request({'id': UserSkill.id})
+    except (InvalidInclude, InvalidPage) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Get user skills; the skill is always loaded for skill_name
+    user_skills, next_cursor = paginate(
+        UserSkill.query.filter_by(user_id=user_id).options(
+            *loader_options(USER_SKILL_INCLUDES, includes | {'skill'})
+        ),
+        UserSkill.id,
+        page
+    )
+    
+    results = []
+    for user_skill in user_skills:
+        result = user_skill.to_dict()
+        if 'skill' in includes:
+            result['skill'] = user_skill.skill.to_dict() if user_skill.skill else None
+        results.append(result)
     
     return jsonify({
-        'user_skills': [user_skill.to_dict() for user_skill in user_skills]
+        'user_skills': results,
+        'next_cursor': next_cursor
     }), 200
 
 @skill_bp.route('/users/<int:user_id>/skills', methods=['POST'])
@@ -200,8 +232,8 @@ def add_user_skill(user_id):
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin or the user themselves
-    if payload['role'] != 'admin' and payload['user_id'] != user_id:
+    # Check if user can access other users' data or is the user themselves
+    if not has_permission(payload, 'users:any') and payload['user_id'] != user_id:
         return jsonify({'error': 'Unauthorized access'}), 403
     
     data = request.get_json()
@@ -215,15 +247,6 @@ def add_user_skill(user_id):
     if not skill:
         return jsonify({'error': 'Skill not found'}), 404
     
-    # Check if user already has this skill
-    existing_skill = UserSkill.query.filter_by(
-        user_id=user_id,
-        skill_id=data['skill_id']
-    ).first()
-    
-    if existing_skill:
-        return jsonify({'error': 'User already has this skill'}), 409
-    
     # Create new user skill
     new_user_skill = UserSkill(
         user_id=user_id,
@@ -236,9 +259,13 @@ def add_user_skill(user_id):
         last_used=datetime.strptime(data['last_used'], '%Y-%m-%d').date() if data.get('last_used') else None
     )
     
-    # Save to database
+    # Save to database; the unique (user_id, skill_id) index rejects duplicates
     db.session.add(new_user_skill)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'User already has this skill'}), 409
     
     return jsonify({
         'message': 'User skill added successfully',
@@ -247,6 +274,7 @@ def add_user_skill(user_id):
 
 # Project management endpoints
 @skill_bp.route('/projects', methods=['GET'])
+@conditional_get('list', ('projects', 'project_members'))
 def get_projects():
     # Get token from Authorization header
     auth_header = request.headers.get('Authorization')
@@ -255,25 +283,34 @@ def get_projects():
     if error:
         return jsonify(error), status_code
     
-    # Get query parameters for filtering
+    # Get query parameters for filtering and paging
     company_id = request.args.get('company_id', type=int)
     status = request.args.get('status')
+    try:
+        page = page_request({'id': Project.id, 'name': Project.name})
+        fields = project_serializer.parse_fields()
+    except (InvalidPage, InvalidFields) as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Build query
-    query = Project.query
+    # Build query over the selected columns only
+    query = project_serializer.query(fields, keys=('id', page.column.key))
     
     if company_id:
-        query = query.filter_by(company_id=company_id)
+        query = query.filter(Project.company_id == company_id)
     
     if status:
-        query = query.filter_by(status=status)
+        query = query.filter(Project.status == status)
     
-    # Execute query
-    projects = query.all()
+    def compute():
+        projects, next_cursor = paginate(query, Project.id, page)
+        return {'projects': project_serializer.serialize(projects, fields), 'next_cursor': next_cursor}
     
-    return jsonify({
-        'projects': [project.to_dict() for project in projects]
-    }), 200
+    # Execute query unless the cached response is still current
+    return response_cache.fetch(
+        ('projects', company_id, status, page.cache_key(), fields),
+        ('projects', 'project_members'),
+        compute
+    )
 
 @skill_bp.route('/projects', methods=['POST'])
 def create_project():
@@ -284,8 +321,8 @@ def create_project():
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin or manager
-    if payload['role'] not in ['admin', 'manager']:
+    # Check if user can manage projects
+    if not has_permission(payload, 'projects:write'):
         return jsonify({'error': 'Unauthorized access'}), 403
     
     data = request.get_json()
@@ -324,11 +361,27 @@ def get_project_skills(project_id):
     if error:
         return jsonify(error), status_code
     
-    # Get project skills
-    project_skills = ProjectSkill.query.filter_by(project_id=project_id).all()
+    try:
+        includes = parse_includes(PROJECT_SKILL_INCLUDES)
+    except InvalidInclude as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Get project skills; the skill is always loaded for skill_name
+    project_skills = ProjectSkill.query.filter_by(project_id=project_id).options(
+        *loader_options(PROJECT_SKILL_INCLUDES, includes | {'skill'})
+    ).all()
+    
+    results = []
+    for project_skill in project_skills:
+        result = project_skill.to_dict()
+        if 'skill' in includes:
+            result['skill'] = project_skill.skill.to_dict() if project_skill.skill else None
+        if 'project' in includes:
+            result['project'] = project_skill.project.to_dict() if project_skill.project else None
+        results.append(result)
     
     return jsonify({
-        'project_skills': [project_skill.to_dict() for project_skill in project_skills]
+        'project_skills': results
     }), 200
 
 @skill_bp.route('/projects/<int:project_id>/skills', methods=['POST'])
@@ -340,8 +393,8 @@ def add_project_skill(project_id):
     if error:
         return jsonify(error), status_code
     
-    # Check if user is admin or manager
-    if payload['role'] not in ['admin', 'manager']:
+    # Check if user can manage projects
+    if not has_permission(payload, 'projects:write'):
         return jsonify({'error': 'Unauthorized access'}), 403
     
     data = request.get_json()
@@ -360,15 +413,6 @@ def add_project_skill(project_id):
     if not project:
         return jsonify({'error': 'Project not found'}), 404
     
-    # Check if project already has this skill
-    existing_skill = ProjectSkill.query.filter_by(
-        project_id=project_id,
-        skill_id=data['skill_id']
-    ).first()
-    
-    if existing_skill:
-        return jsonify({'error': 'Project already has this skill'}), 409
-    
     # Create new project skill
     new_project_skill = ProjectSkill(
         project_id=project_id,
@@ -376,9 +420,13 @@ def add_project_skill(project_id):
         importance_level=data.get('importance_level', 3)
     )
     
-    # Save to database
+    # Save to database; the unique (project_id, skill_id) index rejects duplicates
     db.session.add(new_project_skill)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Project already has this skill'}), 409
     
     return jsonify({
         'message': 'Project skill added successfully',
@@ -387,6 +435,7 @@ def add_project_skill(project_id):
 
 # Skill gap analysis endpoint
 @skill_bp.route('/projects/<int:project_id>/skill-gap', methods=['GET'])
+@rate_limited('analytics', heavy=True)
 def analyze_skill_gap(project_id):
     # Get token from Authorization header
     auth_header = request.headers.get('Authorization')
@@ -400,44 +449,150 @@ def analyze_skill_gap(project_id):
     if not project:
         return jsonify({'error': 'Project not found'}), 404
     
-    # Get project skills
-    project_skills = ProjectSkill.query.filter_by(project_id=project_id).all()
+    project_name = project.name
+    
+    # Read coverage and proficiency from the materialized gap table unless the
+    # cached response is still current
+    return response_cache.fetch(
+        ('skill_gap', project_id),
+        ('projects', 'skills', 'project_skill_gap', project_gap_version(project_id)),
+        lambda: {
+            'project_id': project_id,
+            'project_name': project_name,
+            'skill_gap': read_skill_gap(project_id)
+        },
+        stale_while_revalidate=SKILL_GAP_STALE_WHILE_REVALIDATE
+    )
+
+# What-if skill gap simulation endpoint
+@skill_bp.route('/projects/skill-gap/simulate', methods=['POST'])
+@rate_limited('planning', heavy=True)
+def simulate_project_skill_gap():
+    # Get token from Authorization header
+    auth_header = request.headers.get('Authorization')
+    payload, error, status_code = verify_token(auth_header)
     
-    # Get project members
-    project_members = ProjectMember.query.filter_by(project_id=project_id).all()
+    if error:
+        return jsonify(error), status_code
     
-    # Get user skills for all project members
-    user_skills = []
-    for member in project_members:
-        member_skills = UserSkill.query.filter_by(user_id=member.user_id).all()
-        user_skills.extend(member_skills)
+    # Check if user can plan staffing
+    if not has_permission(payload, 'projects:plan'):
+        return jsonify({'error': 'Unauthorized access'}), 403
     
-    # Analyze skill gap
-    skill_gap = []
-    for project_skill in project_skills:
-        # Find matching user skills
-        matching_skills = [us for us in user_skills if us.skill_id == project_skill.skill_id]
-        
-        # Calculate coverage
-        coverage = len(matching_skills)
-        
-        # Calculate average proficiency
-        avg_proficiency = sum(us.proficiency_level for us in matching_skills) / len(matching_skills) if matching_skills else 0
-        
-        skill_gap.append({
-            'skill_id': project_skill.skill_id,
-            'skill_name': project_skill.skill.name,
-            'importance_level': project_skill.importance_level,
-            'coverage': coverage,
-            'avg_proficiency': avg_proficiency,
-            'gap_score': project_skill.importance_level - (avg_proficiency * coverage / len(project_members) if project_members else 0)
-        })
-    
-    # Sort by gap score (highest first)
-    skill_gap.sort(key=lambda x: x['gap_score'], reverse=True)
+    data = request.get_json() or {}
+    
+    # Validate required fields
+    project_ids = data.get('project_ids')
+    if not project_ids or not isinstance(project_ids, list) or not all(
+            isinstance(project_id, int) and not isinstance(project_id, bool) for project_id in project_ids):
+        return jsonify({'error': 'project_ids must be a non-empty list of integers'}), 400
+    
+    changes = data.get('changes', [])
+    if not isinstance(changes, list):
+        return jsonify({'error': 'changes must be a list'}), 400
+    
+    try:
+        projects = simulate_skill_gap(project_ids, changes)
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': f'Invalid change: {e}'}), 400
+    
+    return jsonify({
+        'projects': projects
+    }), 200
+
+# Staffing recommendation endpoint
+@skill_bp.route('/projects/<int:project_id>/staffing-recommendations', methods=['GET'])
+@rate_limited('analytics', heavy=True)
+def get_staffing_recommendations(project_id):
+    # Get token from Authorization header
+    auth_header = request.headers.get('Authorization')
+    payload, error, status_code = verify_token(auth_header)
+    
+    if error:
+        return jsonify(error), status_code
+    
+    # Check if user can plan staffing
+    if not has_permission(payload, 'projects:plan'):
+        return jsonify({'error': 'Unauthorized access'}), 403
+    
+    # Check if project exists
+    project = Project.query.get(project_id)
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+    
+    # Get query parameters
+    k = min(max(request.args.get('k', 5, type=int), 1), 50)
+    gaps = min(max(request.args.get('gaps', 3, type=int), 1), 20)
+    min_capacity = min(max(request.args.get('min_capacity', 1, type=int), 1), 100)
+    
+    recommendations = recommend_staffing(project_id, k=k, gaps=gaps, min_capacity=min_capacity)
     
     return jsonify({
         'project_id': project_id,
         'project_name': project.name,
-        'skill_gap': skill_gap
+        'recommendations': recommendations
+    }), 200
+
+# Portfolio skill gap analysis endpoint
+@skill_bp.route('/companies/<int:company_id>/skill-gap', methods=['GET'])
+@rate_limited('analytics', heavy=True)
+def analyze_company_skill_gap(company_id):
+    # Get token from Authorization header
+    auth_header = request.headers.get('Authorization')
+    payload, error, status_code = verify_token(auth_header)
+    
+    if error:
+        return jsonify(error), status_code
+    
+    # Check if company exists
+    company = Company.query.get(company_id)
+    if not company:
+        return jsonify({'error': 'Company not found'}), 404
+    
+    # Compute the gap of every project of the company in one pass
+    projects = compute_company_skill_gap(company_id)
+    
+    return jsonify({
+        'company_id': company_id,
+        'company_name': company.name,
+        'projects': projects
+    }), 200
+
+# Skill gap maintenance commands (flask skill rebuild-skill-gap)
+@skill_bp.cli.command('rebuild-skill-gap')
+@click.option('--workers', default=4, show_default=True, help='Parallel aggregation workers')
+@click.option('--chunk-size', default=500, show_default=True, help='Projects per worker task')
+@click.option('--check', is_flag=True, help='Only report drift between the table and a fresh computation')
+def rebuild_skill_gap_command(workers, chunk_size, check):
+    if check:
+        mismatches = check_skill_gap(workers, chunk_size)
+        for mismatch in mismatches:
+            click.echo(f"project {mismatch['project_id']} skill {mismatch['skill_id']}: "
+                       f"stored={mismatch['stored']} expected={mismatch['expected']}")
+        click.echo(f'{len(mismatches)} inconsistent rows')
+        if mismatches:
+            raise SystemExit(1)
+        return
+    
+    count = rebuild_skill_gap(workers, chunk_size)
+    click.echo(f'Rebuilt project_skill_gap with {count} rows')
+
+# Response cache statistics endpoint
+@skill_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    # Get token from Authorization header
+    auth_header = request.headers.get('Authorization')
+    payload, error, status_code = verify_token(auth_header)
+    
+    if error:
+        return jsonify(error), status_code
+    
+    # Check if user can read system statistics
+    if not has_permission(payload, 'system:read'):
+        return jsonify({'error': 'Unauthorized access'}), 403
+    
+    return jsonify({
+        'cache': response_cache.stats()
     }), 200
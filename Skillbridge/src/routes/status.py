@@ -0,0 +1,26 @@
+import logging
+from datetime import datetime
+from flask import Blueprint, jsonify
+
+logger = logging.getLogger(__name__)
+
+status_bp = Blueprint('status', __name__)
+
+# Root endpoint
+@status_bp.route('/')
+def index():
+    logger.info("Root endpoint accessed")
+    return jsonify({
+        'message': 'Welcome to SkillBridge API',
+        'status': 'online',
+        'version': '1.0.0'
+    })
+
+# Health check endpoint
+@status_bp.route('/api/health')
+def health_check():
+    logger.info("Health check endpoint accessed")
+    return jsonify({
+        'status': 'healthy',
+        'timestamp': datetime.now().isoformat()
+    })
@@ -1,12 +1,33 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import User, db
+from src.utils.auth import verify_token, has_permission
+from src.utils.cache import bump_table_versions
+from src.utils.passwords import hash_passwords_bulk, PasswordPoolUnavailable
+from src.utils.pagination import page_request, paginate, InvalidPage
+from src.utils.serializers import user_serializer, InvalidFields
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 
 user_bp = Blueprint('user', __name__)
 
 @user_bp.route('/users', methods=['GET'])
 def get_users():
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users])
+    try:
+        page = page_request({'id': User.id, 'username': User.username})
+        fields = user_serializer.parse_fields()
+    except (InvalidPage, InvalidFields) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # The body stays a bare list; the cursor for the next page is a header
+    users, next_cursor = paginate(
+        user_serializer.query(fields, keys=('id', page.column.key)),
+        User.id,
+        page
+    )
+    response = jsonify(user_serializer.serialize(users, fields))
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
 
 @user_bp.route('/users', methods=['POST'])
 def create_user():
@@ -37,3 +58,53 @@ def delete_user(user_id):
     db.session.delete(user)
     db.session.commit()
     return '', 204
+
+@user_bp.route('/users/import', methods=['POST'])
+def import_users():
+    payload, error, status_code = verify_token(request.headers.get('Authorization'))
+    if error:
+        return jsonify(error), status_code
+    if not has_permission(payload, 'users:any'):
+        return jsonify({'error': 'Unauthorized access'}), 403
+    
+    data = request.json
+    if not isinstance(data, list):
+        return jsonify({'error': 'Expected a list of users'}), 400
+    
+    # Validate rows before hashing anything
+    errors = []
+    for index, row in enumerate(data):
+        if not isinstance(row, dict) or not all(row.get(field) for field in ('username', 'email', 'password')):
+            errors.append({'index': index, 'error': 'username, email and password are required'})
+    if errors:
+        return jsonify({'errors': errors}), 400
+    
+    # Hash all passwords in parallel in the password pool
+    try:
+        password_hashes = hash_passwords_bulk(row['password'] for row in data)
+    except PasswordPoolUnavailable as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    
+    try:
+        db.session.execute(insert(User), [
+            {
+                'username': row['username'],
+                'email': row['email'],
+                'password_hash': password_hash,
+                'first_name': row.get('first_name'),
+                'last_name': row.get('last_name'),
+                'role': row.get('role', 'user'),
+                'company_id': row.get('company_id')
+            }
+            for row, password_hash in zip(data, password_hashes)
+        ])
+        # Core inserts bypass the flush listeners
+        bump_table_versions(db.session.connection(), ['users'])
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Username or email already exists'}), 409
+
+    return jsonify({'imported': len(data)}), 201
@@ -0,0 +1,261 @@
+import os
+import random
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Team assignment optimizer
+#
+# Proposes (user, project) assignments that minimize the summed gap_score of a
+# set of projects without allocating anyone past 100%. The problem is loaded
+# from the database in the web worker and handed to a process pool as plain
+# data; the solver is a greedy construction followed by randomized local search
+# that stops at the time budget and returns the best solution found so far.
+
+OPTIMIZER_WORKERS = int(os.environ.get('OPTIMIZER_WORKERS', '2'))
+MAX_TIME_BUDGET = float(os.environ.get('OPTIMIZER_MAX_TIME_BUDGET', '10'))
+MAX_NEW_MEMBERS = int(os.environ.get('OPTIMIZER_MAX_NEW_MEMBERS', '20'))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=OPTIMIZER_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _executor
+
+def discard_executor(broken):
+    # Drop a pool whose process died so the next call starts a fresh one
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+def load_assignment_problem(project_ids, candidate_user_ids=None, allocation_percentage=50, max_new_members=3):
+    # Database imports stay local so pool workers only import the solver
+    from sqlalchemy import func, or_, select
+    from src.models.user import db, User
+    from src.models.skill import Project, UserSkill, ProjectMember
+    from src.services.skill_gap import read_skill_gaps
+
+    # One select for the gaps and one for the members of every project
+    skill_gaps = read_skill_gaps(project_ids)
+    members = {project_id: [] for project_id in project_ids}
+    for project_id, user_id in db.session.execute(
+        select(ProjectMember.project_id, ProjectMember.user_id).where(ProjectMember.project_id.in_(list(members)))
+    ):
+        members[project_id].append(user_id)
+
+    projects = []
+    for project_id in project_ids:
+        projects.append({
+            'id': project_id,
+            'members': sorted(set(members[project_id])),
+            'member_count': len(members[project_id]),
+            # (skill_id, importance_level, current proficiency sum)
+            'skills': [
+                (gap['skill_id'], gap['importance_level'] or 0, gap['avg_proficiency'] * gap['coverage'])
+                for gap in skill_gaps[project_id]
+            ]
+        })
+
+    # Candidates are active employees of the projects' companies; an explicit
+    # list is narrowed to those too
+    company_ids = select(Project.company_id).where(Project.id.in_(project_ids)).scalar_subquery()
+    eligible = (
+        select(User.id)
+        .where(User.company_id.in_(company_ids))
+        .where(or_(User.is_active.is_(None), User.is_active.is_(True)))
+    )
+    if candidate_user_ids is None:
+        candidate_user_ids = db.session.execute(eligible).scalars().all()
+    else:
+        allowed = set(db.session.execute(eligible.where(User.id.in_(list(candidate_user_ids)))).scalars())
+        candidate_user_ids = [user_id for user_id in candidate_user_ids if user_id in allowed]
+
+    required_skills = {skill_id for project in projects for skill_id, _, _ in project['skills']}
+
+    profiles = {user_id: {} for user_id in candidate_user_ids}
+    if profiles and required_skills:
+        rows = db.session.execute(
+            select(UserSkill.user_id, UserSkill.skill_id, func.sum(UserSkill.proficiency_level))
+            .where(UserSkill.user_id.in_(list(profiles)))
+            .where(UserSkill.skill_id.in_(required_skills))
+            .group_by(UserSkill.user_id, UserSkill.skill_id)
+        ).all()
+        for user_id, skill_id, proficiency_sum in rows:
+            profiles[user_id][skill_id] = proficiency_sum or 0
+
+    allocated = dict(db.session.execute(
+        select(ProjectMember.user_id, func.coalesce(func.sum(ProjectMember.allocation_percentage), 0))
+        .where(ProjectMember.user_id.in_(list(profiles)))
+        .group_by(ProjectMember.user_id)
+    ).all()) if profiles else {}
+
+    return {
+        'projects': projects,
+        'candidates': [
+            {'id': user_id, 'free': 100 - allocated.get(user_id, 0), 'skills': skills}
+            for user_id, skills in profiles.items()
+            # Candidates without any required skill can only increase a gap
+            if skills
+        ],
+        'allocation_percentage': allocation_percentage,
+        'max_new_members': max_new_members
+    }
+
+def project_gap(project, member_count, proficiency_sums):
+    total = 0.0
+    for (skill_id, importance_level, _), proficiency_sum in zip(project['skills'], proficiency_sums):
+        total += importance_level - (proficiency_sum / member_count if member_count else 0)
+    return total
+
+class _Solution:
+    def __init__(self, problem):
+        self.problem = problem
+        self.projects = problem['projects']
+        self.allocation = problem['allocation_percentage']
+        self.candidates = {candidate['id']: candidate for candidate in problem['candidates']}
+        self.assigned = [set() for _ in self.projects]
+        self.used = {user_id: 0 for user_id in self.candidates}
+        self.counts = [project['member_count'] for project in self.projects]
+        self.sums = [[base for _, _, base in project['skills']] for project in self.projects]
+        self.gaps = [project_gap(p, n, s) for p, n, s in zip(self.projects, self.counts, self.sums)]
+
+    @property
+    def total(self):
+        return sum(self.gaps)
+
+    def can_add(self, p, user_id):
+        project = self.projects[p]
+        return (
+            user_id not in self.assigned[p]
+            and user_id not in project['members']
+            and len(self.assigned[p]) < self.problem['max_new_members']
+            and self.used[user_id] + self.allocation <= self.candidates[user_id]['free']
+        )
+
+    def _shifted(self, p, user_id, sign):
+        skills = self.candidates[user_id]['skills']
+        sums = [
+            total + sign * skills.get(skill_id, 0)
+            for (skill_id, _, _), total in zip(self.projects[p]['skills'], self.sums[p])
+        ]
+        return self.counts[p] + sign, sums
+
+    def delta(self, p, user_id, sign):
+        count, sums = self._shifted(p, user_id, sign)
+        return project_gap(self.projects[p], count, sums) - self.gaps[p]
+
+    def apply(self, p, user_id, sign):
+        self.counts[p], self.sums[p] = self._shifted(p, user_id, sign)
+        self.gaps[p] = project_gap(self.projects[p], self.counts[p], self.sums[p])
+        if sign > 0:
+            self.assigned[p].add(user_id)
+            self.used[user_id] += self.allocation
+        else:
+            self.assigned[p].discard(user_id)
+            self.used[user_id] -= self.allocation
+
+    def snapshot(self):
+        return [sorted(users) for users in self.assigned]
+
+def solve_assignment(problem, time_budget, seed=0):
+    started = time.monotonic()
+    deadline = started + time_budget
+    rng = random.Random(seed)
+
+    solution = _Solution(problem)
+    initial_total = solution.total
+    best_total, best = initial_total, solution.snapshot()
+    iterations = 0
+    complete = False
+
+    # Greedy construction: apply the best improving move until none is left
+    while time.monotonic() < deadline:
+        best_move = None
+        for p in range(len(solution.projects)):
+            for user_id in solution.candidates:
+                if solution.can_add(p, user_id):
+                    change = solution.delta(p, user_id, 1)
+                    if change < -1e-9 and (best_move is None or change < best_move[0]):
+                        best_move = (change, p, user_id)
+        iterations += 1
+        if best_move is None:
+            complete = True
+            break
+        solution.apply(best_move[1], best_move[2], 1)
+
+    if solution.total < best_total:
+        best_total, best = solution.total, solution.snapshot()
+
+    # Local search: random add / remove / replace moves, keeping improvements
+    user_ids = list(solution.candidates)
+    while user_ids and complete and time.monotonic() < deadline:
+        iterations += 1
+        p = rng.randrange(len(solution.projects))
+        move = rng.random()
+        if move < 0.4:
+            user_id = rng.choice(user_ids)
+            if solution.can_add(p, user_id) and solution.delta(p, user_id, 1) < -1e-9:
+                solution.apply(p, user_id, 1)
+        elif move < 0.6:
+            if solution.assigned[p]:
+                user_id = rng.choice(sorted(solution.assigned[p]))
+                if solution.delta(p, user_id, -1) < -1e-9:
+                    solution.apply(p, user_id, -1)
+        elif solution.assigned[p]:
+            old_user = rng.choice(sorted(solution.assigned[p]))
+            new_user = rng.choice(user_ids)
+            before = solution.total
+            solution.apply(p, old_user, -1)
+            if solution.can_add(p, new_user):
+                solution.apply(p, new_user, 1)
+                if solution.total >= before - 1e-9:
+                    solution.apply(p, new_user, -1)
+                    solution.apply(p, old_user, 1)
+            else:
+                solution.apply(p, old_user, 1)
+
+        if solution.total < best_total - 1e-9:
+            best_total, best = solution.total, solution.snapshot()
+
+    return {
+        'assignments': [
+            {
+                'project_id': project['id'],
+                'user_id': user_id,
+                'allocation_percentage': problem['allocation_percentage']
+            }
+            for project, users in zip(problem['projects'], best)
+            for user_id in users
+        ],
+        'total_gap_before': initial_total,
+        'total_gap_after': best_total,
+        'iterations': iterations,
+        'elapsed': time.monotonic() - started,
+        'complete': complete
+    }
+
+def optimize_assignments(problem, time_budget, seed=0):
+    # Run the solver in the process pool so web workers are not blocked on CPU
+    time_budget = min(max(time_budget, 0.05), MAX_TIME_BUDGET)
+    for attempt in range(2):
+        executor = get_executor()
+        try:
+            future = executor.submit(solve_assignment, problem, time_budget, seed)
+            # Allow for process start-up on top of the solver's own budget
+            return future.result(timeout=time_budget + 30)
+        except BrokenProcessPool:
+            discard_executor(executor)
+            if attempt:
+                raise
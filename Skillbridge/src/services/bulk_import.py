@@ -0,0 +1,359 @@
+import os
+import csv
+from datetime import datetime
+from sqlalchemy import insert, select
+from src.models.user import db, User
+from src.models.skill import Skill, UserSkill, Project, ProjectMember, ProjectSkill
+from src.services.skill_gap import refresh_gap_rows
+from src.services.simulation import discard_snapshots
+from src.services.staffing import skill_index
+from src.utils.cache import bump_table_versions
+
+# Bulk imports for user skills, project members and project skills
+#
+# Rows are processed in chunks of CHUNK_SIZE. Each chunk is validated in
+# Python, checked against the database with one query per referenced table
+# plus one for already existing rows, and inserted with a single DBAPI
+# executemany of pre-compiled INSERT OR IGNORE in its own transaction. Raw
+# inserts bypass the flush listeners, so every chunk bumps table versions and
+# refreshes project_skill_gap explicitly. Chunks commit as they go: a CSV that
+# turns unreadable part way through still imports the rows before the bad
+# line, and the report says where reading stopped.
+
+CHUNK_SIZE = int(os.environ.get('BULK_IMPORT_CHUNK_SIZE', '5000'))
+MAX_REPORTED_ERRORS = 1000
+
+class RowError(ValueError):
+    pass
+
+def _empty(value):
+    return value is None or value == ''
+
+def integer(low=None, high=None):
+    def parse(value):
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise RowError('must be an integer')
+        if (low is not None and number < low) or (high is not None and number > high):
+            raise RowError(f'must be between {low} and {high}')
+        return number
+    return parse
+
+def number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise RowError('must be a number')
+
+def boolean(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ('1', 'true', 'yes', 'y'):
+        return True
+    if text in ('0', 'false', 'no', 'n'):
+        return False
+    raise RowError('must be true or false')
+
+def date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise RowError('must be a date (YYYY-MM-DD)')
+
+def text(max_length):
+    def parse(value):
+        value = str(value)
+        if len(value) > max_length:
+            raise RowError(f'must be at most {max_length} characters')
+        return value
+    return parse
+
+class ImportSpec:
+    def __init__(self, model, key, references, fields, defaults):
+        self.model = model
+        # Columns that identify a row; existing keys are reported as duplicates
+        self.key = key
+        # Column -> referenced model; ids must exist
+        self.references = references
+        # Column -> (parser, required)
+        self.fields = fields
+        self.required = [column for column, (_, required) in fields.items() if required]
+        # Column -> value (or callable) for missing optional fields
+        self.defaults = defaults
+
+    def row_defaults(self):
+        # Defaults for one chunk: the spec's own, then the model's column
+        # defaults (created_at, ...) evaluated once
+        values = {column: None for column in self.fields}
+        for column, default in self.defaults.items():
+            values[column] = default() if callable(default) else default
+        for column in self.model.__table__.columns:
+            if column.name in values or column.primary_key or column.default is None:
+                continue
+            default = column.default.arg
+            values[column.name] = default(None) if column.default.is_callable else default
+        return values
+
+IMPORTS = {
+    'user-skills': ImportSpec(
+        UserSkill,
+        ('user_id', 'skill_id'),
+        {'user_id': User, 'skill_id': Skill},
+        {
+            'user_id': (integer(), True),
+            'skill_id': (integer(), True),
+            'proficiency_level': (integer(1, 5), False),
+            'years_experience': (number, False),
+            'is_certified': (boolean, False),
+            'certification_name': (text(100), False),
+            'certification_date': (date, False),
+            'last_used': (date, False)
+        },
+        {'proficiency_level': 1, 'is_certified': False}
+    ),
+    'project-members': ImportSpec(
+        ProjectMember,
+        ('project_id', 'user_id'),
+        {'project_id': Project, 'user_id': User},
+        {
+            'project_id': (integer(), True),
+            'user_id': (integer(), True),
+            'role': (text(50), False),
+            'allocation_percentage': (integer(0, 100), False),
+            'joined_date': (date, False)
+        },
+        {'allocation_percentage': 100, 'joined_date': lambda: datetime.now().date()}
+    ),
+    'project-skills': ImportSpec(
+        ProjectSkill,
+        ('project_id', 'skill_id'),
+        {'project_id': Project, 'skill_id': Skill},
+        {
+            'project_id': (integer(), True),
+            'skill_id': (integer(), True),
+            'importance_level': (integer(1, 5), False)
+        },
+        {'importance_level': 3}
+    )
+}
+
+def parse_row(spec, row, defaults):
+    if not isinstance(row, dict):
+        raise RowError('row must be an object')
+
+    # Only the columns present in the row are parsed; unknown keys are ignored
+    values = dict(defaults)
+    for column, value in row.items():
+        field = spec.fields.get(column)
+        if field is None or _empty(value):
+            continue
+        try:
+            values[column] = field[0](value)
+        except RowError as e:
+            raise RowError(f'{column} {e}')
+
+    for column in spec.required:
+        if values[column] is None:
+            raise RowError(f'{column} is required')
+    return values
+
+def _insert_rows(connection, spec, rows, defaults):
+    # One executemany straight on the DBAPI cursor. The statement is compiled
+    # once and only columns with a bind processor (dates) are converted;
+    # chunk-wide defaults such as created_at are converted once. OR IGNORE
+    # skips rows inserted concurrently since the check.
+    columns = list(defaults)
+    compiled = (
+        insert(spec.model)
+        .prefix_with('OR IGNORE', dialect='sqlite')
+        .prefix_with('IGNORE', dialect='mysql')
+        .compile(dialect=connection.dialect, column_keys=columns)
+    )
+    table = spec.model.__table__
+    order = compiled.positiontup
+    converters = []
+    for i, name in enumerate(order):
+        processor = table.columns[name].type.dialect_impl(connection.dialect).bind_processor(connection.dialect)
+        if processor is not None:
+            default = defaults[name]
+            converters.append((i, processor, default, None if default is None else processor(default)))
+
+    parameters = []
+    for values in rows:
+        row = [values[name] for name in order]
+        for i, processor, default, converted in converters:
+            value = row[i]
+            if value is default:
+                row[i] = converted
+            elif value is not None:
+                row[i] = processor(value)
+        parameters.append(tuple(row))
+
+    result = connection.exec_driver_sql(str(compiled), parameters)
+    return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(rows)
+
+def _existing_ids(connection, model, ids):
+    if not ids:
+        return set()
+    return {row[0] for row in connection.execute(select(model.id).where(model.id.in_(ids)))}
+
+def _existing_keys(connection, spec, rows):
+    # Filter on the leading key column through its index, match pairs in Python
+    first, second = (getattr(spec.model, column) for column in spec.key)
+    leading = {values[spec.key[0]] for _, values in rows}
+    if not leading:
+        return set()
+    return {tuple(row) for row in connection.execute(select(first, second).where(first.in_(leading)))}
+
+def _after_insert(connection, spec, keys):
+    # What the flush listeners would have done for ORM inserts
+    bump_table_versions(connection, [spec.model.__tablename__])
+    if spec.model is UserSkill:
+        # Whole projects of the affected users; cheaper than a pair lookup
+        # for thousands of rows
+        refresh_gap_rows(connection, project_ids={row[0] for row in connection.execute(
+            select(ProjectMember.project_id)
+            .where(ProjectMember.user_id.in_({user_id for user_id, _ in keys}))
+            .distinct()
+        )})
+    else:
+        refresh_gap_rows(connection, project_ids={key[0] for key in keys})
+
+def _invalidate_caches(spec, keys):
+    if spec.model is UserSkill:
+        skill_index.invalidate()
+        discard_snapshots(user_ids={user_id for user_id, _ in keys})
+    else:
+        discard_snapshots(project_ids={key[0] for key in keys})
+
+def _report_skipped(connection, spec, indexes, keys, inserted, report):
+    # OR IGNORE dropped rows that appeared since the existence check. The write
+    # lock is held from the insert until commit, so the rows this chunk added
+    # are the newest `inserted` ones; every other key was a duplicate.
+    first, second = (getattr(spec.model, column) for column in spec.key)
+    ours = {tuple(row) for row in connection.execute(
+        select(first, second).order_by(spec.model.id.desc()).limit(inserted)
+    )}
+    for index, key in zip(indexes, keys):
+        if key not in ours:
+            report.skip(index)
+
+def import_chunk(spec, chunk, seen, report):
+    # chunk: [(index, raw row)]
+    rows = []
+    defaults = spec.row_defaults()
+    for index, row in chunk:
+        try:
+            rows.append((index, parse_row(spec, row, defaults)))
+        except RowError as e:
+            report.error(index, str(e))
+
+    connection = db.session.connection()
+
+    # One query per referenced table
+    for column, model in spec.references.items():
+        found = _existing_ids(connection, model, {values[column] for _, values in rows})
+        valid = []
+        for index, values in rows:
+            if values[column] in found:
+                valid.append((index, values))
+            else:
+                report.error(index, f'{model.__name__} {values[column]} not found')
+        rows = valid
+
+    # One query for rows that already exist
+    existing = _existing_keys(connection, spec, rows)
+    new_rows = []
+    indexes = []
+    keys = []
+    for index, values in rows:
+        key = tuple(values[column] for column in spec.key)
+        if key in existing or key in seen:
+            report.error(index, 'already exists')
+            continue
+        seen.add(key)
+        indexes.append(index)
+        keys.append(key)
+        new_rows.append(values)
+
+    if new_rows:
+        inserted = _insert_rows(connection, spec, new_rows, defaults)
+        report.imported += inserted
+        if inserted < len(new_rows):
+            _report_skipped(connection, spec, indexes, keys, inserted, report)
+        _after_insert(connection, spec, keys)
+
+    db.session.commit()
+    if keys:
+        _invalidate_caches(spec, keys)
+
+class ImportReport:
+    def __init__(self):
+        self.read = 0
+        self.imported = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors = []
+        self.skipped_rows = []
+        # {'index', 'error'} when reading the input stopped early
+        self.aborted = None
+
+    def error(self, index, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'index': index, 'error': message})
+
+    def skip(self, index):
+        # Duplicate inserted by someone else between the check and the insert
+        self.skipped += 1
+        if len(self.skipped_rows) < MAX_REPORTED_ERRORS:
+            self.skipped_rows.append(index)
+
+    def to_dict(self):
+        report = {
+            'imported': self.imported,
+            'skipped': self.skipped,
+            'skipped_rows': sorted(self.skipped_rows),
+            'failed': self.failed,
+            'errors': sorted(self.errors, key=lambda error: error['index']),
+            'errors_truncated': self.failed > len(self.errors)
+        }
+        if self.aborted is not None:
+            report['aborted'] = self.aborted
+        return report
+
+def read_chunk(numbered, chunk_size, report):
+    # Up to chunk_size (index, row) pairs; an unreadable row ends the input
+    chunk = []
+    try:
+        for entry in numbered:
+            chunk.append(entry)
+            if len(chunk) == chunk_size:
+                break
+    except (UnicodeDecodeError, csv.Error) as e:
+        index = chunk[-1][0] + 1 if chunk else report.read
+        report.aborted = {
+            'index': index,
+            'error': f'Invalid CSV: {str(e)}. Rows before index {index} were processed; nothing after it was read.'
+        }
+    report.read += len(chunk)
+    return chunk
+
+def run_import(kind, rows, chunk_size=CHUNK_SIZE):
+    # rows: any iterable of dicts (JSON array or csv.DictReader)
+    spec = IMPORTS[kind]
+    report = ImportReport()
+    seen = set()
+    numbered = enumerate(rows)
+    while report.aborted is None:
+        chunk = read_chunk(numbered, chunk_size, report)
+        if not chunk:
+            break
+        try:
+            import_chunk(spec, chunk, seen, report)
+        except Exception:
+            db.session.rollback()
+            raise
+    return report
@@ -0,0 +1,243 @@
+import os
+import threading
+import time
+from sqlalchemy import event, select
+from src.models.user import db
+from src.models.skill import Skill, UserSkill, Project, ProjectMember, ProjectSkill
+from src.services.skill_gap import build_gap_entries, collect_gap_changes
+from src.utils.cache import get_table_versions, project_gap_version
+
+# What-if skill gap simulation
+#
+# Planners apply hypothetical member additions/removals and proficiency upgrades
+# to an in-memory overlay on top of a cached snapshot of each project. The gap is
+# then computed with build_gap_entries, the same code path analyze_skill_gap
+# uses, so iterating on a plan never writes to the database.
+
+SNAPSHOT_TTL = float(os.environ.get('SIMULATION_SNAPSHOT_TTL', '30'))
+# Snapshots carry project and skill names; a rename in any worker bumps these
+# versions and retires them. Each snapshot is also checked against its
+# project's gap version (the one read_skill_gap's cache uses), which any
+# worker's change to the members, their skills or the required skills bumps.
+SNAPSHOT_TABLES = ('projects', 'skills')
+
+def snapshot_versions(project_ids):
+    # project_id -> versions a snapshot of it must carry to be current
+    names = [project_gap_version(project_id) for project_id in project_ids]
+    versions = get_table_versions(SNAPSHOT_TABLES + tuple(names))
+    shared = versions[:len(SNAPSHOT_TABLES)]
+    return {
+        project_id: shared + (gap_version,)
+        for project_id, gap_version in zip(project_ids, versions[len(SNAPSHOT_TABLES):])
+    }
+
+class ProjectSnapshot:
+    def __init__(self, project_id, name, required, members, profiles, versions):
+        self.project_id = project_id
+        self.name = name
+        # (skill_id, skill_name, importance_level) in ProjectSkill order
+        self.required = required
+        # user_id per membership row
+        self.members = members
+        # user_id -> {skill_id: [proficiency_level, ...]}
+        self.profiles = profiles
+        self.versions = versions
+        self.loaded_at = time.monotonic()
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+def load_profiles(user_ids):
+    profiles = {user_id: {} for user_id in user_ids}
+    if not profiles:
+        return profiles
+    rows = db.session.execute(
+        select(UserSkill.user_id, UserSkill.skill_id, UserSkill.proficiency_level)
+        .where(UserSkill.user_id.in_(list(profiles)))
+    ).all()
+    for user_id, skill_id, proficiency_level in rows:
+        profiles[user_id].setdefault(skill_id, []).append(proficiency_level or 0)
+    return profiles
+
+def load_snapshots(project_ids, versions):
+    projects = dict(db.session.execute(
+        select(Project.id, Project.name).where(Project.id.in_(project_ids))
+    ).all())
+
+    required = {project_id: [] for project_id in projects}
+    for project_id, skill_id, skill_name, importance_level in db.session.execute(
+        select(ProjectSkill.project_id, ProjectSkill.skill_id, Skill.name, ProjectSkill.importance_level)
+        .outerjoin(Skill, Skill.id == ProjectSkill.skill_id)
+        .where(ProjectSkill.project_id.in_(list(projects)))
+        .order_by(ProjectSkill.id)
+    ):
+        required[project_id].append((skill_id, skill_name, importance_level))
+
+    members = {project_id: [] for project_id in projects}
+    for project_id, user_id in db.session.execute(
+        select(ProjectMember.project_id, ProjectMember.user_id)
+        .where(ProjectMember.project_id.in_(list(projects)))
+        .order_by(ProjectMember.id)
+    ):
+        members[project_id].append(user_id)
+
+    profiles = load_profiles({user_id for users in members.values() for user_id in users})
+
+    return {
+        project_id: ProjectSnapshot(
+            project_id,
+            name,
+            required[project_id],
+            members[project_id],
+            {user_id: profiles[user_id] for user_id in set(members[project_id])},
+            versions[project_id]
+        )
+        for project_id, name in projects.items()
+    }
+
+def get_snapshots(project_ids):
+    now = time.monotonic()
+    # Read before loading, so a write racing the load leaves the snapshot outdated
+    versions = snapshot_versions(project_ids)
+    with _snapshots_lock:
+        snapshots = {
+            project_id: _snapshots[project_id]
+            for project_id in project_ids
+            if project_id in _snapshots
+            and now - _snapshots[project_id].loaded_at < SNAPSHOT_TTL
+            and _snapshots[project_id].versions == versions[project_id]
+        }
+
+    missing = [project_id for project_id in project_ids if project_id not in snapshots]
+    if missing:
+        loaded = load_snapshots(missing, versions)
+        with _snapshots_lock:
+            _snapshots.update(loaded)
+        snapshots.update(loaded)
+    return snapshots
+
+def discard_snapshots(project_ids=(), user_ids=()):
+    # Drop snapshots of the given projects and of projects staffed by the users
+    project_ids = set(project_ids)
+    user_ids = set(user_ids)
+    if not (project_ids or user_ids):
+        return
+
+    with _snapshots_lock:
+        for project_id, snapshot in list(_snapshots.items()):
+            if project_id in project_ids or user_ids & snapshot.profiles.keys():
+                del _snapshots[project_id]
+
+@event.listens_for(db.session, 'after_flush')
+def invalidate_snapshots(session, flush_context):
+    project_ids, pairs, user_skill_pairs = collect_gap_changes(session)
+    project_ids |= {project_id for project_id, _ in pairs}
+    discard_snapshots(project_ids, {user_id for user_id, _ in user_skill_pairs})
+
+def snapshot_gap(snapshot, members, profiles):
+    rows = []
+    for skill_id, skill_name, importance_level in snapshot.required:
+        coverage = 0
+        proficiency_sum = 0
+        for user_id in members:
+            levels = profiles[user_id].get(skill_id, ())
+            coverage += len(levels)
+            proficiency_sum += sum(levels)
+        rows.append((skill_id, skill_name, importance_level, coverage, proficiency_sum))
+    return build_gap_entries(rows, len(members))
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _required_int(change, key):
+    value = change.get(key)
+    if not _is_int(value):
+        raise ValueError(f'{change.get("type")} requires an integer {key}')
+    return value
+
+def simulate_skill_gap(project_ids, changes):
+    project_ids = list(dict.fromkeys(project_ids))
+    snapshots = get_snapshots(project_ids)
+    missing = [project_id for project_id in project_ids if project_id not in snapshots]
+    if missing:
+        raise LookupError(f'Projects not found: {missing}')
+
+    # Overlay: copies of the membership lists and the profiles they reference
+    members = {project_id: list(snapshot.members) for project_id, snapshot in snapshots.items()}
+    profiles = {}
+    for snapshot in snapshots.values():
+        for user_id, skills in snapshot.profiles.items():
+            profiles[user_id] = skills
+
+    upgrades = []
+    unknown_users = set()
+    hypothetical = 0
+    for change in changes:
+        if not isinstance(change, dict):
+            raise ValueError('Each change must be an object')
+        change_type = change.get('type')
+        if change_type in ('add_member', 'remove_member'):
+            project_id = _required_int(change, 'project_id')
+            if project_id not in members:
+                raise ValueError(f'Project {project_id} is not part of the simulation')
+
+        if change_type == 'add_member':
+            if 'skills' in change:
+                # Hypothetical person described only by their skills
+                if not isinstance(change['skills'], list) or not all(isinstance(skill, dict) for skill in change['skills']):
+                    raise ValueError('add_member skills must be a list of objects')
+                hypothetical += 1
+                user_id = f'hypothetical-{hypothetical}'
+                profiles[user_id] = {}
+                for skill in change['skills']:
+                    profiles[user_id].setdefault(_required_int(skill, 'skill_id'), []).append(
+                        _required_int(skill, 'proficiency_level'))
+            else:
+                user_id = _required_int(change, 'user_id')
+                # Counting someone twice would inflate coverage
+                if user_id in members[project_id]:
+                    raise ValueError(f'User {user_id} is already a member of project {project_id}')
+                # Profiles are only kept current for a snapshot's own members
+                if user_id not in snapshots[project_id].profiles:
+                    unknown_users.add(user_id)
+            members[project_id].append(user_id)
+        elif change_type == 'remove_member':
+            user_id = _required_int(change, 'user_id')
+            if user_id not in members[project_id]:
+                raise ValueError(f'User {user_id} is not a member of project {project_id}')
+            members[project_id] = [member for member in members[project_id] if member != user_id]
+        elif change_type == 'upgrade':
+            user_id = change.get('user_id')
+            # Hypothetical members are upgraded by their 'hypothetical-N' id
+            if not (_is_int(user_id) or isinstance(user_id, str)):
+                raise ValueError('upgrade requires an integer user_id')
+            upgrades.append((user_id, _required_int(change, 'skill_id'), _required_int(change, 'proficiency_level')))
+            if user_id not in profiles and _is_int(user_id):
+                unknown_users.add(user_id)
+        else:
+            raise ValueError(f'Unknown change type: {change_type}')
+
+    # Real users added hypothetically are loaded in one query
+    profiles.update(load_profiles(unknown_users))
+
+    for user_id, skill_id, proficiency_level in upgrades:
+        if user_id not in profiles:
+            raise ValueError(f'Unknown user in upgrade: {user_id}')
+        skills = dict(profiles[user_id])
+        skills[skill_id] = [proficiency_level] * max(len(skills.get(skill_id, ())), 1)
+        profiles[user_id] = skills
+
+    results = []
+    for project_id in project_ids:
+        snapshot = snapshots[project_id]
+        baseline = snapshot_gap(snapshot, snapshot.members, snapshot.profiles)
+        simulated = snapshot_gap(snapshot, members[project_id], profiles)
+        results.append({
+            'project_id': project_id,
+            'project_name': snapshot.name,
+            'member_count': len(members[project_id]),
+            'total_gap_before': sum(gap['gap_score'] for gap in baseline),
+            'total_gap_after': sum(gap['gap_score'] for gap in simulated),
+            'skill_gap': simulated
+        })
+    return results
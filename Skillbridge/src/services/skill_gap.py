@@ -0,0 +1,448 @@
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import delete, event, func, inspect, insert, select, tuple_
+from src.models.user import db
+from src.models.skill import Skill, UserSkill, Project, ProjectMember, ProjectSkill, ProjectSkillGap
+from src.utils.cache import bump_table_versions, project_gap_version
+
+# Skill gap engine
+#
+# Coverage and proficiency for every required skill of a project come from a
+# single aggregate query (project_skills LEFT JOIN project_members x user_skills,
+# grouped per required skill), so the number of SQL round-trips no longer grows
+# with the size of the team or the number of required skills.
+
+def build_gap_entries(rows, member_count):
+    # rows: (skill_id, skill_name, importance_level, coverage, proficiency_sum)
+    skill_gap = []
+    for skill_id, skill_name, importance_level, coverage, proficiency_sum in rows:
+        # Calculate average proficiency
+        avg_proficiency = proficiency_sum / coverage if coverage else 0
+
+        skill_gap.append({
+            'skill_id': skill_id,
+            'skill_name': skill_name,
+            'importance_level': importance_level,
+            'coverage': coverage,
+            'avg_proficiency': avg_proficiency,
+            'gap_score': importance_level - (avg_proficiency * coverage / member_count if member_count else 0)
+        })
+
+    # Sort by gap score (highest first)
+    skill_gap.sort(key=lambda x: x['gap_score'], reverse=True)
+
+    return skill_gap
+
+def gap_rows_query(project_id):
+    # Skills held by the members of the project, one row per (membership, user skill)
+    member_skills = (
+        select(UserSkill.id, UserSkill.skill_id, UserSkill.proficiency_level)
+        .join(ProjectMember, ProjectMember.user_id == UserSkill.user_id)
+        .where(ProjectMember.project_id == project_id)
+        .subquery()
+    )
+
+    return (
+        select(
+            ProjectSkill.skill_id,
+            Skill.name,
+            ProjectSkill.importance_level,
+            func.count(member_skills.c.id),
+            func.coalesce(func.sum(member_skills.c.proficiency_level), 0)
+        )
+        .outerjoin(Skill, Skill.id == ProjectSkill.skill_id)
+        .outerjoin(member_skills, member_skills.c.skill_id == ProjectSkill.skill_id)
+        .where(ProjectSkill.project_id == project_id)
+        .group_by(ProjectSkill.id)
+        .order_by(ProjectSkill.id)
+    )
+
+def count_project_members(project_id):
+    return db.session.execute(
+        select(func.count(ProjectMember.id)).where(ProjectMember.project_id == project_id)
+    ).scalar()
+
+def compute_skill_gap(project_id):
+    member_count = count_project_members(project_id)
+    rows = db.session.execute(gap_rows_query(project_id)).all()
+    return build_gap_entries(rows, member_count)
+
+def materialized_gap_query(project_id):
+    return (
+        select(
+            ProjectSkill.skill_id,
+            Skill.name,
+            ProjectSkill.importance_level,
+            ProjectSkillGap.coverage,
+            ProjectSkillGap.proficiency_sum,
+            ProjectSkillGap.member_count
+        )
+        .outerjoin(Skill, Skill.id == ProjectSkill.skill_id)
+        .outerjoin(ProjectSkillGap, (ProjectSkillGap.project_id == ProjectSkill.project_id)
+                   & (ProjectSkillGap.skill_id == ProjectSkill.skill_id))
+        .where(ProjectSkill.project_id == project_id)
+        .order_by(ProjectSkill.id)
+    )
+
+def materialized_gaps_query(project_ids):
+    # materialized_gap_query for several projects, keyed by project_id
+    return (
+        select(
+            ProjectSkill.project_id,
+            ProjectSkill.skill_id,
+            Skill.name,
+            ProjectSkill.importance_level,
+            ProjectSkillGap.coverage,
+            ProjectSkillGap.proficiency_sum,
+            ProjectSkillGap.member_count
+        )
+        .outerjoin(Skill, Skill.id == ProjectSkill.skill_id)
+        .outerjoin(ProjectSkillGap, (ProjectSkillGap.project_id == ProjectSkill.project_id)
+                   & (ProjectSkillGap.skill_id == ProjectSkill.skill_id))
+        .where(ProjectSkill.project_id.in_(list(project_ids)))
+        .order_by(ProjectSkill.project_id, ProjectSkill.id)
+    )
+
+def read_skill_gaps(project_ids):
+    # project_id -> read_skill_gap(project_id), with one select for all projects
+    rows = {project_id: [] for project_id in project_ids}
+    if rows:
+        for row in db.session.execute(materialized_gaps_query(rows)):
+            rows[row.project_id].append(row)
+
+    gaps = {}
+    for project_id, project_rows in rows.items():
+        if any(row.member_count is None for row in project_rows):
+            gaps[project_id] = compute_skill_gap(project_id)
+        else:
+            member_count = project_rows[0].member_count if project_rows else 0
+            gaps[project_id] = build_gap_entries([row[1:6] for row in project_rows], member_count)
+    return gaps
+
+def read_skill_gap(project_id):
+    # Single indexed select against the materialized project_skill_gap table
+    rows = db.session.execute(materialized_gap_query(project_id)).all()
+
+    # Rows that were never materialized (e.g. before the first rebuild) fall
+    # back to the aggregate query
+    if any(row.member_count is None for row in rows):
+        return compute_skill_gap(project_id)
+
+    member_count = rows[0].member_count if rows else 0
+    return build_gap_entries([row[:5] for row in rows], member_count)
+
+# Portfolio-wide skill gap
+#
+# Loads the required skills, memberships and member skills of every project of a
+# company once and computes all gap scores with NumPy array operations, using the
+# same formula as build_gap_entries.
+
+def compute_company_skill_gap(company_id):
+    import numpy as np
+
+    projects = db.session.execute(
+        select(Project.id, Project.name)
+        .where(Project.company_id == company_id)
+        .order_by(Project.id)
+    ).all()
+    if not projects:
+        return []
+
+    company_projects = select(Project.id).where(Project.company_id == company_id).scalar_subquery()
+
+    # Required skills: (project_id, skill_id, skill_name, importance_level)
+    required = db.session.execute(
+        select(ProjectSkill.project_id, ProjectSkill.skill_id, Skill.name, ProjectSkill.importance_level)
+        .outerjoin(Skill, Skill.id == ProjectSkill.skill_id)
+        .where(ProjectSkill.project_id.in_(company_projects))
+        .order_by(ProjectSkill.id)
+    ).all()
+
+    # Memberships: (project_id, user_id)
+    memberships = db.session.execute(
+        select(ProjectMember.project_id, ProjectMember.user_id)
+        .where(ProjectMember.project_id.in_(company_projects))
+    ).all()
+
+    # Skills of every member: (user_id, skill_id, proficiency_level)
+    member_skills = db.session.execute(
+        select(UserSkill.user_id, UserSkill.skill_id, func.coalesce(UserSkill.proficiency_level, 0))
+        .where(UserSkill.user_id.in_(
+            select(ProjectMember.user_id).where(ProjectMember.project_id.in_(company_projects))
+        ))
+    ).all()
+
+    project_index = {project_id: i for i, (project_id, _) in enumerate(projects)}
+    n_projects = len(projects)
+
+    # Only skills that some project requires take part in the matrix
+    skill_ids = sorted({row[1] for row in required})
+    skill_index = {skill_id: j for j, skill_id in enumerate(skill_ids)}
+    n_skills = len(skill_ids)
+
+    member_count = np.zeros(n_projects, dtype=np.int64)
+    coverage = np.zeros(n_projects * n_skills, dtype=np.int64)
+    proficiency_sum = np.zeros(n_projects * n_skills, dtype=np.int64)
+
+    if memberships:
+        m_project = np.fromiter((project_index[p] for p, _ in memberships), dtype=np.int64, count=len(memberships))
+        m_user = np.fromiter((u for _, u in memberships), dtype=np.int64, count=len(memberships))
+        member_count = np.bincount(m_project, minlength=n_projects)
+
+        relevant = [row for row in member_skills if row[1] in skill_index]
+        if relevant and n_skills:
+            us_user = np.fromiter((u for u, _, _ in relevant), dtype=np.int64, count=len(relevant))
+            us_skill = np.fromiter((skill_index[s] for _, s, _ in relevant), dtype=np.int64, count=len(relevant))
+            us_level = np.fromiter((level for _, _, level in relevant), dtype=np.int64, count=len(relevant))
+
+            # Group user skills by user so each membership can be expanded into
+            # the skills of its user (a sparse project x skill join)
+            order = np.argsort(us_user, kind='stable')
+            us_user, us_skill, us_level = us_user[order], us_skill[order], us_level[order]
+            users, starts, counts = np.unique(us_user, return_index=True, return_counts=True)
+
+            pos = np.searchsorted(users, m_user)
+            pos_clipped = np.minimum(pos, len(users) - 1)
+            has_skills = users[pos_clipped] == m_user
+            m_project = m_project[has_skills]
+            m_start = starts[pos_clipped[has_skills]]
+            m_count = counts[pos_clipped[has_skills]]
+
+            total = int(m_count.sum())
+            if total:
+                offsets = np.repeat(m_start - np.cumsum(m_count) + m_count, m_count) + np.arange(total)
+                keys = np.repeat(m_project, m_count) * n_skills + us_skill[offsets]
+                coverage = np.bincount(keys, minlength=n_projects * n_skills)
+                proficiency_sum = np.bincount(keys, weights=us_level[offsets], minlength=n_projects * n_skills).astype(np.int64)
+
+    # Gap score for every required (project, skill) pair at once
+    r_project = np.fromiter((project_index[row[0]] for row in required), dtype=np.int64, count=len(required))
+    r_skill = np.fromiter((skill_index[row[1]] for row in required), dtype=np.int64, count=len(required))
+    r_importance = np.fromiter((row[3] or 0 for row in required), dtype=np.float64, count=len(required))
+    keys = r_project * n_skills + r_skill
+
+    r_coverage = coverage[keys] if len(keys) else np.zeros(0, dtype=np.int64)
+    r_sum = proficiency_sum[keys] if len(keys) else np.zeros(0, dtype=np.int64)
+    r_members = member_count[r_project]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_proficiency = np.where(r_coverage > 0, r_sum / np.maximum(r_coverage, 1), 0.0)
+        gap_score = r_importance - np.where(r_members > 0, avg_proficiency * r_coverage / np.maximum(r_members, 1), 0.0)
+
+    # Assemble one entry list per project
+    results = [
+        {'project_id': project_id, 'project_name': name, 'skill_gap': []}
+        for project_id, name in projects
+    ]
+    for i, (_, skill_id, skill_name, importance_level) in enumerate(required):
+        entry_coverage = int(r_coverage[i])
+        results[r_project[i]]['skill_gap'].append({
+            'skill_id': skill_id,
+            'skill_name': skill_name,
+            'importance_level': importance_level,
+            'coverage': entry_coverage,
+            'avg_proficiency': float(avg_proficiency[i]) if entry_coverage else 0,
+            'gap_score': float(gap_score[i]) if r_members[i] else importance_level
+        })
+
+    for result in results:
+        result['skill_gap'].sort(key=lambda x: x['gap_score'], reverse=True)
+
+    return results
+
+# Skill gap materialization
+#
+# project_skill_gap holds coverage, proficiency sum and member count for every
+# required (project, skill) pair. An after_flush listener refreshes only the
+# pairs touched by changed UserSkill, ProjectMember and ProjectSkill rows, inside
+# the same transaction as the change itself.
+
+def materialized_rows_query(project_ids=None, pairs=None):
+    required = select(ProjectSkill.project_id, ProjectSkill.skill_id).distinct()
+    member_skills = (
+        select(ProjectMember.project_id, UserSkill.id, UserSkill.skill_id, UserSkill.proficiency_level)
+        .join(UserSkill, UserSkill.user_id == ProjectMember.user_id)
+    )
+
+    if project_ids is not None:
+        required = required.where(ProjectSkill.project_id.in_(project_ids))
+        member_skills = member_skills.where(ProjectMember.project_id.in_(project_ids))
+    if pairs is not None:
+        # The plain IN on project_id lets the (project_id, skill_id) index drive the lookup
+        required = required.where(
+            ProjectSkill.project_id.in_({project_id for project_id, _ in pairs}),
+            tuple_(ProjectSkill.project_id, ProjectSkill.skill_id).in_(pairs)
+        )
+        member_skills = member_skills.where(ProjectMember.project_id.in_({project_id for project_id, _ in pairs}))
+
+    required = required.subquery()
+    member_skills = member_skills.subquery()
+    member_count = (
+        select(func.count(ProjectMember.id))
+        .where(ProjectMember.project_id == required.c.project_id)
+        .scalar_subquery()
+    )
+
+    return (
+        select(
+            required.c.project_id,
+            required.c.skill_id,
+            func.count(member_skills.c.id),
+            func.coalesce(func.sum(member_skills.c.proficiency_level), 0),
+            member_count
+        )
+        .outerjoin(member_skills, (member_skills.c.project_id == required.c.project_id)
+                   & (member_skills.c.skill_id == required.c.skill_id))
+        .group_by(required.c.project_id, required.c.skill_id)
+    )
+
+def _row_dicts(rows):
+    return [
+        {
+            'project_id': project_id,
+            'skill_id': skill_id,
+            'coverage': coverage,
+            'proficiency_sum': proficiency_sum,
+            'member_count': member_count
+        }
+        for project_id, skill_id, coverage, proficiency_sum, member_count in rows
+    ]
+
+def refresh_gap_rows(connection, project_ids=None, pairs=None):
+    # Recompute the materialized rows of whole projects and/or single pairs
+    affected = set(project_ids or ()) | {project_id for project_id, _ in pairs or ()}
+    if affected:
+        bump_table_versions(connection, [project_gap_version(project_id) for project_id in affected])
+
+    if project_ids:
+        project_ids = list(project_ids)
+        connection.execute(delete(ProjectSkillGap).where(ProjectSkillGap.project_id.in_(project_ids)))
+        rows = connection.execute(materialized_rows_query(project_ids=project_ids)).all()
+        if rows:
+            connection.execute(insert(ProjectSkillGap), _row_dicts(rows))
+
+    pairs = [pair for pair in (pairs or ()) if not project_ids or pair[0] not in project_ids]
+    if pairs:
+        connection.execute(delete(ProjectSkillGap).where(
+            tuple_(ProjectSkillGap.project_id, ProjectSkillGap.skill_id).in_(pairs)
+        ))
+        rows = connection.execute(materialized_rows_query(pairs=pairs)).all()
+        if rows:
+            connection.execute(insert(ProjectSkillGap), _row_dicts(rows))
+
+def _attribute_values(obj, key):
+    # Current value plus any value replaced during this flush
+    history = inspect(obj).attrs[key].history
+    values = set(history.added or ()) | set(history.unchanged or ()) | set(history.deleted or ())
+    if not values:
+        values.add(getattr(obj, key))
+    values.discard(None)
+    return values
+
+def _is_modified(obj, keys):
+    state = inspect(obj)
+    return any(state.attrs[key].history.has_changes() for key in keys)
+
+def collect_gap_changes(session):
+    project_ids = set()
+    pairs = set()
+    user_skill_pairs = set()
+
+    changed = [(obj, False) for obj in session.new] + [(obj, False) for obj in session.deleted]
+    changed += [(obj, True) for obj in session.dirty]
+
+    for obj, dirty in changed:
+        if isinstance(obj, UserSkill):
+            if dirty and not _is_modified(obj, ('user_id', 'skill_id', 'proficiency_level')):
+                continue
+            for user_id in _attribute_values(obj, 'user_id'):
+                for skill_id in _attribute_values(obj, 'skill_id'):
+                    user_skill_pairs.add((user_id, skill_id))
+        elif isinstance(obj, ProjectMember):
+            if dirty and not _is_modified(obj, ('project_id', 'user_id')):
+                continue
+            project_ids |= _attribute_values(obj, 'project_id')
+        elif isinstance(obj, ProjectSkill):
+            if dirty and not _is_modified(obj, ('project_id', 'skill_id', 'importance_level')):
+                continue
+            for project_id in _attribute_values(obj, 'project_id'):
+                for skill_id in _attribute_values(obj, 'skill_id'):
+                    pairs.add((project_id, skill_id))
+
+    return project_ids, pairs, user_skill_pairs
+
+def affected_pairs_query(user_skill_pairs):
+    # Required (project, skill) pairs of the projects the users are members of
+    return (
+        select(ProjectSkill.project_id, ProjectSkill.skill_id)
+        .join(ProjectMember, ProjectMember.project_id == ProjectSkill.project_id)
+        .where(
+            ProjectMember.user_id.in_({user_id for user_id, _ in user_skill_pairs}),
+            tuple_(ProjectMember.user_id, ProjectSkill.skill_id).in_(list(user_skill_pairs))
+        )
+        .distinct()
+    )
+
+def affected_pairs_for_user_skills(connection, user_skill_pairs):
+    if not user_skill_pairs:
+        return set()
+    rows = connection.execute(affected_pairs_query(user_skill_pairs)).all()
+    return {tuple(row) for row in rows}
+
+@event.listens_for(db.session, 'after_flush')
+def maintain_skill_gap(session, flush_context):
+    project_ids, pairs, user_skill_pairs = collect_gap_changes(session)
+    if not (project_ids or pairs or user_skill_pairs):
+        return
+
+    connection = session.connection()
+    pairs |= affected_pairs_for_user_skills(connection, user_skill_pairs)
+    refresh_gap_rows(connection, project_ids=project_ids, pairs=list(pairs))
+
+def _compute_chunk(engine, project_ids):
+    with engine.connect() as connection:
+        return connection.execute(materialized_rows_query(project_ids=project_ids)).all()
+
+def compute_materialized_rows(workers=4, chunk_size=500):
+    # Aggregate every project from scratch, chunks of projects in parallel
+    engine = db.engine
+    project_ids = [row[0] for row in db.session.execute(
+        select(ProjectSkill.project_id).distinct().order_by(ProjectSkill.project_id)
+    )]
+    chunks = [project_ids[i:i + chunk_size] for i in range(0, len(project_ids), chunk_size)]
+
+    rows = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for chunk_rows in executor.map(lambda chunk: _compute_chunk(engine, chunk), chunks):
+            rows.extend(chunk_rows)
+    return rows
+
+def rebuild_skill_gap(workers=4, chunk_size=500):
+    rows = compute_materialized_rows(workers, chunk_size)
+
+    # Swap the table contents in a single transaction
+    db.session.execute(delete(ProjectSkillGap))
+    for i in range(0, len(rows), chunk_size):
+        db.session.execute(insert(ProjectSkillGap), _row_dicts(rows[i:i + chunk_size]))
+    bump_table_versions(db.session.connection(), [ProjectSkillGap.__tablename__])
+    db.session.commit()
+
+    return len(rows)
+
+def check_skill_gap(workers=4, chunk_size=500):
+    # Compare the materialized table with a from-scratch computation
+    expected = {(row[0], row[1]): tuple(row[2:]) for row in compute_materialized_rows(workers, chunk_size)}
+    stored = {
+        (row.project_id, row.skill_id): (row.coverage, row.proficiency_sum, row.member_count)
+        for row in db.session.execute(select(ProjectSkillGap)).scalars()
+    }
+
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        if expected.get(key) != stored.get(key):
+            mismatches.append({
+                'project_id': key[0],
+                'skill_id': key[1],
+                'expected': expected.get(key),
+                'stored': stored.get(key)
+            })
+    return mismatches
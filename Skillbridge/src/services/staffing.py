@@ -0,0 +1,297 @@
+import threading
+from bisect import insort
+from collections import Counter
+from datetime import date
+from sqlalchemy import event, func, inspect, or_, select
+from src.models.user import db, User
+from src.models.skill import UserSkill, Project, ProjectMember
+from src.services.skill_gap import read_skill_gap
+from src.utils.cache import get_table_versions
+
+# Staffing recommender
+#
+# An in-memory inverted index maps (company_id, skill_id) to the users of that
+# company holding the skill, ordered by a candidate score, so recommendations
+# never cross tenants. Each per-skill list is kept sorted by
+# (-score, user_id), which is also a valid heapq min-heap, so the best
+# candidates are read from the front without scanning user_skills.
+#
+# Commits in this worker update only the (user_id, skill_id) entries they
+# touched. Every lookup compares the user_skills and users table versions with
+# the ones the index reflects; any other change (another worker, a raw bulk
+# insert) makes the next lookup rebuild the whole index.
+
+# Candidate score weights
+PROFICIENCY_WEIGHT = 1.0
+EXPERIENCE_WEIGHT = 0.2
+EXPERIENCE_CAP_YEARS = 10
+CERTIFICATION_BONUS = 0.5
+RECENCY_WEIGHT = 1.0
+RECENCY_HORIZON_DAYS = 730
+
+# Tables whose versions the index is checked against
+INDEX_TABLES = ('user_skills', 'users')
+
+def candidate_score(proficiency_level, years_experience, is_certified, last_used, today=None):
+    today = today or date.today()
+    score = (proficiency_level or 0) * PROFICIENCY_WEIGHT
+    score += min(years_experience or 0, EXPERIENCE_CAP_YEARS) * EXPERIENCE_WEIGHT
+    if is_certified:
+        score += CERTIFICATION_BONUS
+    if last_used:
+        # Linear decay from 1 (used today) to 0 (unused for the horizon)
+        days = max((today - last_used).days, 0)
+        score += max(0.0, 1 - days / RECENCY_HORIZON_DAYS) * RECENCY_WEIGHT
+    return round(score, 4)
+
+def index_rows_query():
+    # (company_id, user_id, skill_id, entry fields...) of active users
+    return (
+        select(
+            User.company_id,
+            UserSkill.user_id,
+            UserSkill.skill_id,
+            UserSkill.proficiency_level,
+            UserSkill.years_experience,
+            UserSkill.is_certified,
+            UserSkill.last_used
+        )
+        .join(User, User.id == UserSkill.user_id)
+        .where(or_(User.is_active.is_(None), User.is_active.is_(True)))
+    )
+
+def index_entry(row, today):
+    company_id, user_id, skill_id, proficiency_level, years_experience, is_certified, last_used = row
+    score = candidate_score(proficiency_level, years_experience, is_certified, last_used, today)
+    return (company_id, skill_id), (-score, user_id, proficiency_level or 0)
+
+class SkillIndex:
+    def __init__(self):
+        self._heaps = {}
+        # (user_id, skill_id) -> ((company_id, skill_id), entry) and
+        # user_id -> skill ids, to find a user's entries again
+        self._entries = {}
+        self._user_skills = {}
+        # INDEX_TABLES versions the heaps reflect
+        self._versions = None
+        self._dirty = True
+        # Bumped by every invalidate(), so a build that raced a write stays dirty
+        self._generation = 0
+        self._lock = threading.Lock()
+        # Committed in this worker but not applied yet: users to reload
+        # entirely, (user_id, skill_id) pairs, and table version bumps
+        self._pending_users = set()
+        self._pending_pairs = set()
+        self._pending_bumps = Counter()
+        self._pending_lock = threading.Lock()
+
+    def invalidate(self):
+        self._generation += 1
+        self._dirty = True
+
+    def is_stale(self, versions=None):
+        if self._dirty or self._versions is None:
+            return True
+        return self._versions != (versions or get_table_versions(INDEX_TABLES))
+
+    def committed(self, users, pairs, bumps):
+        # Called after a commit in this worker with what it changed
+        with self._pending_lock:
+            self._pending_users |= users
+            self._pending_pairs |= pairs
+            self._pending_bumps.update(bumps)
+
+    def _take_pending(self):
+        with self._pending_lock:
+            pending = self._pending_users, self._pending_pairs, self._pending_bumps
+            self._pending_users, self._pending_pairs, self._pending_bumps = set(), set(), Counter()
+        return pending
+
+    def build(self):
+        generation = self._generation
+        # Read in the same transaction as the rows, so they match
+        versions = get_table_versions(INDEX_TABLES)
+        today = date.today()
+
+        heaps = {}
+        entries = {}
+        user_skills = {}
+        for row in db.session.execute(index_rows_query()):
+            key, entry = index_entry(row, today)
+            heaps.setdefault(key, []).append(entry)
+            entries[(entry[1], key[1])] = (key, entry)
+            user_skills.setdefault(entry[1], set()).add(key[1])
+
+        # A sorted list satisfies the heap invariant
+        for heap in heaps.values():
+            heap.sort()
+
+        self._heaps = heaps
+        self._entries = entries
+        self._user_skills = user_skills
+        self._versions = versions
+        self._dirty = self._generation != generation
+
+    def refresh(self, users, pairs):
+        # Reloads the entries of whole users and of single (user_id, skill_id)
+        # pairs. Changed heaps are copied and swapped in, so readers never see
+        # a list being edited.
+        user_ids = users | {user_id for user_id, _ in pairs}
+        if not user_ids:
+            return
+        today = date.today()
+        fresh = {}
+        for row in db.session.execute(index_rows_query().where(UserSkill.user_id.in_(user_ids))):
+            if row.user_id in users or (row.user_id, row.skill_id) in pairs:
+                fresh[(row.user_id, row.skill_id)] = index_entry(row, today)
+
+        stale = {(user_id, skill_id) for user_id in users for skill_id in self._user_skills.get(user_id, ())}
+        stale |= {pair for pair in pairs if pair in self._entries}
+
+        removed = {}
+        for pair in stale:
+            key, entry = self._entries.pop(pair)
+            removed.setdefault(key, set()).add(entry)
+            self._user_skills[pair[0]].discard(pair[1])
+        added = {}
+        for pair, (key, entry) in fresh.items():
+            added.setdefault(key, []).append(entry)
+            self._entries[pair] = (key, entry)
+            self._user_skills.setdefault(pair[0], set()).add(pair[1])
+
+        for key in removed.keys() | added.keys():
+            gone = removed.get(key, set())
+            heap = [entry for entry in self._heaps.get(key, []) if entry not in gone]
+            for entry in added.get(key, []):
+                insort(heap, entry)
+            if heap:
+                self._heaps[key] = heap
+            else:
+                self._heaps.pop(key, None)
+
+    def ensure_fresh(self):
+        versions = get_table_versions(INDEX_TABLES)
+        if not self._pending_bumps and not self.is_stale(versions):
+            return
+        with self._lock:
+            users, pairs, bumps = self._take_pending()
+            if self._versions is not None:
+                # Versions this worker's own commits moved to
+                self._versions = tuple(
+                    version + bumps[table] for table, version in zip(INDEX_TABLES, self._versions)
+                )
+            if self.is_stale(versions):
+                self.build()
+            else:
+                self.refresh(users, pairs)
+
+    def candidates(self, company_id, skill_id):
+        self.ensure_fresh()
+        return self._heaps.get((company_id, skill_id), [])
+
+skill_index = SkillIndex()
+
+def _key_changed(obj, columns):
+    state = inspect(obj)
+    return any(state.attrs[column].history.deleted for column in columns)
+
+@event.listens_for(db.session, 'after_flush')
+def collect_skill_index_changes(session, flush_context):
+    # What this flush changed, applied to the index once it is committed. The
+    # bumps mirror bump_versions_on_flush: one per table per flush.
+    users, pairs = set(), set()
+    bumps = Counter()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, UserSkill):
+            bumps['user_skills'] = 1
+            if obj in session.dirty and _key_changed(obj, ('user_id', 'skill_id')):
+                # Moved to another user or skill: reload the users involved
+                users.add(obj.user_id)
+                users.update(inspect(obj).attrs.user_id.history.deleted)
+            else:
+                pairs.add((obj.user_id, obj.skill_id))
+        elif isinstance(obj, User):
+            bumps['users'] = 1
+            users.add(obj.id)
+    if bumps:
+        changes = session.info.setdefault('skill_index_changes', (set(), set(), Counter()))
+        changes[0].update(users)
+        changes[1].update(pairs)
+        changes[2].update(bumps)
+
+@event.listens_for(db.session, 'after_commit')
+def apply_skill_index_changes(session):
+    changes = session.info.pop('skill_index_changes', None)
+    if changes is not None:
+        skill_index.committed(*changes)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_skill_index_changes(session):
+    session.info.pop('skill_index_changes', None)
+
+def remaining_capacity(user_ids):
+    # Capacity left from allocation_percentage across all memberships
+    allocated = dict(db.session.execute(
+        select(ProjectMember.user_id, func.coalesce(func.sum(ProjectMember.allocation_percentage), 0))
+        .where(ProjectMember.user_id.in_(user_ids))
+        .group_by(ProjectMember.user_id)
+    ).all())
+    return {user_id: 100 - allocated.get(user_id, 0) for user_id in user_ids}
+
+def top_candidates(company_id, skill_id, k, exclude, min_capacity):
+    heap = skill_index.candidates(company_id, skill_id)
+    window = max(4 * k, 50)
+
+    selected = []
+    position = 0
+    while len(selected) < k and position < len(heap):
+        batch = [entry for entry in heap[position:position + window] if entry[1] not in exclude]
+        position += window
+        if not batch:
+            continue
+
+        capacity = remaining_capacity([user_id for _, user_id, _ in batch])
+        for neg_score, user_id, proficiency_level in batch:
+            if capacity[user_id] >= min_capacity:
+                selected.append((user_id, -neg_score, proficiency_level, capacity[user_id]))
+                if len(selected) == k:
+                    break
+
+    return selected
+
+def recommend_staffing(project_id, k=5, gaps=3, min_capacity=1):
+    skill_gap = read_skill_gap(project_id)
+    company_id = db.session.execute(select(Project.company_id).where(Project.id == project_id)).scalar()
+    member_rows = db.session.execute(
+        select(ProjectMember.user_id).where(ProjectMember.project_id == project_id)
+    ).scalars().all()
+    member_count = len(member_rows)
+    members = set(member_rows)
+
+    recommendations = []
+    for gap in [gap for gap in skill_gap if gap['gap_score'] > 0][:gaps]:
+        proficiency_sum = gap['avg_proficiency'] * gap['coverage']
+
+        candidates = []
+        for user_id, score, proficiency_level, capacity in top_candidates(company_id, gap['skill_id'], k, members, min_capacity):
+            # Gap score of this skill if the candidate joined the project
+            projected_gap = gap['importance_level'] - (proficiency_sum + proficiency_level) / (member_count + 1)
+            candidates.append({
+                'user_id': user_id,
+                'score': score,
+                'proficiency_level': proficiency_level,
+                'remaining_capacity': capacity,
+                'projected_gap_score': projected_gap
+            })
+
+        recommendations.append({
+            'skill_id': gap['skill_id'],
+            'skill_name': gap['skill_name'],
+            'importance_level': gap['importance_level'],
+            'gap_score': gap['gap_score'],
+            'candidates': candidates
+        })
+
+    return recommendations
@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from src.models.user import db, User
+from src.utils.cache import get_table_versions
+
+# Shared credential store
+#
+# Accounts live in the users table, so every gunicorn worker sees the same set
+# through the unique username index. Each worker keeps a hot cache of the
+# fields login needs; it is dropped whenever the 'users' table version changes,
+# which any worker's commit bumps, checked at most every
+# USER_CACHE_REVALIDATE_SECONDS.
+
+REVALIDATE_SECONDS = float(os.environ.get('USER_CACHE_REVALIDATE_SECONDS', '1'))
+
+class UsernameTaken(Exception):
+    pass
+
+class EmailTaken(Exception):
+    pass
+
+class UserStore:
+    def __init__(self, revalidate_seconds=REVALIDATE_SECONDS):
+        self.revalidate_seconds = revalidate_seconds
+        self._by_username = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _revalidate(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.revalidate_seconds:
+            return
+        version = get_table_versions(('users',))[0]
+        with self._lock:
+            if version != self._version:
+                self._by_username.clear()
+                self._version = version
+            self._checked_at = now
+
+    def invalidate(self):
+        with self._lock:
+            self._by_username.clear()
+            self._checked_at = 0.0
+
+    def get(self, username):
+        self._revalidate()
+        record = self._by_username.get(username)
+        if record is not None:
+            return record
+
+        row = db.session.execute(
+            select(User.id, User.username, User.password_hash, User.role, User.is_active)
+            .where(User.username == username)
+        ).first()
+        if row is None:
+            return None
+
+        record = {
+            'id': row.id,
+            'username': row.username,
+            'password_hash': row.password_hash,
+            'role': row.role or 'user',
+            'is_active': row.is_active is not False
+        }
+        with self._lock:
+            self._by_username[username] = record
+        return record
+
+    def create(self, username, password, email=None, role='user', **fields):
+        user = User(
+            username=username,
+            # Email is required by the schema; fall back to a placeholder
+            email=email or f'{username}@users.skillbridge.local',
+            role=role,
+            **fields
+        )
+        user.set_password(password)
+
+        db.session.add(user)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            # Both columns are unique; see which one the committed row holds
+            if db.session.scalar(select(User.id).where(User.username == user.username)) is not None:
+                raise UsernameTaken(username)
+            if db.session.scalar(select(User.id).where(User.email == user.email)) is not None:
+                raise EmailTaken(user.email)
+            raise
+
+        return user
+
+user_store = UserStore()
@@ -0,0 +1,106 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+import jwt
+
+# Shared token verification for all blueprints
+#
+# Verified JWT payloads are kept in a bounded LRU keyed by the SHA-256 digest of
+# the token, so a bearer token that comes back many times a minute is decoded
+# and signature-checked once. Cached entries are dropped as soon as their
+# 'exp' claim has passed.
+
+# Secret key for JWT
+SECRET_KEY = os.environ.get('SECRET_KEY') or os.environ.get('JWT_SECRET_KEY', 'dev-secret-key')
+
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', '4096'))
+
+# Permissions granted to each role
+ROLE_PERMISSIONS = {
+    'admin': (
+        'skills:write',
+        'companies:write',
+        'projects:write',
+        'projects:plan',
+        'users:any',
+        'system:read',
+        'exports:read'
+    ),
+    'manager': (
+        'projects:write',
+        'projects:plan'
+    ),
+    'user': ()
+}
+
+# Precompiled once: role -> frozenset of permissions
+_ROLE_PERMISSION_SETS = {role: frozenset(permissions) for role, permissions in ROLE_PERMISSIONS.items()}
+_NO_PERMISSIONS = frozenset()
+
+def has_permission(payload, permission):
+    return permission in _ROLE_PERMISSION_SETS.get(payload.get('role'), _NO_PERMISSIONS)
+
+class TokenCache:
+    def __init__(self, max_size=TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest, now):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at = entry
+            if expires_at is not None and now >= expires_at:
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return payload
+
+    def put(self, digest, payload):
+        expires_at = payload.get('exp')
+        with self._lock:
+            self._entries[digest] = (payload, expires_at)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+token_cache = TokenCache()
+
+def decode_token(token):
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    payload = token_cache.get(digest, time.time())
+    if payload is None:
+        # Raises jwt.ExpiredSignatureError / jwt.InvalidTokenError
+        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+        token_cache.put(digest, payload)
+    return payload
+
+# Helper function to verify JWT token
+def verify_token(auth_header):
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None, {'error': 'Authorization token is missing'}, 401
+
+    token = auth_header.split(' ')[1]
+
+    try:
+        # Decode and verify token (cached)
+        payload = decode_token(token)
+        return payload, None, None
+
+    except jwt.ExpiredSignatureError:
+        return None, {'error': 'Token has expired'}, 401
+    except jwt.InvalidTokenError:
+        return None, {'error': 'Invalid token'}, 401
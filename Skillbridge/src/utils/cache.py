@@ -0,0 +1,164 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import current_app, g, has_app_context
+from sqlalchemy import event, insert, select, update
+from src.models.user import db
+from src.models.version import TableVersion
+
+logger = logging.getLogger(__name__)
+
+# Versioned response cache
+#
+# Cached responses are validated against change counters in table_versions.
+# A flush bumps the counter of every table it touches (in the same
+# transaction), so a commit in any worker invalidates exactly the entries
+# that were built from those tables.
+
+MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+SKILL_GAP_STALE_WHILE_REVALIDATE = os.environ.get('SKILL_GAP_STALE_WHILE_REVALIDATE', '0') == '1'
+
+def project_gap_version(project_id):
+    return f'project_gap:{project_id}'
+
+def bump_table_versions(connection, names):
+    now = datetime.utcnow()
+    for name in sorted(set(names)):
+        result = connection.execute(
+            update(TableVersion)
+            .where(TableVersion.name == name)
+            .values(version=TableVersion.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(TableVersion).values(name=name, version=1, updated_at=now))
+
+def get_table_versions(names):
+    # Versions already read for this request (conditional_get) are reused
+    known = g.get('table_versions') if has_app_context() else None
+    if known is not None and all(name in known for name in names):
+        return tuple(known[name] for name in names)
+
+    versions = dict(db.session.execute(
+        select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(list(names)))
+    ).all())
+    return tuple(versions.get(name, 0) for name in names)
+
+def get_table_validators(names):
+    # (versions, newest updated_at) for HTTP validators
+    rows = {name: (version, updated_at) for name, version, updated_at in db.session.execute(
+        select(TableVersion.name, TableVersion.version, TableVersion.updated_at)
+        .where(TableVersion.name.in_(list(names)))
+    )}
+    versions = tuple(rows[name][0] if name in rows else 0 for name in names)
+    updated = [updated_at for _, updated_at in rows.values() if updated_at is not None]
+    return versions, max(updated) if updated else None
+
+@event.listens_for(db.session, 'after_flush')
+def bump_versions_on_flush(session, flush_context):
+    tables = {
+        obj.__table__.name
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+        if hasattr(obj, '__table__') and not isinstance(obj, TableVersion)
+        and (obj not in session.dirty or session.is_modified(obj, include_collections=False))
+    }
+    if tables:
+        bump_table_versions(session.connection(), tables)
+
+class ResponseCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-revalidate')
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_hits': self.stale_hits,
+                'evictions': self.evictions
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _store(self, key, versions, body):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            if len(body) > self.max_bytes:
+                return
+            self._entries[key] = (versions, body)
+            self._size += len(body)
+            # Evict least recently used entries beyond the bounds
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def _respond(self, body, state):
+        response = current_app.response_class(body, status=200, mimetype='application/json')
+        response.headers['X-Cache'] = state
+        return response
+
+    def _revalidate(self, app, key, tables, compute):
+        try:
+            with app.app_context():
+                versions = get_table_versions(tables)
+                body = app.json.response(compute()).get_data()
+                self._store(key, versions, body)
+        except Exception as e:
+            logger.error(f'Cache revalidation failed for {key}: {str(e)}')
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def fetch(self, key, tables, compute, stale_while_revalidate=False):
+        # compute() returns the JSON payload and must not touch the request
+        versions = get_table_versions(tables)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry[0] == versions:
+                    self.hits += 1
+                    return self._respond(entry[1], 'HIT')
+            if entry is not None and stale_while_revalidate:
+                # Serve the outdated body and refresh it in the background once
+                self.stale_hits += 1
+                schedule = key not in self._refreshing
+                self._refreshing.add(key)
+            else:
+                self.misses += 1
+                entry = None
+
+        if entry is not None:
+            if schedule:
+                app = current_app._get_current_object()
+                self._executor.submit(self._revalidate, app, key, tables, compute)
+            return self._respond(entry[1], 'STALE')
+
+        # Same encoding as jsonify
+        body = current_app.json.response(compute()).get_data()
+        self._store(key, versions, body)
+        return self._respond(body, 'MISS')
+
+response_cache = ResponseCache()
@@ -0,0 +1,75 @@
+import os
+import hashlib
+from functools import wraps
+from flask import request, g, make_response
+from src.utils.auth import verify_token
+from src.utils.cache import get_table_validators
+
+# HTTP conditional requests for catalog data
+#
+# ETags are derived from the change counters in table_versions (which every
+# insert, update and delete bumps) and the request URL, Last-Modified from
+# the newest table_versions.updated_at. A matching If-None-Match or
+# If-Modified-Since is answered with 304 after the token check and before the
+# view runs, so repeat loads cost one small query and no serialization.
+
+# policy -> Cache-Control; override with CACHE_CONTROL_<POLICY>=...
+DEFAULT_POLICIES = {
+    # Rarely changes; browsers may reuse it briefly without asking
+    'catalog': 'private, max-age=60, must-revalidate',
+    # Always revalidated, usually with a 304
+    'list': 'private, no-cache'
+}
+
+POLICIES = {
+    policy: os.environ.get(f'CACHE_CONTROL_{policy.upper()}', default)
+    for policy, default in DEFAULT_POLICIES.items()
+}
+
+def make_etag(versions):
+    # Same tables and versions for the same URL -> same body
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(request.path.encode('utf-8'))
+    digest.update(repr(sorted(request.args.items(multi=True))).encode('utf-8'))
+    digest.update(repr(versions).encode('utf-8'))
+    return digest.hexdigest()
+
+def not_modified(etag, last_modified):
+    # If-None-Match wins over If-Modified-Since whenever it is sent (RFC 9110
+    # 13.2.2), whether or not it matches
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    # HTTP dates have whole seconds, so compare at that resolution: a client
+    # sends back the Last-Modified it was given (RFC 9110 13.1.3)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+def conditional_get(policy, tables):
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            # Unauthenticated requests get the view's own error response
+            payload, error, status_code = verify_token(request.headers.get('Authorization'))
+            if error:
+                return f(*args, **kwargs)
+
+            versions, last_modified = get_table_validators(tables)
+            # The response cache reuses these instead of reading them again
+            g.table_versions = dict(zip(tables, versions))
+            etag = make_etag(versions)
+
+            if not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = POLICIES[policy]
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,65 @@
+import os
+from flask import request
+from flask_cors import CORS
+
+# CORS
+#
+# Preflight (OPTIONS) requests are answered in a before_request hook from a
+# header set built once per allowed origin, before routing, auth or any view
+# code runs, and carry Access-Control-Max-Age so browsers cache them. Actual
+# responses get their CORS headers from Flask-CORS, configured from the same
+# origin list.
+
+DEFAULT_ALLOWED_ORIGINS = [
+    'http://localhost:5173',
+    'http://localhost:5174',
+    'http://localhost:5175',
+    'http://localhost:5176',
+    'https://skillbridge-frontend.netlify.app',
+    'https://skillbridge-frontend-roan.vercel.app'
+]
+
+# Override with CORS_ORIGINS=origin1,origin2
+ALLOWED_ORIGINS = [
+    origin.strip() for origin in os.environ.get('CORS_ORIGINS', ','.join(DEFAULT_ALLOWED_ORIGINS)).split(',')
+    if origin.strip()
+]
+ALLOWED_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']
+ALLOWED_HEADERS = ['Content-Type', 'Authorization', 'If-None-Match', 'If-Modified-Since']
+# Response headers the frontend may read
+EXPOSE_HEADERS = ['ETag', 'Last-Modified', 'Retry-After', 'X-Next-Cursor']
+# Browsers clamp this (Chrome to 2 hours, Firefox to 24 hours)
+PREFLIGHT_MAX_AGE = int(os.environ.get('CORS_PREFLIGHT_MAX_AGE', '86400'))
+
+def preflight_headers(origin):
+    return [
+        ('Access-Control-Allow-Origin', origin),
+        ('Access-Control-Allow-Credentials', 'true'),
+        ('Access-Control-Allow-Methods', ', '.join(ALLOWED_METHODS)),
+        ('Access-Control-Allow-Headers', ', '.join(ALLOWED_HEADERS)),
+        ('Access-Control-Max-Age', str(PREFLIGHT_MAX_AGE)),
+        ('Vary', 'Origin')
+    ]
+
+PREFLIGHT_HEADERS = {origin: preflight_headers(origin) for origin in ALLOWED_ORIGINS}
+
+def init_cors(app):
+    CORS(
+        app,
+        origins=ALLOWED_ORIGINS,
+        supports_credentials=True,
+        allow_headers=ALLOWED_HEADERS,
+        expose_headers=EXPOSE_HEADERS,
+        methods=ALLOWED_METHODS,
+        max_age=PREFLIGHT_MAX_AGE
+    )
+
+    def answer_preflight():
+        if request.method != 'OPTIONS' or 'Access-Control-Request-Method' not in request.headers:
+            return None
+        # Unknown origins get no CORS headers, so the browser blocks the call
+        headers = PREFLIGHT_HEADERS.get(request.headers.get('Origin'), [('Vary', 'Origin')])
+        return app.response_class(status=204, headers=headers)
+
+    # Ahead of every other before_request hook
+    app.before_request_funcs.setdefault(None, []).insert(0, answer_preflight)
@@ -0,0 +1,26 @@
+from flask import request
+
+# ?include= expansion for list endpoints
+#
+# Each endpoint declares the relations it can expand as a mapping of include
+# name -> SQLAlchemy loader option (joinedload for many-to-one, selectinload
+# for collections). The requested options are applied to the list query, so a
+# response costs a fixed number of queries however many rows it returns.
+
+class InvalidInclude(ValueError):
+    pass
+
+def parse_includes(available):
+    raw = request.args.get('include', '')
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+
+    unknown = sorted(names - set(available))
+    if unknown:
+        raise InvalidInclude(
+            f'Unknown include: {", ".join(unknown)} (available: {", ".join(sorted(available))})'
+        )
+
+    return frozenset(names)
+
+def loader_options(available, includes):
+    return [available[name] for name in sorted(includes)]
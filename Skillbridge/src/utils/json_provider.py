@@ -0,0 +1,39 @@
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+# JSON provider used by jsonify and the response cache
+#
+# Encodes with orjson when it is installed and with the stdlib json module
+# otherwise. Both produce the same output: sorted keys, compact separators and
+# dates/datetimes as ISO 8601 strings (the format the models' to_dict uses),
+# so serializers can hand over raw column values.
+
+class FastJSONProvider(DefaultJSONProvider):
+    compact = True
+    ensure_ascii = False
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            kwargs.setdefault('separators', (',', ':'))
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode('utf-8')
+
+    def _encode(self, obj):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,318 @@
+import os
+import hmac
+import json
+import time
+import logging
+import tempfile
+import threading
+import ipaddress
+from bisect import bisect_left
+from flask import request, current_app, jsonify
+
+logger = logging.getLogger(__name__)
+
+# Per-request metrics
+#
+# Every request records wall time, time spent in database cursors (engine
+# cursor events), query count, JSON serialization time and response size
+# into per-endpoint histograms. Each thread writes to its own shard, so the
+# request path takes no lock. Every few seconds a worker writes its totals to
+# METRICS_DIR/worker-<pid>.json; /api/metrics sums the files of all live
+# workers on the host, removes those of exited workers and renders the totals
+# in Prometheus text format. Profiles with METRICS_PUBLIC off (production)
+# serve /api/metrics only to localhost unless METRICS_TOKEN is set.
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'skillbridge_metrics'))
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+# Bearer token required by /api/metrics when set
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+# Queries per request above which a warning is logged
+QUERY_BUDGET = int(os.environ.get('QUERY_BUDGET', '20'))
+# X-Query-Count on every response: '1' or '0', unset follows METRICS_PUBLIC
+QUERY_COUNT_HEADER = os.environ.get('QUERY_COUNT_HEADER')
+
+# name -> (help, bucket upper bounds)
+HISTOGRAMS = {
+    'request_duration_seconds': (
+        'Request wall time',
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    ),
+    'db_duration_seconds': (
+        'Time spent executing SQL per request',
+        (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+    ),
+    'db_queries': (
+        'SQL statements executed per request',
+        (0, 1, 2, 5, 10, 20, 50, 100, 250)
+    ),
+    'serialization_duration_seconds': (
+        'Time spent encoding JSON per request',
+        (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+    ),
+    'response_size_bytes': (
+        'Response body size',
+        (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+    )
+}
+
+class RequestStats:
+    __slots__ = ('started', 'db_time', 'queries', 'serialization_time', 'cursor_started')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_time = 0.0
+        self.queries = 0
+        self.serialization_time = 0.0
+        self.cursor_started = None
+
+class Shard:
+    # One thread's counters: histograms[(name, endpoint, method)] = [counts..., sum],
+    # counters[(name, labels)] = value
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, labels, value):
+        series = self.histograms.get((name, labels))
+        if series is None:
+            series = self.histograms[(name, labels)] = [0] * (len(HISTOGRAMS[name][1]) + 2)
+        # Buckets, then +Inf, then the sum
+        series[bisect_left(HISTOGRAMS[name][1], value)] += 1
+        series[-1] += value
+
+    def increment(self, name, labels, amount=1):
+        self.counters[(name, labels)] = self.counters.get((name, labels), 0) + amount
+
+class Registry:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+        self._flushed = 0.0
+
+    def shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def snapshot(self):
+        # JSON-friendly totals of this worker
+        histograms = {}
+        counters = {}
+        for shard in list(self._shards):
+            for (name, labels), series in list(shard.histograms.items()):
+                key = json.dumps([name, labels])
+                total = histograms.setdefault(key, [0] * len(series))
+                for i, value in enumerate(series):
+                    total[i] += value
+            for (name, labels), value in list(shard.counters.items()):
+                key = json.dumps([name, labels])
+                counters[key] = counters.get(key, 0) + value
+        return {'histograms': histograms, 'counters': counters}
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._flushed < METRICS_FLUSH_INTERVAL:
+            return
+        self._flushed = now
+        try:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            path = os.path.join(METRICS_DIR, f'worker-{os.getpid()}.json')
+            with open(path + '.tmp', 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            logger.warning(f'Could not write worker metrics: {str(e)}')
+
+registry = Registry()
+_current = threading.local()
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def collect():
+    # This worker's live totals plus the last flush of every other live worker
+    snapshots = [registry.snapshot()]
+    try:
+        names = os.listdir(METRICS_DIR)
+    except OSError:
+        names = []
+    for name in names:
+        if not (name.startswith('worker-') and name.endswith('.json')):
+            continue
+        try:
+            pid = int(name[len('worker-'):-len('.json')])
+        except ValueError:
+            continue
+        if pid == os.getpid():
+            continue
+        if not _alive(pid):
+            # Left behind by a recycled or crashed worker
+            try:
+                os.remove(os.path.join(METRICS_DIR, name))
+            except OSError:
+                pass
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, name)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+
+    histograms = {}
+    counters = {}
+    for snapshot in snapshots:
+        for key, series in snapshot['histograms'].items():
+            total = histograms.setdefault(key, [0] * len(series))
+            for i, value in enumerate(series):
+                total[i] += value
+        for key, value in snapshot['counters'].items():
+            counters[key] = counters.get(key, 0) + value
+    return histograms, counters
+
+def _labels(pairs):
+    return ','.join(f'{name}="{str(value)}"' for name, value in pairs)
+
+def render_prometheus(histograms, counters):
+    lines = []
+    by_name = {}
+    for key, series in histograms.items():
+        name, labels = json.loads(key)
+        by_name.setdefault(name, []).append((labels, series))
+    for name, (help_text, bounds) in HISTOGRAMS.items():
+        metric = f'skillbridge_{name}'
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} histogram')
+        for labels, series in sorted(by_name.get(name, []), key=lambda item: item[0]):
+            base = list(zip(('endpoint', 'method'), labels))
+            cumulative = 0
+            for bound, count in zip(bounds + ('+Inf',), series[:-1]):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{_labels(base + [("le", bound)])}}} {cumulative}')
+            lines.append(f'{metric}_sum{{{_labels(base)}}} {series[-1]}')
+            lines.append(f'{metric}_count{{{_labels(base)}}} {cumulative}')
+
+    counter_help = {
+        'requests_total': ('Requests served', ('endpoint', 'method', 'status')),
+        'query_budget_exceeded_total': (f'Requests that ran more than QUERY_BUDGET ({QUERY_BUDGET}) queries', ('endpoint', 'method'))
+    }
+    by_name = {}
+    for key, value in counters.items():
+        name, labels = json.loads(key)
+        by_name.setdefault(name, []).append((labels, value))
+    for name, (help_text, label_names) in counter_help.items():
+        metric = f'skillbridge_{name}'
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} counter')
+        for labels, value in sorted(by_name.get(name, [])):
+            lines.append(f'{metric}{{{_labels(zip(label_names, labels))}}} {value}')
+    return '\n'.join(lines) + '\n'
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = getattr(_current, 'stats', None)
+    if stats is not None:
+        stats.cursor_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = getattr(_current, 'stats', None)
+    if stats is not None and stats.cursor_started is not None:
+        stats.db_time += time.perf_counter() - stats.cursor_started
+        stats.queries += 1
+        stats.cursor_started = None
+
+def track_queries():
+    # Engine-wide cursor events; imported here so apps without a database
+    # (the mock API) do not load SQLAlchemy
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+def _timed(encode):
+    def wrapper(*args, **kwargs):
+        stats = getattr(_current, 'stats', None)
+        if stats is None:
+            return encode(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return encode(*args, **kwargs)
+        finally:
+            stats.serialization_time += time.perf_counter() - started
+    return wrapper
+
+def _start_request():
+    _current.stats = RequestStats()
+
+def _finish_request(response):
+    stats = getattr(_current, 'stats', None)
+    if stats is None:
+        return response
+    _current.stats = None
+
+    endpoint = request.endpoint or 'unmatched'
+    labels = (endpoint, request.method)
+    shard = registry.shard()
+    shard.observe('request_duration_seconds', labels, time.perf_counter() - stats.started)
+    shard.observe('db_duration_seconds', labels, stats.db_time)
+    shard.observe('db_queries', labels, stats.queries)
+    shard.observe('serialization_duration_seconds', labels, stats.serialization_time)
+    # Streamed bodies have no length yet
+    if response.content_length is not None:
+        shard.observe('response_size_bytes', labels, response.content_length)
+    shard.increment('requests_total', labels + (response.status_code,))
+
+    if stats.queries > QUERY_BUDGET:
+        shard.increment('query_budget_exceeded_total', labels)
+        logger.warning(
+            f'{request.method} {request.path} ran {stats.queries} queries (budget {QUERY_BUDGET})',
+            extra={'queries': stats.queries, 'db_ms': round(stats.db_time * 1000, 2)}
+        )
+    if _query_count_header():
+        response.headers['X-Query-Count'] = str(stats.queries)
+
+    registry.flush()
+    return response
+
+def _query_count_header():
+    if QUERY_COUNT_HEADER is not None:
+        return QUERY_COUNT_HEADER == '1'
+    return current_app.config.get('METRICS_PUBLIC', True)
+
+def _local(address):
+    try:
+        return ipaddress.ip_address(address or '').is_loopback
+    except ValueError:
+        return False
+
+def metrics_endpoint():
+    if METRICS_TOKEN:
+        authorization = request.headers.get('Authorization', '').encode('utf-8')
+        if not hmac.compare_digest(authorization, f'Bearer {METRICS_TOKEN}'.encode('utf-8')):
+            return jsonify({'error': 'Unauthorized access'}), 401
+    elif not current_app.config.get('METRICS_PUBLIC', True) and not _local(request.remote_addr):
+        return jsonify({'error': 'Metrics are only served to localhost unless METRICS_TOKEN is set'}), 403
+    registry.flush(force=True)
+    body = render_prometheus(*collect())
+    return current_app.response_class(body, mimetype='text/plain; version=0.0.4')
+
+def init_metrics(app, database=True):
+    if not METRICS_ENABLED:
+        return
+    if database:
+        track_queries()
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.json.response = _timed(app.json.response)
+    app.json.dumps = _timed(app.json.dumps)
+    app.add_url_rule('/api/metrics', 'metrics', metrics_endpoint, methods=['GET'])
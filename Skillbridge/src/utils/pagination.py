@@ -0,0 +1,94 @@
+import os
+import json
+import base64
+from flask import request
+from sqlalchemy import and_, or_
+
+# Keyset pagination for collection endpoints
+#
+# Pages are ordered by (sort key, id) and continue strictly after the last row
+# of the previous page, so every page is an index range scan of at most
+# limit + 1 rows no matter how deep the client has paged. Cursors are opaque
+# (base64-encoded JSON of the sort name and the last key) and are only valid
+# for the sort they were issued for.
+
+DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', '100'))
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', '500'))
+
+class InvalidPage(ValueError):
+    pass
+
+# JSON values a sort key may hold; anything else (lists, objects) is unhashable
+# or meaningless as a key
+CURSOR_VALUE_TYPES = (str, int, float, type(None))
+
+def encode_cursor(sort, key):
+    raw = json.dumps({'s': sort, 'k': list(key)}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        data = json.loads(raw)
+        sort, key = data['s'], data['k']
+    except (ValueError, TypeError, KeyError):
+        raise InvalidPage('Invalid cursor')
+    if not isinstance(sort, str) or not isinstance(key, list):
+        raise InvalidPage('Invalid cursor')
+    if any(isinstance(value, bool) or not isinstance(value, CURSOR_VALUE_TYPES) for value in key):
+        raise InvalidPage('Invalid cursor')
+    return sort, tuple(key)
+
+class PageRequest:
+    def __init__(self, sort, column, descending, after, limit):
+        self.sort = sort
+        self.column = column
+        self.descending = descending
+        self.after = after
+        self.limit = limit
+
+    def cache_key(self):
+        return (self.sort, self.after, self.limit)
+
+def page_request(sorts, default_sort='id'):
+    # sorts: sort name -> non-nullable column; "-name" sorts descending
+    sort = request.args.get('sort', default_sort)
+    name = sort[1:] if sort.startswith('-') else sort
+    if name not in sorts:
+        raise InvalidPage(f'Invalid sort: {sort} (available: {", ".join(sorted(sorts))})')
+
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    if limit is None or limit < 1:
+        raise InvalidPage('limit must be a positive integer')
+
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        cursor_sort, after = decode_cursor(cursor)
+        if cursor_sort != sort or len(after) != 2 or not isinstance(after[1], int):
+            raise InvalidPage('Cursor does not match the requested sort')
+
+    return PageRequest(sort, sorts[name], sort.startswith('-'), after, min(limit, MAX_PAGE_SIZE))
+
+def paginate(query, id_column, page):
+    # Returns (rows, next_cursor); next_cursor is None on the last page
+    column = page.column
+    if page.after is not None:
+        value, last_id = page.after
+        if page.descending:
+            query = query.filter(or_(column < value, and_(column == value, id_column < last_id)))
+        else:
+            query = query.filter(or_(column > value, and_(column == value, id_column > last_id)))
+
+    if page.descending:
+        query = query.order_by(column.desc(), id_column.desc())
+    else:
+        query = query.order_by(column, id_column)
+
+    rows = query.limit(page.limit + 1).all()
+    if len(rows) <= page.limit:
+        return rows, None
+
+    rows = rows[:page.limit]
+    last = rows[-1]
+    return rows, encode_cursor(page.sort, (getattr(last, column.key), getattr(last, id_column.key)))
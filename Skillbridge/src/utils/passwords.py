@@ -0,0 +1,131 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Off-thread password hashing
+#
+# Hashing and verification are CPU-bound, so they run in a dedicated, bounded
+# process pool instead of on the request thread. At most HASH_QUEUE_DEPTH jobs
+# may be running or queued; beyond that callers are rejected immediately with
+# PasswordPoolSaturated so a login storm cannot pile up behind the pool. Jobs
+# that outlive HASH_TIMEOUT raise PasswordPoolTimeout; a pool whose process
+# died is replaced and the job retried once. Callers answer any
+# PasswordPoolUnavailable with 503.
+# PASSWORD_HASH_WORKERS=0 hashes inline (useful for tests and scripts).
+
+HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+HASH_QUEUE_DEPTH = int(os.environ.get('PASSWORD_HASH_QUEUE_DEPTH', '32'))
+HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', '10'))
+BULK_CHUNK_SIZE = 64
+
+class PasswordPoolUnavailable(Exception):
+    pass
+
+class PasswordPoolSaturated(PasswordPoolUnavailable):
+    pass
+
+class PasswordPoolTimeout(PasswordPoolUnavailable):
+    pass
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(HASH_QUEUE_DEPTH, 1))
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=HASH_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _executor
+
+def discard_executor(broken):
+    # Drop a pool whose process died (e.g. OOM-killed) so the next job starts a fresh one
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+def _ready():
+    return os.getpid()
+
+def warm_pool():
+    # Spawns every pool process now (they otherwise start on the first login);
+    # runs outside the queue-depth slots and does not wait
+    if HASH_WORKERS <= 0:
+        return []
+    executor = get_executor()
+    return [executor.submit(_ready) for _ in range(HASH_WORKERS)]
+
+def _submit(executor, fn, *args, blocking=False):
+    if not _slots.acquire(blocking=blocking):
+        raise PasswordPoolSaturated('Password hashing pool is saturated')
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+def _run(fn, *args):
+    for attempt in range(2):
+        executor = get_executor()
+        future = None
+        try:
+            future = _submit(executor, fn, *args)
+            return future.result(timeout=HASH_TIMEOUT)
+        except BrokenProcessPool:
+            discard_executor(executor)
+            if attempt:
+                raise PasswordPoolUnavailable('Password hashing pool is unavailable')
+        except FutureTimeoutError:
+            # Frees the slot if the job never left the queue
+            future.cancel()
+            raise PasswordPoolTimeout(f'Password hashing took longer than {HASH_TIMEOUT:g}s')
+
+def hash_password(password):
+    if HASH_WORKERS <= 0:
+        return generate_password_hash(password)
+    return _run(generate_password_hash, password)
+
+def verify_password(password_hash, password):
+    if HASH_WORKERS <= 0:
+        return check_password_hash(password_hash, password)
+    return _run(check_password_hash, password_hash, password)
+
+def _hash_chunk(passwords):
+    return [generate_password_hash(password) for password in passwords]
+
+def hash_passwords_bulk(passwords, chunk_size=BULK_CHUNK_SIZE):
+    # Bulk imports wait for pool capacity instead of being rejected, but keep at
+    # most HASH_WORKERS chunks in flight so interactive logins still get slots
+    passwords = list(passwords)
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    if HASH_WORKERS <= 0:
+        return [password_hash for chunk in chunks for password_hash in _hash_chunk(chunk)]
+
+    executor = get_executor()
+    in_flight = threading.BoundedSemaphore(max(HASH_WORKERS, 1))
+    futures = []
+    try:
+        for chunk in chunks:
+            in_flight.acquire()
+            future = _submit(executor, _hash_chunk, chunk, blocking=True)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+        return [password_hash for future in futures for password_hash in future.result()]
+    except BrokenProcessPool:
+        discard_executor(executor)
+        raise PasswordPoolUnavailable('Password hashing pool is unavailable')
+    finally:
+        # Chunks still queued are not worth hashing once one has failed
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,187 @@
+import os
+import math
+import time
+import random
+import sqlite3
+import logging
+import tempfile
+import threading
+from functools import wraps
+from flask import request, jsonify, g
+
+logger = logging.getLogger(__name__)
+
+# Rate limiting and admission control
+#
+# Token buckets are keyed per client and per route scope and live in a small
+# SQLite file next to the workers, so every gunicorn worker on the host draws
+# from the same buckets. Clients are keyed by request.remote_addr, which
+# ProxyFix rewrites from X-Forwarded-For only for the configured number of
+# trusted proxy hops (TRUSTED_PROXY_HOPS). Independently, each worker counts
+# every in-flight request (init_admission) and sheds heavy (analytics)
+# requests with 429 + Retry-After once its threads are nearly all busy, so
+# cheap endpoints keep answering while heavy ones are hammered.
+
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', '1') == '1'
+RATE_LIMIT_DB = os.environ.get('RATE_LIMIT_DB', os.path.join(tempfile.gettempdir(), 'skillbridge_rate_limit.db'))
+
+# Per-worker admission limit; the in-flight threshold comes from the app
+# config (SHED_HEAVY_AT_IN_FLIGHT, derived from the worker's thread count)
+MAX_HEAVY_IN_FLIGHT = int(os.environ.get('MAX_HEAVY_IN_FLIGHT', '2'))
+
+# scope -> (requests, per seconds); override with RATE_LIMIT_<SCOPE>=requests/seconds
+DEFAULT_LIMITS = {
+    'login': (10, 60),
+    'register': (5, 60),
+    'analytics': (60, 60),
+    'planning': (20, 60)
+}
+
+def parse_limit(value, default):
+    try:
+        requests, seconds = value.split('/')
+        return int(requests), float(seconds)
+    except (AttributeError, ValueError):
+        return default
+
+LIMITS = {
+    scope: parse_limit(os.environ.get(f'RATE_LIMIT_{scope.upper()}'), default)
+    for scope, default in DEFAULT_LIMITS.items()
+}
+
+class BucketStore:
+    def __init__(self, path=RATE_LIMIT_DB):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+            self._local.connection = connection
+        return connection
+
+    def take(self, key, capacity, refill_per_second, cost=1.0):
+        # Returns (allowed, seconds until enough tokens are available)
+        connection = self._connection()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * refill_per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            connection.execute(
+                'INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                (key, tokens, now)
+            )
+            # Occasionally forget buckets that have been idle for an hour
+            if random.random() < 0.001:
+                connection.execute('DELETE FROM buckets WHERE updated < ?', (now - 3600,))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return allowed, 0 if allowed else (cost - tokens) / refill_per_second
+
+bucket_store = BucketStore()
+
+class AdmissionControl:
+    def __init__(self, max_heavy=MAX_HEAVY_IN_FLIGHT, shed_heavy_at=None):
+        self.max_heavy = max_heavy
+        # Heavy requests are shed once more than this many requests (the heavy
+        # one included) are in flight; None never sheds on depth
+        self.shed_heavy_at = shed_heavy_at
+        self.in_flight = 0
+        self.heavy_in_flight = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def enter_heavy(self):
+        with self._lock:
+            deep = self.shed_heavy_at is not None and self.in_flight > self.shed_heavy_at
+            if self.heavy_in_flight >= self.max_heavy or deep:
+                self.shed += 1
+                return False
+            self.heavy_in_flight += 1
+            return True
+
+    def leave_heavy(self):
+        with self._lock:
+            self.heavy_in_flight -= 1
+
+admission = AdmissionControl()
+
+def init_admission(app):
+    # Every request counts towards the worker's depth, not only rate-limited ones
+    admission.shed_heavy_at = app.config['SHED_HEAVY_AT_IN_FLIGHT']
+
+    @app.before_request
+    def count_request():
+        admission.request_started()
+        g.admission_counted = True
+
+    @app.teardown_request
+    def uncount_request(exc):
+        # Runs even when an earlier before_request hook answered the request
+        if g.pop('admission_counted', False):
+            admission.request_finished()
+
+def client_id():
+    # Behind ProxyFix this is the client address reported by the trusted proxy
+    return request.remote_addr or 'unknown'
+
+def too_many_requests(retry_after):
+    response = jsonify({'error': 'Too many requests', 'retry_after': retry_after})
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 429
+
+def rate_limited(scope, heavy=False):
+    requests, seconds = LIMITS[scope]
+    refill = requests / seconds
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            # CORS preflights never draw from the bucket
+            if not RATE_LIMIT_ENABLED or request.method == 'OPTIONS':
+                return f(*args, **kwargs)
+
+            # Shared token bucket per client and route
+            try:
+                allowed, wait = bucket_store.take(f'{scope}:{request.endpoint}:{client_id()}', requests, refill)
+            except sqlite3.Error as e:
+                # Fail open: the limiter must not take the API down
+                logger.warning(f'Rate limit store unavailable: {str(e)}')
+                allowed, wait = True, 0
+            if not allowed:
+                return too_many_requests(max(1, math.ceil(wait)))
+
+            # Per-worker admission control
+            if not heavy:
+                return f(*args, **kwargs)
+            if not admission.enter_heavy():
+                return too_many_requests(1)
+            try:
+                return f(*args, **kwargs)
+            finally:
+                admission.leave_heavy()
+
+        return decorated
+    return decorator
@@ -0,0 +1,98 @@
+import threading
+from flask import request
+from src.models.user import db, User, Company
+from src.models.skill import Skill, Project
+
+# Column-based serializers for list endpoints
+#
+# A serializer names the columns a model's to_dict returns, in the same order
+# and under the same keys. List endpoints select exactly those columns as
+# plain tuples (no ORM instances, no per-row to_dict) and turn each row into a
+# dict with one zip; dates are left to the JSON provider. The labelled select
+# list is built once per field set. ?fields= limits a response to some of
+# the columns.
+
+class InvalidFields(ValueError):
+    pass
+
+class ModelSerializer:
+    def __init__(self, model, columns):
+        self.model = model
+        # Output key -> column expression, in to_dict order
+        self.columns = columns
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def parse_fields(self):
+        # ?fields=id,name -> requested keys in canonical order
+        raw = request.args.get('fields')
+        if not raw:
+            return tuple(self.columns)
+
+        names = {name.strip() for name in raw.split(',') if name.strip()}
+        unknown = sorted(names - set(self.columns))
+        if unknown:
+            raise InvalidFields(f'Unknown fields: {", ".join(unknown)} (available: {", ".join(self.columns)})')
+        return tuple(name for name in self.columns if name in names)
+
+    def _compile(self, fields, keys):
+        # Keys needed for paging are selected after the requested fields;
+        # zip() stops at the shorter sequence, so they never reach the output
+        selected = list(fields) + [key for key in keys if key not in fields]
+        return [self.columns[name].label(name) for name in selected]
+
+    def query(self, fields, keys=('id',)):
+        compiled = self._compiled.get((fields, keys))
+        if compiled is None:
+            compiled = self._compile(fields, keys)
+            with self._lock:
+                self._compiled[(fields, keys)] = compiled
+
+        return db.session.query(*compiled).select_from(self.model)
+
+    @staticmethod
+    def serialize(rows, fields):
+        return [dict(zip(fields, row)) for row in rows]
+
+skill_serializer = ModelSerializer(Skill, {
+    'id': Skill.id,
+    'name': Skill.name,
+    'category': Skill.category,
+    'description': Skill.description,
+    'created_at': Skill.created_at
+})
+
+project_serializer = ModelSerializer(Project, {
+    'id': Project.id,
+    'name': Project.name,
+    'description': Project.description,
+    'start_date': Project.start_date,
+    'end_date': Project.end_date,
+    'status': Project.status,
+    'company_id': Project.company_id,
+    'created_at': Project.created_at,
+    'updated_at': Project.updated_at,
+    'member_count': Project.member_count
+})
+
+company_serializer = ModelSerializer(Company, {
+    'id': Company.id,
+    'name': Company.name,
+    'industry': Company.industry,
+    'size': Company.size,
+    'created_at': Company.created_at,
+    'employee_count': Company.employee_count
+})
+
+user_serializer = ModelSerializer(User, {
+    'id': User.id,
+    'username': User.username,
+    'email': User.email,
+    'first_name': User.first_name,
+    'last_name': User.last_name,
+    'role': User.role,
+    'company_id': User.company_id,
+    'created_at': User.created_at,
+    'last_login': User.last_login,
+    'is_active': User.is_active
+})
@@ -0,0 +1,209 @@
+import os
+import re
+import sys
+import json
+import time
+import queue
+import atexit
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import has_request_context, request
+
+# Structured logging off the request path
+#
+# Request threads only build the record, pick up the request context and put
+# it on a bounded queue (dropping when it is full). A QueueListener thread
+# redacts credentials, formats one JSON object per line and writes it through
+# a handler capped at LOG_MAX_BYTES_PER_SECOND. Records below WARNING logged
+# inside a request are sampled per endpoint.
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+LOG_MAX_BYTES_PER_SECOND = int(os.environ.get('LOG_MAX_BYTES_PER_SECOND', str(1024 * 1024)))
+
+# endpoint -> share of its sub-WARNING records that are kept;
+# override with LOG_SAMPLE_RATES=endpoint=rate,endpoint=rate
+DEFAULT_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', '1.0'))
+DEFAULT_SAMPLE_RATES = {
+    'status.index': 0.01,
+    'status.health_check': 0.01
+}
+
+def parse_sample_rates(value, defaults):
+    rates = dict(defaults)
+    for item in (value or '').split(','):
+        endpoint, _, rate = item.partition('=')
+        try:
+            rates[endpoint.strip()] = float(rate)
+        except ValueError:
+            continue
+    return rates
+
+SAMPLE_RATES = parse_sample_rates(os.environ.get('LOG_SAMPLE_RATES'), DEFAULT_SAMPLE_RATES)
+
+# Keys whose values never reach the log, in extras and in messages
+SENSITIVE_KEYS = ('authorization', 'password', 'password_hash', 'token', 'secret', 'cookie', 'api_key')
+REDACTED = '[REDACTED]'
+REDACTIONS = [
+    (re.compile(r'(?i)\b(bearer|basic)\s+[A-Za-z0-9._~+/=-]+'), r'\1 ' + REDACTED),
+    # Bare JWTs
+    (re.compile(r'\beyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]*'), REDACTED),
+    # key=value, key: value and 'key': 'value' pairs
+    (re.compile(
+        r'(?i)([\'"]?\b(?:' + '|'.join(SENSITIVE_KEYS) + r')\b[\'"]?\s*[:=]\s*)(?:\'[^\']*\'|"[^"]*"|[^\s,;}]+)'
+    ), r'\1' + REDACTED)
+]
+
+# LogRecord attributes that are not extras
+RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+def redact(text):
+    for pattern, replacement in REDACTIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+class SamplingFilter(logging.Filter):
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not has_request_context():
+            return True
+        rate = SAMPLE_RATES.get(request.endpoint, DEFAULT_SAMPLE_RATE)
+        return rate >= 1.0 or random.random() < rate
+
+class RequestQueueHandler(QueueHandler):
+    # Runs on the request thread: keep it to attribute copies
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        if has_request_context():
+            record.method = request.method
+            record.path = request.path
+            record.endpoint = request.endpoint
+            record.remote_addr = request.remote_addr
+        # Arguments are merged and tracebacks rendered here, since neither
+        # can be shipped to another thread as is
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': redact(record.msg if isinstance(record.msg, str) else str(record.msg))
+        }
+        for key, value in vars(record).items():
+            if key in RESERVED_ATTRS:
+                continue
+            if key.lower() in SENSITIVE_KEYS:
+                value = REDACTED
+            elif isinstance(value, str):
+                value = redact(value)
+            entry[key] = value
+        if record.exc_text:
+            entry['exc'] = redact(record.exc_text)
+        return json.dumps(entry, default=str)
+
+class CappedStreamHandler(logging.StreamHandler):
+    # Runs on the listener thread; drops records beyond the byte budget and
+    # reports how many once there is room again
+
+    def __init__(self, stream=None, max_bytes_per_second=LOG_MAX_BYTES_PER_SECOND):
+        super().__init__(stream)
+        self.max_bytes_per_second = max_bytes_per_second
+        self._budget = float(max_bytes_per_second)
+        self._updated = time.monotonic()
+        self.dropped = 0
+
+    def _take(self, size):
+        now = time.monotonic()
+        self._budget = min(self.max_bytes_per_second, self._budget + (now - self._updated) * self.max_bytes_per_second)
+        self._updated = now
+        if size > self._budget:
+            return False
+        self._budget -= size
+        return True
+
+    def emit(self, record):
+        try:
+            line = self.format(record) + self.terminator
+            if not self._take(len(line)):
+                self.dropped += 1
+                return
+            if self.dropped:
+                notice = json.dumps({'level': 'WARNING', 'logger': __name__, 'msg': f'Dropped {self.dropped} log records over the byte cap'})
+                self.dropped = 0
+                line = notice + self.terminator + line
+            self.stream.write(line)
+            self.flush()
+        except Exception:
+            self.handleError(record)
+
+_listener = None
+_lock = threading.Lock()
+
+def configure_logging(level=LOG_LEVEL, stream=None):
+    # Idempotent; replaces any handlers on the root logger
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        output = CappedStreamHandler(stream or sys.stderr)
+        output.setFormatter(JSONFormatter())
+
+        log_queue = queue.Queue(LOG_QUEUE_SIZE)
+        handler = RequestQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter())
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(level)
+
+        _listener = QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+def shutdown_logging():
+    # Flushes what is queued; safe to call more than once
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+def _restart_after_fork():
+    # The listener thread does not survive fork (gunicorn's preload_app): give
+    # the child its own queue and listener writing to the same output
+    global _listener, _lock
+    _lock = threading.Lock()
+    if _listener is None:
+        return
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, RequestQueueHandler):
+            handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,122 @@
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Settings read at import time; the suite runs without rate limits, hashes
+# passwords inline and keeps its limiter state out of the shared file
+os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+os.environ.setdefault('RATE_LIMIT_DB', os.path.join(tempfile.mkdtemp(), 'rate_limit.db'))
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.mkdtemp(), 'metrics'))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt
+import pytest
+from sqlalchemy import event
+from src.app import create_app
+from src.config import TestingConfig
+from src.models.user import db, User, Company
+from src.models.skill import Skill, UserSkill, Project, ProjectMember, ProjectSkill
+from src.services import simulation
+from src.services.staffing import skill_index
+from src.services.user_store import user_store
+from src.utils.auth import SECRET_KEY, token_cache
+from src.utils.cache import response_cache
+
+def clear_caches():
+    # Process-wide caches outlive a test's database
+    response_cache.clear()
+    token_cache.clear()
+    user_store.invalidate()
+    skill_index.invalidate()
+    with simulation._snapshots_lock:
+        simulation._snapshots.clear()
+
+@pytest.fixture
+def app(tmp_path):
+    clear_caches()
+    app = create_app(TestingConfig, SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "test.db"}')
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+    clear_caches()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def make_token(user_id=1, role='admin'):
+    return jwt.encode({
+        'user_id': user_id,
+        'username': f'user{user_id}',
+        'role': role,
+        'exp': datetime.utcnow() + timedelta(hours=1)
+    }, SECRET_KEY, algorithm='HS256')
+
+@pytest.fixture
+def auth_headers():
+    def headers(user_id=1, role='admin'):
+        return {'Authorization': f'Bearer {make_token(user_id, role)}'}
+    return headers
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._count)
+
+@pytest.fixture
+def count_queries(app):
+    return lambda: QueryCounter(db.engine)
+
+def add_company(name='Company'):
+    company = Company(name=name)
+    db.session.add(company)
+    db.session.flush()
+    return company
+
+def add_users(company, count, prefix='user'):
+    start = db.session.query(User).count()
+    users = [
+        User(username=f'{prefix}{start + i}', email=f'{prefix}{start + i}@example.com', password_hash='x', company_id=company.id)
+        for i in range(count)
+    ]
+    db.session.add_all(users)
+    db.session.flush()
+    return users
+
+def add_skills(count):
+    start = db.session.query(Skill).count()
+    skills = [Skill(name=f'Skill {start + i}', category='Programming') for i in range(count)]
+    db.session.add_all(skills)
+    db.session.flush()
+    return skills
+
+def add_project(company, members=(), skills=(), name=None):
+    project = Project(name=name or f'Project {db.session.query(Project).count() + 1}', company_id=company.id)
+    db.session.add(project)
+    db.session.flush()
+    for user in members:
+        db.session.add(ProjectMember(project_id=project.id, user_id=user.id, allocation_percentage=50))
+    for importance, skill in enumerate(skills, start=1):
+        db.session.add(ProjectSkill(project_id=project.id, skill_id=skill.id, importance_level=importance % 5 + 1))
+    db.session.flush()
+    return project
+
+def give_skills(user, skills, proficiency=3):
+    for skill in skills:
+        db.session.add(UserSkill(user_id=user.id, skill_id=skill.id, proficiency_level=proficiency))
+    db.session.flush()
@@ -0,0 +1,107 @@
+import threading
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from src.models.user import db
+from src.models.skill import Skill, ProjectSkill
+from src.services import assignment
+from conftest import add_company, add_users, add_skills, add_project, give_skills
+
+@pytest.fixture
+def project(app):
+    company = add_company()
+    skills = add_skills(3)
+    users = add_users(company, 4)
+    for user in users[1:]:
+        give_skills(user, skills, proficiency=4)
+    project = add_project(company, users[:1], skills)
+    db.session.commit()
+    return project
+
+@pytest.fixture(autouse=True)
+def shutdown_pool():
+    yield
+    if assignment._executor is not None:
+        assignment._executor.shutdown(cancel_futures=True)
+        assignment._executor = None
+
+@pytest.mark.parametrize('field, value', [
+    ('time_budget', 'abc'),
+    ('time_budget', True),
+    ('time_budget', 0),
+    ('time_budget', assignment.MAX_TIME_BUDGET + 1),
+    ('max_new_members', -1),
+    ('max_new_members', '3'),
+    ('max_new_members', assignment.MAX_NEW_MEMBERS + 1),
+    ('candidate_user_ids', '2,3'),
+    ('candidate_user_ids', [2, 'x']),
+    ('seed', 'x'),
+    ('seed', 1.5),
+    ('project_ids', ['1']),
+    ('allocation_percentage', 101)
+])
+def test_optimize_rejects_invalid_fields(client, auth_headers, project, field, value):
+    body = {'project_ids': [project.id], field: value}
+    response = client.post('/api/skill/projects/assignments/optimize', json=body, headers=auth_headers())
+    assert response.status_code == 400
+    assert field in response.get_json()['error']
+
+def test_optimize_proposes_assignments(client, auth_headers, project):
+    body = {'project_ids': [project.id], 'candidate_user_ids': [2, 3, 4], 'max_new_members': 2, 'time_budget': 0.1, 'seed': 7}
+    response = client.post('/api/skill/projects/assignments/optimize', json=body, headers=auth_headers())
+    assert response.status_code == 200
+    assert 0 < len(response.get_json()['assignments']) <= 2
+
+def test_load_cost_does_not_grow_with_projects(app, project, count_queries):
+    company = add_company('Other')
+    skills = add_skills(2)
+    members = add_users(company, 2, prefix='member')
+    more = [add_project(company, members, skills, name=f'Project {i}').id for i in range(3)]
+    db.session.commit()
+    project_id = project.id
+
+    with count_queries() as one:
+        assignment.load_assignment_problem([project_id])
+    with count_queries() as many:
+        problem = assignment.load_assignment_problem([project_id] + more)
+    assert many.count == one.count
+    assert [p['member_count'] for p in problem['projects']] == [1, 2, 2, 2]
+
+def test_explicit_candidates_are_narrowed_to_active_company_employees(app, project):
+    users = add_users(project.company, 2, prefix='extra')
+    users[0].is_active = False
+    outsider = add_users(add_company('Other'), 1, prefix='outsider')[0]
+    skills = [skill for skill, _ in db.session.query(Skill, ProjectSkill).filter(ProjectSkill.skill_id == Skill.id)]
+    for user in users + [outsider]:
+        give_skills(user, skills, proficiency=4)
+    db.session.commit()
+
+    problem = assignment.load_assignment_problem([project.id], candidate_user_ids=[2, users[0].id, outsider.id, users[1].id, 404])
+    assert [candidate['id'] for candidate in problem['candidates']] == [2, users[1].id]
+
+class BrokenExecutor:
+    def submit(self, *args):
+        raise BrokenProcessPool('worker died')
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+def test_broken_pool_is_replaced(project):
+    problem = assignment.load_assignment_problem([project.id])
+    broken = BrokenExecutor()
+    assignment._executor = broken
+    result = assignment.optimize_assignments(problem, 0.05)
+    assert result['total_gap_after'] <= result['total_gap_before']
+    assert assignment._executor is not None and assignment._executor is not broken
+
+def test_concurrent_callers_share_one_pool():
+    barrier = threading.Barrier(8)
+    executors = []
+    def get():
+        barrier.wait()
+        executors.append(assignment.get_executor())
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(executor) for executor in executors}) == 1
@@ -0,0 +1,48 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import update
+from src.models.user import db
+from src.models.version import TableVersion
+from conftest import add_skills
+
+# Last change half-way through a second
+CHANGED_AT = datetime(2026, 3, 2, 12, 0, 0, 500000)
+
+def http_date(value):
+    return value.strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+@pytest.fixture
+def etag(app, client, auth_headers):
+    add_skills(2)
+    db.session.commit()
+    db.session.execute(update(TableVersion).where(TableVersion.name == 'skills').values(updated_at=CHANGED_AT))
+    db.session.commit()
+    response = client.get('/api/skill/skills', headers=auth_headers())
+    assert response.status_code == 200
+    assert response.headers['Last-Modified'] == http_date(CHANGED_AT)
+    return response.headers['ETag']
+
+def get(client, auth_headers, **headers):
+    return client.get('/api/skill/skills', headers={**auth_headers(), **headers})
+
+def test_matching_etag_is_not_modified(client, auth_headers, etag):
+    assert get(client, auth_headers, **{'If-None-Match': etag}).status_code == 304
+
+def test_if_none_match_takes_precedence(client, auth_headers, etag):
+    later = http_date(datetime(2030, 1, 1))
+    earlier = http_date(datetime(2020, 1, 1))
+    # A stale ETag is not rescued by a recent If-Modified-Since...
+    response = get(client, auth_headers, **{'If-None-Match': '"stale"', 'If-Modified-Since': later})
+    assert response.status_code == 200
+    # ...and a current one is not undone by an old date
+    response = get(client, auth_headers, **{'If-None-Match': etag, 'If-Modified-Since': earlier})
+    assert response.status_code == 304
+
+def test_if_modified_since_echoing_last_modified_is_not_modified(client, auth_headers, etag):
+    # The client sends back the truncated second it was given
+    response = get(client, auth_headers, **{'If-Modified-Since': http_date(CHANGED_AT)})
+    assert response.status_code == 304
+
+def test_if_modified_since_before_the_change_is_modified(client, auth_headers, etag):
+    response = get(client, auth_headers, **{'If-Modified-Since': http_date(CHANGED_AT.replace(second=59, minute=59, hour=11))})
+    assert response.status_code == 200
@@ -0,0 +1,10 @@
+from src.app import create_app
+from src.config import ProductionConfig
+
+def test_production_serves_the_mock_api_by_default(monkeypatch):
+    monkeypatch.setenv('SECRET_KEY', 'production-test')
+    assert ProductionConfig.MOCK_API is True
+    # Structured logging would take over the root logger for the whole session
+    app = create_app('production', STRUCTURED_LOGGING=False)
+    assert 'mock' in app.blueprints
+    assert 'auth' not in app.blueprints
@@ -0,0 +1,74 @@
+import csv
+import io
+import pytest
+from sqlalchemy import func, select
+from src.models.user import db
+from src.models.skill import UserSkill
+from src.services import bulk_import
+from conftest import add_company, add_users, add_skills, give_skills
+
+@pytest.fixture
+def people(app):
+    company = add_company()
+    users = add_users(company, 3)
+    skills = add_skills(3)
+    db.session.commit()
+    return users, skills
+
+def user_skill_count():
+    return db.session.scalar(select(func.count()).select_from(UserSkill))
+
+def csv_body(rows, bad_at=None):
+    lines = ['user_id,skill_id,proficiency_level']
+    for i, (user_id, skill_id) in enumerate(rows):
+        if i == bad_at:
+            # Longer than csv.field_size_limit(), so the reader raises csv.Error
+            lines.append(f'{user_id},{skill_id},"{"x" * (csv.field_size_limit() + 1)}"')
+        else:
+            lines.append(f'{user_id},{skill_id},3')
+    return '\n'.join(lines) + '\n'
+
+def test_unreadable_csv_reports_the_rows_already_committed(client, auth_headers, people):
+    users, skills = people
+    pairs = [(user.id, skill.id) for user in users for skill in skills[:2]]
+    response = client.post('/api/imports/user-skills', data=csv_body(pairs, bad_at=3), content_type='text/csv', headers=auth_headers())
+
+    assert response.status_code == 207
+    report = response.get_json()
+    assert report['imported'] == 3
+    assert report['aborted']['index'] == 3
+    assert 'Invalid CSV' in report['aborted']['error']
+    assert user_skill_count() == 3
+
+def test_unreadable_csv_before_any_row_is_a_bad_request(client, auth_headers, people):
+    users, skills = people
+    response = client.post('/api/imports/user-skills', data=csv_body([(users[0].id, skills[0].id)], bad_at=0), content_type='text/csv', headers=auth_headers())
+    assert response.status_code == 400
+    assert response.get_json()['aborted']['index'] == 0
+    assert user_skill_count() == 0
+
+def test_earlier_chunks_stay_committed(app, people):
+    users, skills = people
+    pairs = [(user.id, skill.id) for user in users for skill in skills[:2]]
+    rows = csv.DictReader(io.StringIO(csv_body(pairs, bad_at=5)))
+    report = bulk_import.run_import('user-skills', rows, chunk_size=2)
+    assert report.imported == 5
+    assert report.aborted['index'] == 5
+    assert user_skill_count() == 5
+
+def test_rows_ignored_by_the_insert_are_listed(client, auth_headers, people, monkeypatch):
+    users, skills = people
+    # Another request added this pair after the existence check ran
+    give_skills(users[1], skills[:1])
+    db.session.commit()
+    monkeypatch.setattr(bulk_import, '_existing_keys', lambda connection, spec, rows: set())
+
+    body = [{'user_id': user.id, 'skill_id': skills[0].id} for user in users]
+    response = client.post('/api/imports/user-skills', json=body, headers=auth_headers())
+
+    assert response.status_code == 201
+    report = response.get_json()
+    assert report['imported'] == 2
+    assert report['skipped'] == 1
+    assert report['skipped_rows'] == [1]
+    assert 'aborted' not in report
@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from src.app import create_app
+from src.config import TestingConfig
+from src.models.user import db
+from src.utils import metrics
+from conftest import clear_caches
+
+def write_snapshot(name, requests):
+    os.makedirs(metrics.METRICS_DIR, exist_ok=True)
+    key = json.dumps(['requests_total', ['status.health', 'GET', 200]])
+    with open(os.path.join(metrics.METRICS_DIR, name), 'w') as f:
+        json.dump({'histograms': {}, 'counters': {key: requests}}, f)
+    return os.path.join(metrics.METRICS_DIR, name)
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_DIR', str(tmp_path / 'metrics'))
+    monkeypatch.setattr(metrics, 'registry', metrics.Registry())
+
+def test_collect_skips_unparseable_names_and_removes_exited_workers(metrics_dir):
+    odd = write_snapshot('worker-x.json', 1)
+    live = write_snapshot(f'worker-{os.getppid()}.json', 2)
+    dead = write_snapshot(f'worker-{exited_pid()}.json', 4)
+
+    histograms, counters = metrics.collect()
+
+    assert sum(counters.values()) == 2
+    assert os.path.exists(odd)
+    assert os.path.exists(live)
+    assert not os.path.exists(dead)
+
+@pytest.fixture
+def make_client(tmp_path, metrics_dir):
+    apps = []
+
+    def make(**overrides):
+        clear_caches()
+        app = create_app(TestingConfig, SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "test.db"}', METRICS=True, **overrides)
+        apps.append(app)
+        return app.test_client()
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.engine.dispose()
+    clear_caches()
+
+def scrape(client, address, **headers):
+    return client.get('/api/metrics', headers=headers, environ_base={'REMOTE_ADDR': address})
+
+def test_metrics_are_local_only_without_a_token(make_client, monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_TOKEN', None)
+    client = make_client(METRICS_PUBLIC=False)
+    assert scrape(client, '203.0.113.5').status_code == 403
+    assert scrape(client, '127.0.0.1').status_code == 200
+
+def test_metrics_token_is_required_when_set(make_client, monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_TOKEN', 'scrape')
+    client = make_client(METRICS_PUBLIC=False)
+    assert scrape(client, '127.0.0.1').status_code == 401
+    response = scrape(client, '203.0.113.5', Authorization='Bearer scrape')
+    assert response.status_code == 200
+    assert 'skillbridge_requests_total' in response.get_data(as_text=True)
+
+def test_metrics_are_public_in_development(make_client, monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_TOKEN', None)
+    assert scrape(make_client(), '203.0.113.5').status_code == 200
+
+def test_metrics_token_mismatch_is_unauthorized(make_client, monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_TOKEN', 'scrape')
+    client = make_client(METRICS_PUBLIC=False)
+    assert scrape(client, '127.0.0.1', Authorization='Bearer scrap').status_code == 401
+    assert scrape(client, '127.0.0.1', Authorization='Bearer scrapé').status_code == 401
+
+@pytest.mark.parametrize('public', [True, False])
+def test_query_count_header_follows_metrics_public(make_client, monkeypatch, public):
+    monkeypatch.setattr(metrics, 'QUERY_COUNT_HEADER', None)
+    response = make_client(METRICS_PUBLIC=public).get('/api/health')
+    assert ('X-Query-Count' in response.headers) is public
+
+def test_query_count_header_can_be_forced_on(make_client, monkeypatch):
+    monkeypatch.setattr(metrics, 'QUERY_COUNT_HEADER', '1')
+    assert 'X-Query-Count' in make_client(METRICS_PUBLIC=False).get('/api/health').headers
@@ -0,0 +1,101 @@
+import re
+import pytest
+from sqlalchemy import func, select, text
+from src.app import create_app
+from src.config import TestingConfig
+from src.models.user import db
+from src.models.skill import UserSkill, ProjectMember, ProjectSkill
+from src.migrations import MIGRATIONS, UNIQUE_ASSOCIATIONS, current_version, explain_query_plans, upgrade
+from conftest import add_company, add_users, add_skills, add_project, clear_caches
+
+# query name -> (table, index) searches its plan must contain
+EXPECTED_INDEXES = {
+    'skills page by name': [('skills', 'ix_skills_name')],
+    'projects page by name': [('projects', 'ix_projects_name')],
+    'companies page by name': [('companies', 'ix_companies_name')],
+    'user skills': [('user_skills', 'uq_user_skills_user_id_skill_id')],
+    'user skill lookup': [('user_skills', 'uq_user_skills_user_id_skill_id')],
+    'project skills': [('project_skills', 'uq_project_skills_project_id_skill_id')],
+    'project members': [('project_members', 'uq_project_members_project_id_user_id')],
+    'user projects': [('project_members', 'ix_project_members_user_id')],
+    'company projects': [('projects', 'ix_projects_company_id')],
+    'company employees': [('users', 'ix_users_company_id')],
+    'skill gap (aggregate)': [
+        ('project_members', 'uq_project_members_project_id_user_id'),
+        ('user_skills', 'uq_user_skills_user_id_skill_id'),
+        ('project_skills', 'uq_project_skills_project_id_skill_id')
+    ],
+    'skill gap (materialized)': [('project_skills', 'uq_project_skills_project_id_skill_id')],
+    'skill gap refresh': [
+        ('project_skills', 'uq_project_skills_project_id_skill_id'),
+        ('project_members', 'uq_project_members_project_id_user_id'),
+        ('user_skills', 'uq_user_skills_user_id_skill_id')
+    ],
+    'skill gap refresh (pairs)': [
+        ('project_skills', 'uq_project_skills_project_id_skill_id'),
+        ('user_skills', 'uq_user_skills_user_id_skill_id')
+    ],
+    'skill gap affected pairs': [
+        ('project_members', 'ix_project_members_user_id'),
+        ('project_skills', 'uq_project_skills_project_id_skill_id')
+    ]
+}
+
+@pytest.fixture
+def plans(app):
+    return {name: (plan, problems) for name, plan, problems in explain_query_plans()}
+
+@pytest.mark.parametrize('name', sorted(EXPECTED_INDEXES))
+def test_hot_query_uses_index(plans, name):
+    plan, problems = plans[name]
+    assert problems == []
+    for table, index in EXPECTED_INDEXES[name]:
+        pattern = re.compile(rf'^SEARCH {table} USING (COVERING )?INDEX {index} ')
+        assert any(pattern.match(line) for line in plan), f'{name} does not search {table} with {index}: {plan}'
+
+@pytest.fixture
+def legacy_app(tmp_path):
+    # A database created before migration 3: no unique association indexes
+    clear_caches()
+    app = create_app(TestingConfig, SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "legacy.db"}', MIGRATE_ON_START=False)
+    with app.app_context():
+        upgrade(target=2)
+        with db.engine.begin() as connection:
+            for _, _, index_name in UNIQUE_ASSOCIATIONS:
+                connection.execute(text(f'DROP INDEX {index_name}'))
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+    clear_caches()
+
+def index_names(table):
+    with db.engine.connect() as connection:
+        return {row[1] for row in connection.execute(text(f'PRAGMA index_list({table})'))}
+
+def test_migration_3_removes_duplicates_before_adding_unique_indexes(legacy_app):
+    company = add_company()
+    user, = add_users(company, 1)
+    skill, = add_skills(1)
+    project = add_project(company)
+    db.session.add_all([
+        UserSkill(user_id=user.id, skill_id=skill.id, proficiency_level=2),
+        UserSkill(user_id=user.id, skill_id=skill.id, proficiency_level=5),
+        ProjectMember(project_id=project.id, user_id=user.id, allocation_percentage=50),
+        ProjectMember(project_id=project.id, user_id=user.id, allocation_percentage=20),
+        ProjectSkill(project_id=project.id, skill_id=skill.id, importance_level=3),
+        ProjectSkill(project_id=project.id, skill_id=skill.id, importance_level=1)
+    ])
+    db.session.commit()
+    assert current_version() == 2
+
+    applied = upgrade()
+    assert [number for number, _ in applied] == [number for number, _, _ in MIGRATIONS if number > 2]
+    assert current_version() == MIGRATIONS[-1][0]
+
+    for model, _, index_name in UNIQUE_ASSOCIATIONS:
+        assert db.session.scalar(select(func.count()).select_from(model)) == 1
+        assert index_name in index_names(model.__tablename__)
+    # The oldest row of each pair is the one kept
+    assert db.session.scalar(select(UserSkill.proficiency_level)) == 2
+    assert db.session.scalar(select(ProjectMember.allocation_percentage)) == 50
+    assert db.session.scalar(select(ProjectSkill.importance_level)) == 3
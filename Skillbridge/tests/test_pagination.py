@@ -0,0 +1,46 @@
+import base64
+import json
+import pytest
+from src.models.user import db
+from src.utils.pagination import encode_cursor
+from conftest import add_company, add_skills, add_project
+
+def raw_cursor(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode('utf-8')).decode('ascii').rstrip('=')
+
+@pytest.fixture
+def catalog(app):
+    company = add_company()
+    add_skills(5)
+    for _ in range(5):
+        add_project(company)
+    db.session.commit()
+
+@pytest.mark.parametrize('cursor', [
+    'eyJzIjoiaWQiLCJrIjpbe30sMV19',
+    raw_cursor({'s': 'id', 'k': [[1], 1]}),
+    raw_cursor({'s': 'id', 'k': [1, {}]}),
+    raw_cursor({'s': 'id', 'k': [1, 'x']}),
+    raw_cursor({'s': 'id', 'k': [1, True]}),
+    raw_cursor({'s': 'id', 'k': [1, 2, 3]}),
+    raw_cursor({'s': 'id', 'k': 'ab'}),
+    raw_cursor({'s': ['id'], 'k': [1, 1]}),
+    raw_cursor([1, 2]),
+    'not base64!'
+])
+@pytest.mark.parametrize('path', ['/api/skill/skills', '/api/skill/projects', '/api/users'])
+def test_malformed_cursor_is_rejected(client, auth_headers, catalog, path, cursor):
+    response = client.get(path, query_string={'cursor': cursor}, headers=auth_headers())
+    assert response.status_code == 400
+    assert 'cursor' in response.get_json()['error'].lower()
+
+def test_cursor_pages_through_the_catalog(client, auth_headers, catalog):
+    response = client.get('/api/skill/skills', query_string={'sort': 'name', 'limit': 3}, headers=auth_headers())
+    assert response.status_code == 200
+    cursor = response.get_json()['next_cursor']
+    assert cursor == encode_cursor('name', ('Skill 2', 3))
+
+    response = client.get('/api/skill/skills', query_string={'sort': 'name', 'limit': 3, 'cursor': cursor}, headers=auth_headers())
+    assert response.status_code == 200
+    assert [skill['name'] for skill in response.get_json()['skills']] == ['Skill 3', 'Skill 4']
+    assert response.get_json()['next_cursor'] is None
@@ -0,0 +1,83 @@
+import pytest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+from src.models.user import db, User
+from src.utils import passwords
+from conftest import add_company
+
+class InlineExecutor:
+    # Stands in for the process pool: runs jobs on the calling thread
+    def __init__(self, max_workers=None, mp_context=None):
+        pass
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+class BrokenExecutor(InlineExecutor):
+    def submit(self, fn, *args):
+        raise BrokenProcessPool('worker died')
+
+class StuckExecutor(InlineExecutor):
+    # Accepts jobs but never runs them; fails once `broken_after` jobs are queued
+    def __init__(self, broken_after=None):
+        self.broken_after = broken_after
+        self.futures = []
+
+    def submit(self, fn, *args):
+        if self.broken_after is not None and len(self.futures) >= self.broken_after:
+            raise BrokenProcessPool('worker died')
+        future = Future()
+        self.futures.append(future)
+        return future
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(passwords, 'HASH_WORKERS', 4)
+    monkeypatch.setattr(passwords, 'ProcessPoolExecutor', InlineExecutor)
+    monkeypatch.setattr(passwords, '_executor', None)
+    yield
+    passwords._executor = None
+
+def test_broken_pool_is_replaced(pool):
+    broken = BrokenExecutor()
+    passwords._executor = broken
+    password_hash = passwords.hash_password('secret')
+    assert check_password_hash(password_hash, 'secret')
+    assert isinstance(passwords._executor, InlineExecutor)
+    assert passwords._executor is not broken
+
+def test_pool_that_stays_broken_is_unavailable(pool, monkeypatch):
+    monkeypatch.setattr(passwords, 'ProcessPoolExecutor', BrokenExecutor)
+    passwords._executor = BrokenExecutor()
+    with pytest.raises(passwords.PasswordPoolUnavailable):
+        passwords.verify_password(generate_password_hash('secret'), 'secret')
+    assert passwords._executor is None
+
+def test_login_times_out_with_503(app, client, pool, monkeypatch):
+    company = add_company()
+    db.session.add(User(username='alice', email='alice@example.com', password_hash=generate_password_hash('secret'), company_id=company.id))
+    db.session.commit()
+    monkeypatch.setattr(passwords, 'HASH_TIMEOUT', 0.01)
+    stuck = StuckExecutor()
+    passwords._executor = stuck
+
+    response = client.post('/api/auth/login', json={'username': 'alice', 'password': 'secret'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    # The queued job was cancelled, so its slot is free again
+    assert stuck.futures[0].cancelled()
+
+def test_bulk_cancels_submitted_chunks_on_failure(pool):
+    stuck = StuckExecutor(broken_after=2)
+    passwords._executor = stuck
+    with pytest.raises(passwords.PasswordPoolUnavailable):
+        passwords.hash_passwords_bulk(['secret'] * (passwords.BULK_CHUNK_SIZE * 3))
+    assert len(stuck.futures) == 2
+    assert all(future.cancelled() for future in stuck.futures)
+    assert passwords._executor is None
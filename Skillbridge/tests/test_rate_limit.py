@@ -0,0 +1,73 @@
+import threading
+import pytest
+from flask import jsonify
+from src.app import create_app
+from src.config import TestingConfig
+from src.models.user import db
+from src.utils import rate_limit
+from src.utils.rate_limit import admission, client_id
+from conftest import clear_caches
+
+def build_app(tmp_path, **overrides):
+    app = create_app(TestingConfig, SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path / "test.db"}', **overrides)
+    app.add_url_rule('/whoami', 'whoami', lambda: jsonify({'client': client_id()}))
+    return app
+
+@pytest.fixture
+def make_app(tmp_path):
+    apps = []
+
+    def make(**overrides):
+        clear_caches()
+        app = build_app(tmp_path, **overrides)
+        apps.append(app)
+        return app
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.engine.dispose()
+    clear_caches()
+
+def test_forwarded_for_is_ignored_without_trusted_proxies(make_app):
+    client = make_app(TRUSTED_PROXY_HOPS=0).test_client()
+    response = client.get('/whoami', headers={'X-Forwarded-For': '203.0.113.9'}, environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    assert response.get_json()['client'] == '10.0.0.2'
+
+def test_forwarded_for_is_read_for_trusted_hops_only(make_app):
+    client = make_app(TRUSTED_PROXY_HOPS=1).test_client()
+    # The client-supplied first entry is spoofed; the proxy appended the real address
+    response = client.get('/whoami', headers={'X-Forwarded-For': '198.51.100.1, 203.0.113.9'}, environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    assert response.get_json()['client'] == '203.0.113.9'
+
+def test_heavy_requests_are_shed_once_the_worker_is_busy(make_app, auth_headers, monkeypatch):
+    monkeypatch.setattr(rate_limit, 'RATE_LIMIT_ENABLED', True)
+    app = make_app(SHED_HEAVY_AT_IN_FLIGHT=2)
+    release = threading.Event()
+
+    # A cheap, unlimited route that holds its thread
+    @app.route('/slow')
+    def slow():
+        release.wait(5)
+        return jsonify({'ok': True})
+
+    threads = [threading.Thread(target=app.test_client().get, args=('/slow',)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(500):
+            if admission.in_flight == 2:
+                break
+            threading.Event().wait(0.01)
+        assert admission.in_flight == 2
+
+        response = app.test_client().get('/api/skill/projects/1/skill-gap', headers=auth_headers())
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '1'
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    assert admission.in_flight == 0
+    response = app.test_client().get('/api/skill/projects/1/skill-gap', headers=auth_headers())
+    assert response.status_code == 404
@@ -0,0 +1,19 @@
+import pytest
+
+@pytest.fixture
+def registered(client):
+    body = {'username': 'alice', 'email': 'alice@example.com', 'password': 'secret'}
+    assert client.post('/api/auth/register', json=body).status_code == 201
+
+def register(client, username, email):
+    return client.post('/api/auth/register', json={'username': username, 'email': email, 'password': 'secret'})
+
+def test_duplicate_username_is_a_conflict(client, registered):
+    response = register(client, 'alice', 'other@example.com')
+    assert response.status_code == 409
+    assert response.get_json()['message'] == 'Username already taken'
+
+def test_duplicate_email_is_a_conflict(client, registered):
+    response = register(client, 'bob', 'alice@example.com')
+    assert response.status_code == 409
+    assert response.get_json()['message'] == 'Email already registered'
@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import insert
+from src.models.user import db
+from src.models.skill import Project, ProjectMember, Skill
+from src.services.skill_gap import refresh_gap_rows
+from conftest import add_company, add_users, add_skills, add_project, give_skills
+
+URL = '/api/skill/projects/skill-gap/simulate'
+
+@pytest.fixture
+def project(app):
+    company = add_company()
+    skills = add_skills(2)
+    users = add_users(company, 3)
+    for user in users[:2]:
+        give_skills(user, skills, proficiency=2)
+    give_skills(users[2], skills, proficiency=5)
+    project = add_project(company, users[:2], skills)
+    db.session.commit()
+    return project
+
+def simulate(client, headers, project_id, changes):
+    return client.post(URL, json={'project_ids': [project_id], 'changes': changes}, headers=headers)
+
+@pytest.mark.parametrize('change', [
+    'add_member',
+    ['add_member'],
+    {'type': 'add_member', 'project_id': '1', 'user_id': 3},
+    {'type': 'add_member', 'project_id': 1, 'user_id': '3'},
+    {'type': 'add_member', 'project_id': 1, 'user_id': True},
+    {'type': 'add_member', 'project_id': 1, 'skills': 'python'},
+    {'type': 'add_member', 'project_id': 1, 'skills': ['python']},
+    {'type': 'remove_member', 'project_id': 1, 'user_id': '1'},
+    {'type': 'upgrade', 'user_id': [3], 'skill_id': 1, 'proficiency_level': 5}
+])
+def test_malformed_changes_are_rejected(client, auth_headers, project, change):
+    response = simulate(client, auth_headers(), project.id, [change])
+    assert response.status_code == 400
+    error = response.get_json()['error']
+    assert error.startswith('Invalid change: ')
+    assert 'object has no attribute' not in error and 'unhashable' not in error
+
+def test_adding_an_existing_member_is_rejected(client, auth_headers, project):
+    response = simulate(client, auth_headers(), project.id, [{'type': 'add_member', 'project_id': project.id, 'user_id': 1}])
+    assert response.status_code == 400
+    assert 'already a member' in response.get_json()['error']
+
+def test_adding_a_new_member_changes_the_gap(client, auth_headers, project):
+    response = simulate(client, auth_headers(), project.id, [{'type': 'add_member', 'project_id': project.id, 'user_id': 3}])
+    assert response.status_code == 200
+    result = response.get_json()['projects'][0]
+    assert result['member_count'] == 3
+    assert result['total_gap_after'] < result['total_gap_before']
+
+def test_renames_retire_snapshots(client, auth_headers, project):
+    headers = auth_headers()
+    first = simulate(client, headers, project.id, []).get_json()['projects'][0]
+    assert first['project_name'] == project.name
+
+    db.session.get(Project, project.id).name = 'Renamed project'
+    db.session.get(Skill, first['skill_gap'][0]['skill_id']).name = 'Renamed skill'
+    db.session.commit()
+
+    second = simulate(client, headers, project.id, []).get_json()['projects'][0]
+    assert second['project_name'] == 'Renamed project'
+    assert 'Renamed skill' in [gap['skill_name'] for gap in second['skill_gap']]
+
+def test_membership_changes_from_other_workers_retire_snapshots(client, auth_headers, project):
+    headers = auth_headers()
+    assert simulate(client, headers, project.id, []).get_json()['projects'][0]['member_count'] == 2
+
+    # Another worker's commit: no flush in this process, only the bumped gap version
+    with db.engine.begin() as connection:
+        connection.execute(insert(ProjectMember).values(project_id=project.id, user_id=3, allocation_percentage=50))
+        refresh_gap_rows(connection, project_ids=[project.id])
+
+    result = simulate(client, headers, project.id, []).get_json()['projects'][0]
+    assert result['member_count'] == 3
@@ -0,0 +1,59 @@
+from src.models.user import db
+from src.models.skill import ProjectMember, ProjectSkill, UserSkill
+from conftest import add_company, add_users, add_skills, add_project, give_skills
+
+def per_member_skill_gap(project_id):
+    # The original computation: one user-skill query per member
+    project_skills = ProjectSkill.query.filter_by(project_id=project_id).all()
+    project_members = ProjectMember.query.filter_by(project_id=project_id).all()
+    user_skills = []
+    for member in project_members:
+        user_skills.extend(UserSkill.query.filter_by(user_id=member.user_id).all())
+
+    skill_gap = []
+    for project_skill in project_skills:
+        matching = [us for us in user_skills if us.skill_id == project_skill.skill_id]
+        coverage = len(matching)
+        avg_proficiency = sum(us.proficiency_level for us in matching) / coverage if coverage else 0
+        skill_gap.append({
+            'skill_id': project_skill.skill_id,
+            'skill_name': project_skill.skill.name,
+            'importance_level': project_skill.importance_level,
+            'coverage': coverage,
+            'avg_proficiency': avg_proficiency,
+            'gap_score': project_skill.importance_level - (avg_proficiency * coverage / len(project_members) if project_members else 0)
+        })
+    skill_gap.sort(key=lambda x: x['gap_score'], reverse=True)
+    return skill_gap
+
+def build_projects():
+    company = add_company()
+    skills = add_skills(12)
+    users = add_users(company, 40)
+    for i, user in enumerate(users):
+        give_skills(user, skills[i % 5:i % 5 + 4], proficiency=i % 5 + 1)
+    small = add_project(company, users[:1], skills[:1])
+    large = add_project(company, users, skills)
+    db.session.commit()
+    return small, large
+
+def test_skill_gap_query_count_is_constant(client, auth_headers, count_queries):
+    small, large = build_projects()
+    counts = []
+    for project in (small, large):
+        with count_queries() as counter:
+            response = client.get(f'/api/skill/projects/{project.id}/skill-gap', headers=auth_headers())
+        assert response.status_code == 200
+        counts.append(counter.count)
+    assert counts[0] == counts[1]
+
+def test_skill_gap_matches_per_member_computation(client, auth_headers):
+    small, large = build_projects()
+    # Members without any skills still count towards the team size
+    newcomer = add_users(large.company, 1, prefix='newcomer')[0]
+    db.session.add(ProjectMember(project_id=large.id, user_id=newcomer.id, allocation_percentage=10))
+    db.session.commit()
+    for project in (small, large):
+        response = client.get(f'/api/skill/projects/{project.id}/skill-gap', headers=auth_headers())
+        assert response.status_code == 200
+        assert response.get_json()['skill_gap'] == per_member_skill_gap(project.id)
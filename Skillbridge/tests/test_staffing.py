@@ -0,0 +1,99 @@
+from sqlalchemy import insert
+from src.models.user import db
+from src.models.skill import UserSkill
+from src.services import staffing
+from src.services.staffing import skill_index
+from src.utils.cache import bump_table_versions
+from conftest import add_company, add_users, add_skills, add_project, give_skills
+
+def test_recommendations_stay_within_the_project_company(client, auth_headers):
+    home = add_company('Home')
+    other = add_company('Other')
+    skills = add_skills(2)
+    insiders = add_users(home, 2, prefix='insider')
+    outsiders = add_users(other, 3, prefix='outsider')
+    give_skills(insiders[1], skills, proficiency=2)
+    for user in outsiders:
+        give_skills(user, skills, proficiency=5)
+    project = add_project(home, insiders[:1], skills)
+    db.session.commit()
+
+    response = client.get(f'/api/skill/projects/{project.id}/staffing-recommendations?k=10', headers=auth_headers())
+    assert response.status_code == 200
+    recommendations = response.get_json()['recommendations']
+    assert recommendations
+    for recommendation in recommendations:
+        assert [candidate['user_id'] for candidate in recommendation['candidates']] == [insiders[1].id]
+
+def test_invalidation_during_build_keeps_the_index_dirty(app, monkeypatch):
+    company = add_company()
+    skills = add_skills(1)
+    give_skills(add_users(company, 1)[0], skills)
+    db.session.commit()
+
+    score = staffing.candidate_score
+    def score_and_write(*args):
+        # A write committed while the index is being built
+        skill_index.invalidate()
+        return score(*args)
+    monkeypatch.setattr(staffing, 'candidate_score', score_and_write)
+    skill_index.build()
+    assert skill_index.is_stale()
+
+    monkeypatch.setattr(staffing, 'candidate_score', score)
+    skill_index.build()
+    assert not skill_index.is_stale()
+
+def counting_builds(monkeypatch):
+    builds = []
+    build = skill_index.build
+    def counted():
+        builds.append(1)
+        build()
+    monkeypatch.setattr(skill_index, 'build', counted)
+    return builds
+
+def candidate_ids(company, skill):
+    return [user_id for _, user_id, _ in skill_index.candidates(company.id, skill.id)]
+
+def test_local_writes_update_only_the_changed_entries(app, monkeypatch):
+    company = add_company()
+    skills = add_skills(2)
+    users = add_users(company, 3)
+    give_skills(users[0], skills, proficiency=3)
+    db.session.commit()
+    assert candidate_ids(company, skills[0]) == [users[0].id]
+
+    builds = counting_builds(monkeypatch)
+    give_skills(users[1], skills[:1], proficiency=5)
+    db.session.commit()
+    assert candidate_ids(company, skills[0]) == [users[1].id, users[0].id]
+    assert candidate_ids(company, skills[1]) == [users[0].id]
+
+    # Deactivated users drop out of every list
+    users[0].is_active = False
+    db.session.commit()
+    assert candidate_ids(company, skills[0]) == [users[1].id]
+    assert candidate_ids(company, skills[1]) == []
+
+    # Removed skills drop out of their list only
+    db.session.delete(db.session.query(UserSkill).filter_by(user_id=users[1].id).one())
+    db.session.commit()
+    assert candidate_ids(company, skills[0]) == []
+    assert builds == []
+
+def test_writes_from_other_workers_rebuild_the_index(app, monkeypatch):
+    company = add_company()
+    skills = add_skills(1)
+    users = add_users(company, 2)
+    give_skills(users[0], skills)
+    db.session.commit()
+    assert candidate_ids(company, skills[0]) == [users[0].id]
+
+    builds = counting_builds(monkeypatch)
+    # A raw insert, as another worker's commit looks from here
+    with db.engine.begin() as connection:
+        connection.execute(insert(UserSkill).values(user_id=users[1].id, skill_id=skills[0].id, proficiency_level=5))
+        bump_table_versions(connection, ['user_skills'])
+    assert candidate_ids(company, skills[0]) == [users[1].id, users[0].id]
+    assert builds == [1]